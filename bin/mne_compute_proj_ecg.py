@@ -50,7 +50,7 @@ if __name__ == '__main__':
                     default=35)
     parser.add_option("-p", "--preload", dest="preload",
                     help="Temporary file used during computation (to save memory)",
-                    default=True)
+                    default=False)
     parser.add_option("-a", "--average", dest="average", action="store_true",
                     help="Compute SSP after averaging",
                     default=False)
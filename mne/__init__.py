@@ -13,7 +13,8 @@ from .event import read_events, write_events, find_events, merge_events, \
                    pick_events, make_fixed_length_events, concatenate_events
 from .forward import read_forward_solution, apply_forward, apply_forward_raw
 from .source_estimate import read_stc, write_stc, read_w, write_w, \
-                             read_source_estimate, \
+                             read_source_estimate, read_source_estimates, \
+                             write_source_estimates, \
                              SourceEstimate, morph_data, \
                              morph_data_precomputed, compute_morph_matrix, \
                              grade_to_tris, grade_to_vertices, \
@@ -26,10 +27,11 @@ from .source_estimate import read_stc, write_stc, read_w, write_w, \
                              save_stc_as_volume
 from .surface import read_bem_surfaces, read_surface, write_bem_surface
 from .source_space import read_source_spaces, vertex_to_mni
-from .epochs import Epochs, equalize_epoch_counts
+from .epochs import Epochs, equalize_epoch_counts, compute_resampling_stats
 from .label import label_time_courses, read_label, label_sign_flip, \
                    write_label, stc_to_label, grow_labels, Label, \
-                   BiHemiLabel
+                   BiHemiLabel, label_extraction_operator, \
+                   extract_label_time_course
 from .misc import parse_config, read_reject_parameters
 from .transforms import transform_coordinates
 from .proj import read_proj, write_proj, compute_proj_epochs, \
@@ -1,14 +1,114 @@
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 
 import logging
 logger = logging.getLogger('mne')
 
 from .. import fiff, verbose
+from ..fiff.raw import _iter_raw_blocks
 from ..filter import band_pass_filter
 
 
+def _window_view(x, win_size):
+    """Strided view of all the windows of win_size samples of x"""
+    n_windows = max(len(x) - win_size + 1, 0)
+    return as_strided(x, shape=(n_windows, win_size),
+                      strides=(x.strides[0], x.strides[0]))
+
+
+def _qrs_windows(absecg, thresh1, win_size, next_start):
+    """Explore the windows of the QRS detector in a rectified ECG segment
+
+    A window starts at each sample above threshold (from next_start on) that
+    is not inside the previous window, and ends before the end of the
+    segment. Returns the peak times, number of threshold crossings and RMS
+    of the windows, and the first sample where the next window can start.
+    """
+    above = np.where(absecg[:max(len(absecg) - win_size, 0)] > thresh1)[0]
+    above = above[above >= next_start]
+    onsets = list()
+    k = 0
+    while k < len(above):
+        onsets.append(above[k])
+        next_start = above[k] + win_size
+        k = np.searchsorted(above, next_start)
+    onsets = np.array(onsets, dtype=np.int)
+
+    windows = _window_view(absecg, win_size)[onsets]
+    time = onsets + np.argmax(windows, axis=1)
+    above = windows > thresh1
+    numcross = np.sum(above[:, 1:] != above[:, :-1], axis=1)
+    rms = np.sqrt(np.mean(windows ** 2, axis=1))
+    return time, numcross, rms, next_start
+
+
+def _qrs_detector_blocks(sfreq, blocks, thresh_value=0.6, levels=2.5,
+                         n_thresh=3, tstart=0):
+    """Detect QRS components in a band pass filtered ECG read by blocks
+
+    blocks yields the first sample and the data of consecutive blocks of
+    the filtered ECG. Only the samples which can still start a window are
+    kept from one block to the next.
+    """
+    win_size = int(round((60.0 * sfreq) / 120.0))
+    init = int(sfreq)
+    n_samples_start = int(init * tstart)
+
+    absecg = np.empty(0)
+    offset = n_samples_start  # sample of absecg[0]
+    thresh1 = None
+    next_start = 0
+    time, numcross, rms = list(), list(), list()
+    blocks = iter(blocks)
+    done = False
+    while not done:
+        try:
+            start, block = next(blocks)
+            block = np.abs(np.ravel(block))
+            if start + len(block) <= n_samples_start:
+                continue
+            absecg = np.r_[absecg, block[max(n_samples_start - start, 0):]]
+        except StopIteration:
+            done = True
+
+        if thresh1 is None:
+            if len(absecg) < 3 * init and not done:
+                continue
+            maxpt = np.empty(3)
+            maxpt[0] = np.max(absecg[:init])
+            maxpt[1] = np.max(absecg[init:init * 2])
+            maxpt[2] = np.max(absecg[init * 2:init * 3])
+            init_max = np.mean(maxpt)
+            thresh1 = init_max * thresh_value
+
+        this_time, this_numcross, this_rms, next_start = \
+                        _qrs_windows(absecg, thresh1, win_size, next_start)
+        time.append(this_time + offset)
+        numcross.append(this_numcross)
+        rms.append(this_rms)
+
+        # keep the samples which can still start a window
+        n_drop = min(max(next_start, len(absecg) - win_size, 0), len(absecg))
+        absecg = absecg[n_drop:]
+        offset += n_drop
+        next_start = max(next_start - n_drop, 0)
+
+    time = np.concatenate(time)
+    numcross = np.concatenate(numcross)
+    rms = np.concatenate(rms)
+
+    rms_mean = np.mean(rms)
+    rms_std = np.std(rms)
+    rms_thresh = rms_mean + (rms_std * levels)
+    b = np.where(rms < rms_thresh)[0]
+    a = numcross[b]
+    clean_events = time[b[a < n_thresh]]
+
+    return clean_events
+
+
 def qrs_detector(sfreq, ecg, thresh_value=0.6, levels=2.5, n_thresh=3,
-                 l_freq=5, h_freq=35, tstart=0):
+                 l_freq=5, h_freq=35, tstart=0, filter_length=None):
     """Detect QRS component in ECG channels.
 
     QRS is the main wave on the heart beat.
@@ -18,7 +118,8 @@ def qrs_detector(sfreq, ecg, thresh_value=0.6, levels=2.5, n_thresh=3,
     sfreq : float
         Sampling rate
     ecg : array
-        ECG signal
+        ECG signal, or 2d array (n_channels x n_times) of several candidate
+        ECG signals
     thresh_value: float
         qrs detection threshold
     levels: float
@@ -31,65 +132,34 @@ def qrs_detector(sfreq, ecg, thresh_value=0.6, levels=2.5, n_thresh=3,
         High pass frequency
     tstart: float
         Start detection after tstart seconds.
+    filter_length: int | None
+        Length of the band pass filter. If None, a filter of 10 seconds
+        is used.
 
     Returns
     -------
-    events : array
-        Indices of ECG peaks
+    events : array | list of array
+        Indices of ECG peaks (for each signal if ecg is 2d)
     """
-    win_size = round((60.0 * sfreq) / 120.0)
-
-    filtecg = band_pass_filter(ecg, sfreq, l_freq, h_freq)
+    if ecg.ndim == 2:
+        return [qrs_detector(sfreq, this_ecg, thresh_value, levels, n_thresh,
+                             l_freq, h_freq, tstart, filter_length)
+                for this_ecg in ecg]
 
-    absecg = np.abs(filtecg)
-    init = int(sfreq)
-
-    n_samples_start = int(init * tstart)
-    absecg = absecg[n_samples_start:]
-
-    n_points = len(absecg)
-
-    maxpt = np.empty(3)
-    maxpt[0] = np.max(absecg[:init])
-    maxpt[1] = np.max(absecg[init:init * 2])
-    maxpt[2] = np.max(absecg[init * 2:init * 3])
-
-    init_max = np.mean(maxpt)
-
-    thresh1 = init_max * thresh_value
-
-    numcross = []
-    time = []
-    rms = []
-    i = 0
-    while i < (n_points - win_size):
-        window = absecg[i:i + win_size]
-        if window[0] > thresh1:
-            maxTime = np.argmax(window)
-            time.append(i + maxTime)
-            numcross.append(np.sum(np.diff((window > thresh1).astype(np.int)
-                                            == 1)))
-            rms.append(np.sqrt(np.mean(window ** 2)))
-            i += win_size
-        else:
-            i += 1
-
-    time = np.array(time)
-    rms_mean = np.mean(rms)
-    rms_std = np.std(rms)
-    rms_thresh = rms_mean + (rms_std * levels)
-    b = np.where(rms < rms_thresh)[0]
-    a = np.array(numcross)[b]
-    clean_events = time[b[a < n_thresh]]
+    if filter_length is None:
+        filter_length = int(10 * sfreq)
 
-    clean_events += n_samples_start
+    filtecg = band_pass_filter(ecg, sfreq, l_freq, h_freq,
+                               filter_length=filter_length)
 
-    return clean_events
+    return _qrs_detector_blocks(sfreq, [(0, filtecg)], thresh_value, levels,
+                                n_thresh, tstart)
 
 
 @verbose
 def find_ecg_events(raw, event_id=999, ch_name=None, tstart=0.0,
-                    l_freq=5, h_freq=35, qrs_threshold=0.6, verbose=None):
+                    l_freq=5, h_freq=35, qrs_threshold=0.6, block_size=60.,
+                    verbose=None):
     """Find ECG peaks
 
     Parameters
@@ -111,6 +181,8 @@ def find_ecg_events(raw, event_id=999, ch_name=None, tstart=0.0,
         High pass frequency.
     qrs_threshold : float
         Between 0 and 1. qrs detection threshold.
+    block_size : float
+        Duration in seconds of the blocks of data read and filtered at once.
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
 
@@ -144,15 +216,23 @@ def find_ecg_events(raw, event_id=999, ch_name=None, tstart=0.0,
     logger.info('Using channel %s to identify heart beats'
                 % raw.ch_names[ch_ECG[0]])
 
-    ecg, times = raw[ch_ECG, :]
+    # detecting QRS and generating event file, reading and filtering the
+    # ECG block by block
+    sfreq = info['sfreq']
+    filter_length = int(10 * sfreq)
+
+    def _filter(x):
+        return band_pass_filter(x, sfreq, l_freq, h_freq,
+                                filter_length=filter_length)
 
-    # detecting QRS and generating event file
-    ecg_events = qrs_detector(info['sfreq'], ecg.ravel(), tstart=tstart,
-                              thresh_value=qrs_threshold, l_freq=l_freq,
-                              h_freq=h_freq)
+    blocks = _iter_raw_blocks(raw, ch_ECG, int(block_size * sfreq),
+                              margin=filter_length, func=_filter)
+    ecg_events = _qrs_detector_blocks(sfreq, blocks, tstart=tstart,
+                                      thresh_value=qrs_threshold)
 
     n_events = len(ecg_events)
-    average_pulse = n_events * 60.0 / (times[-1] - times[0])
+    duration = (raw.last_samp - raw.first_samp) / sfreq
+    average_pulse = n_events * 60.0 / duration
     logger.info("Number of ECG events detected : %d (average pulse %d / "
                 "min.)" % (n_events, average_pulse))
 
@@ -5,11 +5,13 @@ logger = logging.getLogger('mne')
 
 from .peak_finder import peak_finder
 from .. import fiff, verbose
+from ..fiff.raw import _iter_raw_blocks
 from ..filter import band_pass_filter
 
 
 @verbose
-def find_eog_events(raw, event_id=998, l_freq=1, h_freq=10, verbose=None):
+def find_eog_events(raw, event_id=998, l_freq=1, h_freq=10, block_size=60.,
+                    verbose=None):
     """Locate EOG artifacts
 
     Parameters
@@ -22,6 +24,8 @@ def find_eog_events(raw, event_id=998, l_freq=1, h_freq=10, verbose=None):
         Low pass frequency.
     high_pass : float
         High pass frequency.
+    block_size : float
+        Duration in seconds of the blocks of data read and filtered at once.
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
 
@@ -46,12 +50,29 @@ def find_eog_events(raw, event_id=998, l_freq=1, h_freq=10, verbose=None):
 
     logger.info('EOG channel index for this subject is: %s' % ch_EOG)
 
-    eog, _ = raw[ch_EOG, :]
+    logger.info('Filtering the data to remove DC offset to help '
+                'distinguish blinks from saccades')
+
+    # filter the EOG block by block, keeping only the energy of the
+    # signals filtered to remove the DC offset
+    sfreq = raw.info['sfreq']
+    filter_length = int(10 * sfreq)
 
-    eog_events = _find_eog_events(eog, event_id=event_id, l_freq=l_freq,
-                                  h_freq=h_freq,
-                                  sampling_rate=raw.info['sfreq'],
-                                  first_samp=raw.first_samp)
+    def _filter(x):
+        return [band_pass_filter(x, sfreq, 2, 45,
+                                 filter_length=filter_length),
+                band_pass_filter(x, sfreq, l_freq, h_freq,
+                                 filter_length=filter_length)]
+
+    energy = np.zeros(len(ch_EOG))
+    filteog = list()
+    for _, data in _iter_raw_blocks(raw, ch_EOG, int(block_size * sfreq),
+                                    margin=filter_length, func=_filter):
+        energy += np.sum(data[:, 0] ** 2, axis=1)
+        filteog.append(data[:, 1])
+    filteog = np.concatenate(filteog, axis=1)[np.argmax(energy)]
+
+    eog_events = _detect_eog_events(filteog, event_id, raw.first_samp)
 
     return eog_events
 
@@ -71,8 +92,11 @@ def _find_eog_events(eog, event_id, l_freq, h_freq, sampling_rate, first_samp):
     # easier to detect peaks with filtering.
     filteog = band_pass_filter(eog[indexmax], sampling_rate, l_freq, h_freq)
 
-    # detecting eog blinks and generating event file
+    return _detect_eog_events(filteog, event_id, first_samp)
+
 
+def _detect_eog_events(filteog, event_id, first_samp):
+    """Detect blinks in the band pass filtered EOG"""
     logger.info('Now detecting blinks and generating corresponding events')
 
     temp = filteog - np.mean(filteog)
@@ -155,6 +155,7 @@ class ICA(object):
         self.max_n_components = max_n_components
         self.ch_names = None
         self._mixing = None
+        self._cleaning_operators = dict()
 
     def __repr__(self):
         s = 'ICA '
@@ -173,7 +174,7 @@ class ICA(object):
 
     @verbose
     def decompose_raw(self, raw, picks=None, start=None, stop=None,
-                      verbose=None):
+                      decim=None, chunk_size=None, verbose=None):
         """Run the ICA decomposition on raw data
 
         Parameters
@@ -189,6 +190,15 @@ class ICA(object):
         stop : int
             First sample to not include. If omitted, data is included to the
             end.
+        decim : int | None
+            Increment for selecting each nth time slice used for fitting the
+            unmixing matrix. If None, all samples are used.
+        chunk_size : int | None
+            If not None, the data are read in chunks of chunk_size samples.
+            The PCA is then estimated from the covariance accumulated over
+            the chunks and only the decimated samples are kept in memory to
+            fit the unmixing matrix. This allows to decompose long recordings
+            that are not preloaded.
         verbose : bool, str, int, or None
             If not None, override default verbose level (see mne.verbose).
             Defaults to self.verbose.
@@ -216,13 +226,22 @@ class ICA(object):
 
         self.ch_names = [raw.ch_names[k] for k in picks]
 
-        data, self._pre_whitener = self._pre_whiten(raw[picks, start:stop][0],
-                                                   raw.info, picks)
+        if decim is None:
+            decim = 1
 
-        to_ica, self._pca = self._prepare_pca(data, self.max_n_components)
+        if chunk_size is None:
+            data, self._pre_whitener = self._pre_whiten(
+                                    raw[picks, start:stop][0][:, ::decim],
+                                    raw.info, picks)
+
+            to_ica, self._pca = self._prepare_pca(data, self.max_n_components)
+        else:
+            to_ica = self._prepare_pca_chunked(raw, picks, start, stop, decim,
+                                               chunk_size)
 
         self._ica.fit(to_ica)
         self._mixing = self._ica.get_mixing_matrix().T
+        self._cleaning_operators = dict()  # the cached ones are stale
         self.current_fit = 'raw'
 
         return self
@@ -280,11 +299,12 @@ class ICA(object):
 
         self._ica.fit(to_ica)
         self._mixing = self._ica.get_mixing_matrix().T
+        self._cleaning_operators = dict()  # the cached ones are stale
         self.current_fit = 'epochs'
 
         return self
 
-    def get_sources_raw(self, raw, start=None, stop=None):
+    def get_sources_raw(self, raw, start=None, stop=None, chunk_size=None):
         """Estimate raw sources given the unmixing matrix
 
         Parameters
@@ -297,6 +317,9 @@ class ICA(object):
         stop : int
             First sample to not include.
             If omitted, data is included to the end.
+        chunk_size : int | None
+            If not None, the sources are computed in chunks of chunk_size
+            samples to limit the size of temporary arrays.
 
         Returns
         -------
@@ -307,15 +330,26 @@ class ICA(object):
             raise RuntimeError('No fit available. Please first fit ICA '
                                'decomposition.')
 
-        return self._get_sources_raw(raw, start, stop)[0]
-
-    def _get_sources_raw(self, raw, start, stop):
         picks = [raw.ch_names.index(k) for k in self.ch_names]
-        data, _ = self._pre_whiten(raw[picks, start:stop][0], raw.info, picks)
+        chunks = _get_chunks(raw, start, stop, chunk_size)
+        sources = np.empty((self.n_components, chunks[-1][1] - chunks[0][0]))
+        offset = chunks[0][0]
+        for first, last in chunks:
+            sources[:, first - offset:last - offset] = \
+                            self._get_sources_raw(raw, picks, first, last)[0]
+
+        return sources
+
+    def _get_sources_raw(self, raw, picks, start, stop):
+        return self._get_sources_data(raw[picks, start:stop][0])
+
+    def _get_sources_data(self, data):
+        """Helper function: compute sources from picked sensor data"""
+        data = self._apply_pre_whitener(data)
         pca_data = self._pca.transform(data.T)
-        raw_sources = self._ica.transform(pca_data[:, self._comp_idx]).T
+        sources = self._ica.transform(pca_data[:, self._comp_idx]).T
 
-        return raw_sources, pca_data
+        return sources, pca_data
 
     def get_sources_epochs(self, epochs, concatenate=False):
         """Estimate epochs sources given the unmixing matrix
@@ -339,7 +373,18 @@ class ICA(object):
         return self._get_sources_epochs(epochs, concatenate)[0]
 
     def _get_sources_epochs(self, epochs, concatenate):
+        picks = self._get_epochs_picks(epochs)
+        sources, pca_data = self._get_sources_data(
+                                    np.hstack(epochs.get_data()[:, picks]))
+        sources = np.array(np.split(sources, len(epochs.events), 1))
+
+        if concatenate:
+            sources = np.hstack(sources)
 
+        return sources, pca_data
+
+    def _get_epochs_picks(self, epochs):
+        """Helper function"""
         picks = pick_types(epochs.info, include=self.ch_names,
                                exclude=epochs.info['bads'])
 
@@ -350,18 +395,7 @@ class ICA(object):
                                'provide Epochs compatible with '
                                'ica.ch_names' % (len(self.ch_names),
                                                   len(picks)))
-
-        data, _ = self._pre_whiten(np.hstack(epochs.get_data()[:, picks]),
-                                   epochs.info, picks)
-
-        pca_data = self._pca.transform(data.T)
-        sources = self._ica.transform(pca_data[:, self._comp_idx]).T
-        sources = np.array(np.split(sources, len(epochs.events), 1))
-
-        if concatenate:
-            sources = np.hstack(sources)
-
-        return sources, pca_data
+        return picks
 
     def export_sources(self, raw, picks=None, start=None, stop=None):
         """Export sources as raw object
@@ -639,7 +673,7 @@ class ICA(object):
 
     def pick_sources_raw(self, raw, include=None, exclude=None,
                          n_pca_components=64, start=None, stop=None,
-                         copy=True):
+                         copy=True, chunk_size=None):
         """Recompose raw data including or excluding some sources
 
         Parameters
@@ -662,6 +696,11 @@ class ICA(object):
             The first time index to exclude.
         copy: bool
             modify raw instance in place or return modified copy.
+        chunk_size : int | None
+            If not None, the data are recomposed in chunks of chunk_size
+            samples which are written back to raw one after the other. This
+            avoids full size temporary arrays, e.g. when raw is preloaded
+            into a memory-mapped file.
 
         Returns
         -------
@@ -677,15 +716,16 @@ class ICA(object):
             raise ValueError('Currently no raw data fitted.'
                              'Please fit raw data first.')
 
-        sources, pca_data = self._get_sources_raw(raw, start=start, stop=stop)
-        recomposed = self._pick_sources(sources, pca_data, include, exclude,
-                                        n_pca_components)
-
         if copy is True:
             raw = raw.copy()
 
+        operator, offset = self.get_cleaning_operator(include, exclude,
+                                                      n_pca_components)
         picks = [raw.ch_names.index(k) for k in self.ch_names]
-        raw[picks, start:stop] = recomposed
+        for first, last in _get_chunks(raw, start, stop, chunk_size):
+            data = raw[picks, first:last][0]
+            raw[picks, first:last] = (np.dot(operator, data)
+                                      + offset[:, np.newaxis])
         return raw
 
     def pick_sources_epochs(self, epochs, include=None, exclude=None,
@@ -719,23 +759,69 @@ class ICA(object):
                              'working. Please read raw data with '
                              'preload=True.')
 
-        sources, pca_data = self._get_sources_epochs(epochs, True)
-        picks = pick_types(epochs.info, include=self.ch_names,
-                               exclude=epochs.info['bads'])
+        picks = self._get_epochs_picks(epochs)
+        operator, offset = self.get_cleaning_operator(include, exclude,
+                                                      n_pca_components)
 
         if copy is True:
             epochs = epochs.copy()
 
-        # put sources-dimension first for selection
-        recomposed = self._pick_sources(sources, pca_data, include, exclude,
-                                        n_pca_components)
-        # restore epochs, channels, tsl order
-        epochs._data[:, picks] = np.array(np.split(recomposed,
-                                          len(epochs.events), 1))
+        for epoch in epochs._data:
+            epoch[picks] = np.dot(operator, epoch[picks]) \
+                           + offset[:, np.newaxis]
         epochs.preload = True
 
         return epochs
 
+    def get_cleaning_operator(self, include=None, exclude=None,
+                              n_pca_components=64):
+        """Get the linear operator recomposing data from selected sources
+
+        The whole chain of pre-whitening, PCA, unmixing, source selection,
+        mixing and back-projection is linear. It is hence summarized by one
+        matrix and one offset vector such that the cleaned data are given by
+        np.dot(operator, data) + offset[:, np.newaxis], where data are the
+        channels listed in ica.ch_names. The operators are cached until the
+        next fit and are returned as read-only arrays.
+
+        Parameters
+        ----------
+        include : list-like | None
+            The source indices to use. If None all are used.
+        exclude : list-like | None
+            The source indices to remove. If None  all are used.
+        n_pca_components:
+            The number of PCA components to be unwhitened, where n_components
+            is the lower bound and max_n_components the upper bound.
+
+        Returns
+        -------
+        operator : array, shape = (n_channels, n_channels)
+            The cleaning matrix.
+        offset : array, shape = (n_channels,)
+            The offset to add after applying the cleaning matrix.
+        """
+        if self._mixing is None:
+            raise RuntimeError('No fit available. Please first fit ICA '
+                               'decomposition.')
+
+        key = (None if include is None else tuple(include),
+               None if exclude is None else tuple(exclude), n_pca_components)
+        if key not in self._cleaning_operators:
+            # recompose the null vector and the canonical basis
+            n_channels = len(self.ch_names)
+            data = np.c_[np.zeros(n_channels), np.eye(n_channels)]
+            sources, pca_data = self._get_sources_data(data)
+            out = self._pick_sources(sources, pca_data, include, exclude,
+                                     n_pca_components)
+            offset = out[:, 0]
+            operator = out[:, 1:] - offset[:, np.newaxis]
+            operator.flags.writeable = False
+            offset.flags.writeable = False
+            self._cleaning_operators[key] = (operator, offset)
+
+        return self._cleaning_operators[key]
+
     def _pre_whiten(self, data, info, picks):
         """Helper function"""
         if self.noise_cov is None:  # use standardization as whitener
@@ -751,6 +837,15 @@ class ICA(object):
 
         return data, pre_whitener
 
+    def _apply_pre_whitener(self, data):
+        """Helper function"""
+        if self.noise_cov is None:  # use fitted standardization
+            data = data * self._pre_whitener
+        else:
+            data = np.dot(self._pre_whitener, data)
+
+        return data
+
     def _prepare_pca(self, data, max_n_components):
         """ Helper Function """
         from sklearn.decomposition import RandomizedPCA
@@ -769,6 +864,61 @@ class ICA(object):
         pca = RandomizedPCA(**kwargs)
         pca_data = pca.fit_transform(data.T)
 
+        return self._select_pca_components(pca, pca_data), pca
+
+    def _prepare_pca_chunked(self, raw, picks, start, stop, decim,
+                             chunk_size):
+        """Helper Function
+
+        Accumulate the covariance of the pre-whitened data chunk by chunk
+        and keep only the decimated samples used to fit the unmixing matrix.
+        """
+        chunks = _get_chunks(raw, start, stop, chunk_size)
+        offset = chunks[0][0]
+        n_channels = len(picks)
+        n_samples = 0
+        shift, pre_whitener = None, None
+        data_sum = np.zeros(n_channels)
+        data_cov = np.zeros((n_channels, n_channels))
+        data_decim = list()
+        for first, last in chunks:
+            data = raw[picks, first:last][0]
+            if self.noise_cov is not None:
+                if pre_whitener is None:
+                    data, pre_whitener = self._pre_whiten(data, raw.info,
+                                                          picks)
+                else:
+                    data = np.dot(pre_whitener, data)
+            # subtract the mean of the first chunk for numerical stability
+            if shift is None:
+                shift = np.mean(data, axis=1)
+            data -= shift[:, np.newaxis]
+            data_decim.append(data[:, (offset - first) % decim::decim])
+            data_sum += np.sum(data, axis=1)
+            data_cov += np.dot(data, data.T)
+            n_samples += data.shape[1]
+
+        data_mean = data_sum / n_samples
+        data_cov = data_cov / n_samples - np.outer(data_mean, data_mean)
+        data_mean += shift
+        data_decim = np.hstack(data_decim) + shift[:, np.newaxis]
+
+        if self.noise_cov is None:  # standardization over all data points
+            data_var = np.mean(np.diag(data_cov) +
+                               (data_mean - np.mean(data_mean)) ** 2)
+            pre_whitener = data_var ** -0.5
+            data_cov *= pre_whitener ** 2
+            data_mean *= pre_whitener
+            data_decim *= pre_whitener
+        self._pre_whitener = pre_whitener
+
+        self._pca = _CovPCA(data_cov, data_mean, self.max_n_components)
+        pca_data = self._pca.transform(data_decim.T)
+
+        return self._select_pca_components(self._pca, pca_data)
+
+    def _select_pca_components(self, pca, pca_data):
+        """ Helper Function """
         if self._explained_var > 1.0:
             if self.n_components is not None:  # normal n case
                 self._comp_idx = np.arange(self.n_components)
@@ -784,7 +934,7 @@ class ICA(object):
             to_ica = pca_data[:, self._comp_idx]
             self.n_components = len(self._comp_idx)
 
-        return to_ica, pca
+        return to_ica
 
     def _pick_sources(self, sources, pca_data, include, exclude,
                       n_pca_components):
@@ -929,6 +1079,37 @@ def _find_sources(sources, target, score_func):
     return scores
 
 
+class _CovPCA(object):
+    """Helper class: PCA computed from a covariance matrix
+
+    It exposes the attributes of scikit-learn's PCA used by ICA.
+    """
+    def __init__(self, cov, mean, n_components):
+        eigvals, eigvecs = linalg.eigh(cov)
+        order = np.argsort(eigvals)[::-1][:n_components]
+        eigvals = np.maximum(eigvals, 0.)
+        self.components_ = eigvecs[:, order].T
+        self.explained_variance_ = eigvals[order]
+        self.explained_variance_ratio_ = eigvals[order] / np.sum(eigvals)
+        self.mean_ = mean
+
+    def transform(self, X):
+        return np.dot(X - self.mean_, self.components_.T)
+
+
+def _get_chunks(raw, start, stop, chunk_size):
+    """Helper Function"""
+    start = 0 if start is None else start
+    stop = len(raw) if stop is None else min(stop, len(raw))
+    if start >= stop:
+        raise ValueError('No data in this range (start=%d, stop=%d)'
+                         % (start, stop))
+    if chunk_size is None:
+        chunk_size = stop - start
+    return [(first, min(first + chunk_size, stop))
+            for first in range(start, stop, chunk_size)]
+
+
 def _inverse_t_pca(X, pca):
     """Helper Function"""
     components = pca.components_[np.arange(len(X.T))]
@@ -2,17 +2,97 @@
 #
 # License: BSD (3-clause)
 
+from math import ceil
+
 import numpy as np
-from scipy import signal, interpolate
+from scipy import signal
+
+import logging
+logger = logging.getLogger('mne')
 
+from .. import verbose
 from ..fiff import pick_types
+from ..fiff.constants import FIFF
+from ..fiff.raw import start_writing_raw, write_raw_buffer, finish_writing_raw
+from ..fiff.write import write_int
+
+
+def _stim_windows(starts, n_samp, n_times, mode):
+    """Get the artifact windows, clipped to the data
+
+    In 'linear' mode overlapping windows are merged, as the interpolation
+    has to span their union. In 'window' mode they are kept separate so that
+    their gains can be multiplied.
+    """
+    starts = np.unique(np.asarray(starts, dtype=np.int64))
+    keep = (starts + n_samp > 0) & (starts < n_times)
+    starts = starts[keep]
+    stops = np.minimum(starts + n_samp, n_times)
+    if mode == 'window':
+        return starts, stops
+    starts = np.maximum(starts, 0)
+    if len(starts) > 1:
+        # a window starts a new group if it does not overlap the previous ones
+        ends = np.maximum.accumulate(stops)
+        new = np.r_[True, starts[1:] >= ends[:-1]]
+        group_stops = np.r_[ends[np.where(new)[0][1:] - 1], ends[-1]]
+        starts, stops = starts[new], group_stops
+    return starts, stops
+
+
+def _stim_gain(starts, window, start, stop):
+    """Get the gain of the windows over the samples [start, stop)"""
+    gain = np.ones(stop - start)
+    starts = starts - start
+    # starts are unique, so the samples at a given window offset are too and
+    # overlapping windows get the product of their gains
+    for k, w in enumerate(window):
+        idx = starts + k
+        idx = idx[(idx >= 0) & (idx < len(gain))]
+        gain[idx] *= w
+    return gain
+
 
+def _interp_windows(data, rows, starts, stops, offset=0):
+    """Linearly interpolate data over all windows at once (in place)
 
+    data[rows] is interpolated between the first and last samples of each
+    window [start, stop), offset being the sample index of data[:, 0].
+    """
+    if len(starts) == 0:
+        return
+    starts = starts - offset
+    stops = stops - offset
+    lens = stops - starts
+    seg = np.repeat(np.arange(len(starts)), lens)
+    pos = np.arange(lens.sum()) - np.repeat(np.cumsum(lens) - lens, lens)
+    idx = starts[seg] + pos
+    alpha = pos / lens[seg].astype(np.float)
+    first = data[np.ix_(rows, starts)]
+    last = data[np.ix_(rows, stops - 1)]
+    data[np.ix_(rows, idx)] = (first[:, seg] * (1. - alpha)
+                               + last[:, seg] * alpha)
+
+
+def _apply_windows(data, rows, window, starts, offset=0):
+    """Multiply data[rows] by the windows starting at starts (in place)"""
+    if len(starts) == 0:
+        return
+    gain = _stim_gain(starts, window, offset, offset + data.shape[1])
+    idx = np.where(gain != 1.)[0]
+    data[np.ix_(rows, idx)] *= gain[idx]
+
+
+@verbose
 def eliminate_stim_artifact(raw, events, event_id, tmin=-0.005,
-                            tmax=0.01, mode='linear'):
+                            tmax=0.01, mode='linear', fname=None,
+                            buffer_size_sec=10, verbose=None):
     """Eliminates stimulations artifacts from raw data
 
-    The raw object will be modified in place (no copy)
+    The raw object will be modified in place (no copy) if it is preloaded.
+    All the artifact windows are corrected at once. Overlapping windows are
+    interpolated over their union ('linear') or get the product of their
+    windows ('window').
 
     Parameters
     ----------
@@ -30,37 +110,86 @@ def eliminate_stim_artifact(raw, events, event_id, tmin=-0.005,
         way to fill the artifacted time interval
         'linear' does linear interpolation
         'window' applies a (1 - hanning) window
+    fname : None | string
+        If not None, the corrected data are saved to this file. If raw is
+        not preloaded, the data are read, corrected and written buffer by
+        buffer and raw itself is left unchanged.
+    buffer_size_sec : float
+        Size of the data buffers in seconds, used when saving.
+    verbose : bool, str, int, or None
+        If not None, override default verbose level (see mne.verbose).
 
     Returns
     -------
     raw: Raw object
         raw data object
     """
-    if not raw._preloaded:
+    if mode not in ('linear', 'window'):
+        raise ValueError("mode must be 'linear' or 'window', got %s" % mode)
+    if not raw._preloaded and fname is None:
         raise RuntimeError('Modifying data of Raw is only supported '
                             'when preloading is used. Use preload=True '
-                            '(or string) in the constructor.')
-    events_sel = (events[:, 2] == event_id)
-    event_start = events[events_sel, 0]
-    s_start = np.ceil(raw.info['sfreq'] * np.abs(tmin))
-    s_end = np.ceil(raw.info['sfreq'] * tmax)
+                            '(or string) in the constructor, or give fname '
+                            'to save the corrected data.')
+    s_start = int(ceil(raw.info['sfreq'] * np.abs(tmin)))
+    s_end = int(ceil(raw.info['sfreq'] * tmax))
+    n_samp = s_start + s_end
+    n_times = raw.last_samp - raw.first_samp + 1
+    event_start = events[events[:, 2] == event_id, 0]
+    starts, stops = _stim_windows(event_start - raw.first_samp - s_start,
+                                  n_samp, n_times, mode)
+    logger.info('Correcting %d stimulation artifact windows'
+                % len(event_start))
 
     picks = pick_types(raw.info, meg=True, eeg=True)
 
+    window = None
     if mode == 'window':
-        window = 1 - np.r_[signal.hann(4)[:2], np.ones(s_end + s_start - 4),
-                            signal.hann(4)[-2:]].T
+        window = 1 - np.r_[signal.hann(4)[:2], np.ones(n_samp - 4),
+                           signal.hann(4)[-2:]].T
 
-    for k in range(len(event_start)):
-        first_samp = event_start[k] - raw.first_samp - s_start
-        last_samp = event_start[k] - raw.first_samp + s_end
-        data, _ = raw[picks, first_samp:last_samp]
+    if raw._preloaded:
         if mode == 'linear':
-            x = np.array([first_samp, last_samp])
-            f = interpolate.interp1d(x, data[:, (0, -1)])
-            xnew = np.arange(first_samp, last_samp)
-            interp_data = f(xnew)
-            raw[picks, first_samp:last_samp] = interp_data
-        elif mode == 'window':
-            raw[picks, first_samp:last_samp] = data * window[np.newaxis, :]
+            _interp_windows(raw._data, picks, starts, stops)
+        else:
+            _apply_windows(raw._data, picks, window, starts)
+        if fname is not None:
+            raw.save(fname, buffer_size_sec=buffer_size_sec)
+        return raw
+
+    _save_stim_corrected(raw, fname, picks, starts, stops, window,
+                         buffer_size_sec)
     return raw
+
+
+def _save_stim_corrected(raw, fname, picks, starts, stops, window,
+                         buffer_size_sec):
+    """Save raw buffer by buffer, correcting the artifact windows"""
+    if any([fname == f for f in raw.info['filenames']]):
+        raise ValueError('You cannot save data to the same file.'
+                         ' Please use a different filename.')
+    n_times = raw.last_samp - raw.first_samp + 1
+    buffer_size = int(ceil(buffer_size_sec * raw.info['sfreq']))
+
+    outfid, cals = start_writing_raw(fname, raw.info)
+    write_int(outfid, FIFF.FIFF_FIRST_SAMPLE, raw.first_samp)
+    first = 0
+    while first < n_times:
+        last = min(first + buffer_size, n_times)
+        if window is None:
+            # do not split an interpolated window across buffers
+            inside = np.where((starts < last) & (stops > last))[0]
+            if len(inside) > 0:
+                last = stops[inside[0]]
+        data, _ = raw[:, first:last]
+        if window is None:
+            sel = (starts >= first) & (stops <= last)
+            _interp_windows(data, picks, starts[sel], stops[sel], first)
+        else:
+            sel = (starts < last) & (starts + len(window) > first)
+            _apply_windows(data, picks, window, starts[sel], first)
+        logger.info('Writing ...')
+        write_raw_buffer(outfid, data, cals)
+        logger.info('[done]')
+        first = last
+    finish_writing_raw(outfid)
@@ -1,9 +1,12 @@
 import os.path as op
 
+import numpy as np
 from nose.tools import assert_true
+from numpy.testing import assert_array_equal
 
 from mne.fiff import Raw
-from mne.artifacts.ecg import find_ecg_events
+from mne.artifacts.ecg import find_ecg_events, qrs_detector, \
+                              _qrs_detector_blocks
 
 data_path = op.join(op.dirname(__file__), '..', '..', 'fiff', 'tests', 'data')
 raw_fname = op.join(data_path, 'test_raw.fif')
@@ -19,3 +22,41 @@ def test_find_ecg():
     n_events = len(events)
     _, times = raw[0, :]
     assert_true(55 < average_pulse < 60)
+
+    # same events when the ECG is read and filtered in smaller blocks
+    events2, _, _ = find_ecg_events(raw, event_id=999, ch_name='MEG 1531',
+                                    block_size=3.)
+    assert_array_equal(events, events2)
+
+
+def test_qrs_detector():
+    """Test QRS detection on several channels"""
+    raw = Raw(raw_fname)
+    picks = [raw.ch_names.index(name) for name in ['MEG 1531', 'MEG 1541']]
+    data, _ = raw[picks, :]
+    events = qrs_detector(raw.info['sfreq'], data)
+    assert_true(len(events) == 2)
+    for this_data, this_events in zip(data, events):
+        assert_array_equal(this_events,
+                           qrs_detector(raw.info['sfreq'], this_data))
+
+
+def test_qrs_detector_tail():
+    """Test QRS detection with a beat at the end of the signal"""
+    sfreq = 100.
+    win_size = 50
+    rng = np.random.RandomState(0)
+    ecg = np.zeros(1000)
+    ecg[50::100] = 1. + 0.1 * rng.rand(10)
+    ecg[-30] = 1.  # in the last 2 * win_size samples
+    events = None
+    for block_size in [1000, 300, 70]:
+        blocks = [(k, ecg[k:k + block_size])
+                  for k in range(0, len(ecg), block_size)]
+        this_events = _qrs_detector_blocks(sfreq, blocks)
+        assert_true(len(this_events) > 0)
+        assert_true(np.all(ecg[this_events] > 0.5))
+        assert_true(np.all(this_events < len(ecg) - win_size))
+        if events is None:
+            events = this_events
+        assert_array_equal(events, this_events)
@@ -162,6 +162,7 @@ def test_ica_additional():
     assert_true(sources.shape[1] == ica.n_components)
 
     sources = ica.get_sources_raw(raw)
+    assert_raises(ValueError, ica.get_sources_raw, raw, start=10, stop=10)
 
     # score funcs raw
     sfunc_test = [ica.find_sources_raw(raw, target='EOG 061', score_func=n,
@@ -226,3 +227,66 @@ def test_ica_additional():
                   order=np.arange(50))
     assert_raises(ValueError, ica.plot_sources_epochs, epochs,
                   order=np.arange(50))
+
+
+@sklearn_test
+def test_ica_chunked():
+    """Test ICA on raw data processed in chunks
+    """
+    stop2 = 500
+    ica = ICA(n_components=3, max_n_components=4, random_state=0)
+    ica.decompose_raw(raw, picks=picks, start=start, stop=stop2,
+                      chunk_size=100, decim=2)
+    assert_true(ica.n_components == 3)
+
+    # the chunked and single pass sources must agree
+    sources = ica.get_sources_raw(raw, start=0, stop=stop2)
+    sources2 = ica.get_sources_raw(raw, start=0, stop=stop2, chunk_size=77)
+    assert_array_almost_equal(sources, sources2)
+
+    raw2 = ica.pick_sources_raw(raw, exclude=[0], copy=True,
+                                n_pca_components=ica.n_components)
+    raw3 = ica.pick_sources_raw(raw, exclude=[0], copy=True,
+                                n_pca_components=ica.n_components,
+                                chunk_size=123)
+    assert_array_almost_equal(raw2[picks, :][0], raw3[picks, :][0])
+
+
+@sklearn_test
+def test_ica_cleaning_operator():
+    """Test the linear ICA cleaning operator
+    """
+    ica = ICA(n_components=3, max_n_components=4, random_state=0)
+    assert_raises(RuntimeError, ica.get_cleaning_operator)
+    ica.decompose_raw(raw, picks=picks, start=start, stop=500)
+
+    operator, offset = ica.get_cleaning_operator(exclude=[0],
+                                                 n_pca_components=4)
+    n_channels = len(ica.ch_names)
+    assert_true(operator.shape == (n_channels, n_channels))
+    assert_true(offset.shape == (n_channels,))
+    # operators are cached
+    assert_true(ica.get_cleaning_operator(exclude=[0],
+                                          n_pca_components=4)[0] is operator)
+
+    # the operator is equivalent to the step by step recomposition
+    data = raw[picks, :500][0]
+    sources, pca_data = ica._get_sources_data(data)
+    cleaned = ica._pick_sources(sources, pca_data, None, [0], 4)
+    assert_array_almost_equal(np.dot(operator, data) + offset[:, None],
+                              cleaned)
+
+    # the cached operators cannot be modified in place
+    assert_raises(ValueError, operator.__imul__, 2.)
+    assert_raises(ValueError, offset.__iadd__, 1.)
+
+    # and are recomputed after a new fit
+    ica.current_fit = 'unfitted'
+    ica.decompose_raw(raw, picks=picks, start=start, stop=stop)
+    operator_2, offset_2 = ica.get_cleaning_operator(exclude=[0],
+                                                     n_pca_components=4)
+    assert_true(operator_2 is not operator)
+    sources, pca_data = ica._get_sources_data(data)
+    cleaned = ica._pick_sources(sources, pca_data, None, [0], 4)
+    assert_array_almost_equal(np.dot(operator_2, data) + offset_2[:, None],
+                              cleaned)
@@ -3,18 +3,20 @@
 # License: BSD (3-clause)
 
 import os.path as op
+from tempfile import mkdtemp
 
 import numpy as np
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 from nose.tools import assert_true
 
 from mne.fiff import Raw
 from mne.event import read_events
-from mne.artifacts.stim import eliminate_stim_artifact
+from mne.artifacts.stim import eliminate_stim_artifact, _stim_windows
 
 data_path = op.join(op.dirname(__file__), '..', '..', 'fiff', 'tests', 'data')
 raw_fname = op.join(data_path, 'test_raw.fif')
 event_fname = op.join(data_path, 'test-eve.fif')
+tempdir = mkdtemp()
 
 
 def test_stim_elim():
@@ -34,3 +36,27 @@ def test_stim_elim():
                                   tmax=0.01, mode='window')
     data, times = raw[:, tidx:tidx + 1]
     assert_true(np.all(data) == 0.)
+
+
+def test_stim_windows():
+    """Test merging of overlapping stim artifact windows"""
+    starts, stops = _stim_windows([-5, 10, 12, 30, 40], 10, 45, 'linear')
+    assert_array_equal(starts, [0, 10, 30])
+    assert_array_equal(stops, [5, 22, 45])
+    starts, stops = _stim_windows([-5, 10, 12, 30, 40], 10, 45, 'window')
+    assert_array_equal(starts, [-5, 10, 12, 30, 40])
+
+
+def test_stim_elim_no_preload():
+    """Test saving stim artifact corrected data without preloading"""
+    events = read_events(event_fname)
+    for mode in ('linear', 'window'):
+        raw = Raw(raw_fname, preload=True)
+        eliminate_stim_artifact(raw, events, event_id=1, mode=mode)
+        fname = op.join(tempdir, 'stim_%s_raw.fif' % mode)
+        raw_2 = Raw(raw_fname, preload=False)
+        eliminate_stim_artifact(raw_2, events, event_id=1, mode=mode,
+                                fname=fname, buffer_size_sec=1.)
+        raw_2.close()
+        raw_2 = Raw(fname)
+        assert_array_almost_equal(raw[:, :][0], raw_2[:, :][0])
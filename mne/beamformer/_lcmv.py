@@ -12,7 +12,7 @@ import logging
 logger = logging.getLogger('mne')
 
 from ..fiff.constants import FIFF
-from ..fiff.proj import make_projector
+from ..fiff.proj import Projector, _make_projector_basis
 from ..fiff.pick import pick_types, pick_channels_forward, pick_channels_cov
 from ..minimum_norm.inverse import _get_vertno, combine_xyz
 from ..cov import compute_whitener
@@ -22,28 +22,18 @@ from .. import verbose
 
 
 @verbose
-def _apply_lcmv(data, info, tmin, forward, noise_cov, data_cov, reg,
-                label=None, picks=None, verbose=None):
-    """ LCMV beamformer for evoked data, single epochs, and raw data
+def _prepare_lcmv(info, forward, noise_cov, label=None, picks=None,
+                  verbose=None):
+    """Compute the quantities of the LCMV that do not depend on the data
 
     Parameters
     ----------
-    data : array or list / iterable
-        Sensor space data. If data.ndim == 2 a single observation is assumed
-        and a single stc is returned. If data.ndim == 3 or if data is
-        a list / iterable, a list of stc's is returned.
     info : dict
         Measurement info
-    tmin : float
-        Time of first sample
     forward : dict
         Forward operator
     noise_cov : Covariance
         The noise covariance
-    data_cov : Covariance
-        The data covariance
-    reg : float
-        The regularization for the whitened data covariance.
     label : Label
         Restricts the LCMV solution to a given label
     picks : array of int
@@ -53,10 +43,11 @@ def _apply_lcmv(data, info, tmin, forward, noise_cov, data_cov, reg,
 
     Returns
     -------
-    stc : SourceEstimate (or list of SourceEstimate)
-        Source time courses
+    lcmv_input : dict
+        The whitened and projected gain matrix G, the projector proj, the
+        whitener, the channel names ch_names, the picks, the vertices
+        vertno and the number of orientations per source n_orient.
     """
-
     is_free_ori = forward['source_ori'] == FIFF.FIFFV_MNE_FREE_ORI
 
     if picks is None:
@@ -82,8 +73,8 @@ def _apply_lcmv(data, info, tmin, forward, noise_cov, data_cov, reg,
         G = forward['sol']['data']
 
     # Handle SSPs
-    proj, ncomp, _ = make_projector(info['projs'], ch_names)
-    G = np.dot(proj, G)
+    proj = Projector(_make_projector_basis(info['projs'], ch_names))
+    G = proj.apply(G)
 
     # Handle whitening + data covariance
     whitener, _ = compute_whitener(noise_cov, info, picks)
@@ -91,10 +82,23 @@ def _apply_lcmv(data, info, tmin, forward, noise_cov, data_cov, reg,
     # whiten the leadfield
     G = np.dot(whitener, G)
 
+    return dict(G=G, proj=proj, whitener=whitener, ch_names=ch_names,
+                picks=picks, vertno=vertno, n_orient=3 if is_free_ori else 1)
+
+
+def _compute_lcmv_filters(lcmv_input, data_cov, reg):
+    """Compute the LCMV spatial filters for one data covariance
+
+    Returns the spatial filters W, applying to whitened and projected data,
+    and the noise normalization of each source.
+    """
+    G, proj, whitener = [lcmv_input[k] for k in ('G', 'proj', 'whitener')]
+    n_orient = lcmv_input['n_orient']
+
     # Apply SSPs + whitener to data covariance
-    data_cov = pick_channels_cov(data_cov, include=ch_names)
+    data_cov = pick_channels_cov(data_cov, include=lcmv_input['ch_names'])
     Cm = data_cov['data']
-    Cm = np.dot(proj, np.dot(Cm, proj.T))
+    Cm = proj.apply(proj.apply(Cm).T).T
     Cm = np.dot(whitener, np.dot(Cm, whitener.T))
 
     # Cm += reg * np.trace(Cm) / len(Cm) * np.eye(len(Cm))
@@ -102,21 +106,103 @@ def _apply_lcmv(data, info, tmin, forward, noise_cov, data_cov, reg,
 
     # Compute spatial filters
     W = np.dot(G.T, Cm_inv)
-    n_orient = 3 if is_free_ori else 1
     n_sources = G.shape[1] // n_orient
-    for k in range(n_sources):
-        Wk = W[n_orient * k: n_orient * k + n_orient]
-        Gk = G[:, n_orient * k: n_orient * k + n_orient]
-        Ck = np.dot(Wk, Gk)
-        Wk[:] = np.dot(linalg.pinv(Ck, 0.01), Wk)
+    Wk = W.reshape(n_sources, n_orient, -1)
+    Gk = G.T.reshape(n_sources, n_orient, -1)
+    Ck = _dot_blocks(Wk, Gk.swapaxes(1, 2))
+    W = _dot_blocks(_pinv_sym_blocks(Ck, 0.01), Wk).reshape(W.shape)
 
     # noise normalization
     noise_norm = np.sum(W ** 2, axis=1)
-    if is_free_ori:
+    if n_orient == 3:
         noise_norm = np.sum(np.reshape(noise_norm, (-1, 3)), axis=1)
 
     noise_norm = np.sqrt(noise_norm)
 
+    return W, noise_norm
+
+
+def _pinv_sym_blocks(C, cond):
+    """Pseudo-inverses of a stack of small symmetric matrices
+
+    Like linalg.pinv(C[k], cond), singular values smaller than cond times
+    the largest singular value of each matrix are treated as zero.
+    """
+    C = (C + C.swapaxes(1, 2)) / 2.
+    if C.shape[1] == 1:
+        s, u = C[:, 0], np.ones_like(C)
+    else:
+        try:  # eigh of stacked matrices needs numpy >= 1.8
+            s, u = np.linalg.eigh(C)
+        except np.linalg.LinAlgError:
+            s = np.empty(C.shape[:2])
+            u = np.empty(C.shape)
+            for k in range(len(C)):
+                s[k], u[k] = linalg.eigh(C[k])
+    s_max = np.max(np.abs(s), axis=1)[:, np.newaxis]
+    mask = np.abs(s) > cond * s_max
+    s_inv = np.zeros_like(s)
+    s_inv[mask] = 1. / s[mask]
+    return _dot_blocks(u * s_inv[:, np.newaxis, :], u.swapaxes(1, 2))
+
+
+def _dot_blocks(A, B):
+    """Matrix products of two stacks of matrices"""
+    return np.einsum('nij,njk->nik', A, B)
+
+
+@verbose
+def _apply_lcmv(data, info, tmin, forward, noise_cov, data_cov, reg,
+                label=None, picks=None, verbose=None):
+    """ LCMV beamformer for evoked data, single epochs, and raw data
+
+    Parameters
+    ----------
+    data : array or list / iterable
+        Sensor space data. If data.ndim == 2 a single observation is assumed
+        and a single stc is returned. If data.ndim == 3 or if data is
+        a list / iterable, a list of stc's is returned.
+    info : dict
+        Measurement info
+    tmin : float | list of float
+        Time of first sample. If a list, the time of the first sample of
+        each observation in data.
+    forward : dict
+        Forward operator
+    noise_cov : Covariance
+        The noise covariance
+    data_cov : Covariance | list of Covariance
+        The data covariance. If a list, data must be a list of the same
+        length and each observation is beamformed using its own data
+        covariance, sharing the computations that depend on the forward
+        operator only.
+    reg : float
+        The regularization for the whitened data covariance.
+    label : Label
+        Restricts the LCMV solution to a given label
+    picks : array of int
+        Indices (in info) of data channels
+    verbose : bool, str, int, or None
+        If not None, override default verbose level (see mne.verbose).
+
+    Returns
+    -------
+    stc : SourceEstimate (or list of SourceEstimate)
+        Source time courses
+    """
+    lcmv_input = _prepare_lcmv(info, forward, noise_cov, label, picks)
+    picks = lcmv_input['picks']
+    proj, whitener = lcmv_input['proj'], lcmv_input['whitener']
+
+    # with one data covariance per observation, each filter is computed
+    # when it is needed and dropped after use
+    cov_per_data = isinstance(data_cov, list)
+    if cov_per_data:
+        if len(data_cov) != len(data):
+            raise ValueError('data and data_cov must have the same length')
+    else:
+        W, noise_norm = _compute_lcmv_filters(lcmv_input, data_cov, reg)
+
     if isinstance(data, np.ndarray) and data.ndim == 2:
         data = [data]
         return_single = True
@@ -131,21 +217,27 @@ def _apply_lcmv(data, info, tmin, forward, noise_cov, data_cov, reg,
         if not return_single:
             logger.info("Processing epoch : %d" % (i + 1))
 
+        if cov_per_data:
+            W, noise_norm = _compute_lcmv_filters(lcmv_input, data_cov[i],
+                                                  reg)
+
         # SSP and whitening
-        M = np.dot(proj, M)
+        M = proj.apply(M)
         M = np.dot(whitener, M)
 
         # project to source space using beamformer weights
         sol = np.dot(W, M)
 
-        if is_free_ori:
+        if lcmv_input['n_orient'] == 3:
             logger.info('combining the current components...')
             sol = combine_xyz(sol)
 
         sol /= noise_norm[:, None]
 
         tstep = 1.0 / info['sfreq']
-        stc = SourceEstimate(sol, vertices=vertno, tmin=tmin, tstep=tstep)
+        this_tmin = tmin[i] if isinstance(tmin, list) else tmin
+        stc = SourceEstimate(sol, vertices=lcmv_input['vertno'],
+                             tmin=this_tmin, tstep=tstep)
 
         if not return_single:
             stcs.append(stc)
@@ -165,19 +257,24 @@ def lcmv(evoked, forward, noise_cov, data_cov, reg=0.01, label=None,
     Compute Linearly Constrained Minimum Variance (LCMV) beamformer
     on evoked data.
 
+    Several evoked data sets (e.g., conditions or time windows) can be
+    processed at once, each with its own data covariance. The whitened
+    gain matrix is then computed only once.
+
     NOTE : This implementation has not been heavilly tested so please
     report any issue or suggestions.
 
     Parameters
     ----------
-    evoked : Evoked
+    evoked : Evoked | list of Evoked
         Evoked data to invert
     forward : dict
         Forward operator
     noise_cov : Covariance
         The noise covariance
-    data_cov : Covariance
-        The data covariance
+    data_cov : Covariance | list of Covariance
+        The data covariance. If a list, evoked must be a list of the same
+        length and each evoked is beamformed using its data covariance.
     reg : float
         The regularization for the whitened data covariance.
     label : Label
@@ -187,8 +284,8 @@ def lcmv(evoked, forward, noise_cov, data_cov, reg=0.01, label=None,
 
     Returns
     -------
-    stc : SourceEstimate
-        Source time courses
+    stc : SourceEstimate | list of SourceEstimate
+        Source time courses. A list is returned if evoked is a list.
 
     Notes
     -----
@@ -198,9 +295,14 @@ def lcmv(evoked, forward, noise_cov, data_cov, reg=0.01, label=None,
     Biomedical Engineering (1997) vol. 44 (9) pp. 867--880
     """
 
-    info = evoked.info
-    data = evoked.data
-    tmin = evoked.times[0]
+    if isinstance(evoked, list):
+        info = evoked[0].info
+        data = [e.data for e in evoked]
+        tmin = [e.times[0] for e in evoked]
+    else:
+        info = evoked.info
+        data = evoked.data
+        tmin = evoked.times[0]
 
     stc = _apply_lcmv(data, info, tmin, forward, noise_cov, data_cov, reg,
                       label)
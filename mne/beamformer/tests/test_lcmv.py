@@ -3,10 +3,12 @@ import os.path as op
 from nose.tools import assert_true
 import numpy as np
 from numpy.testing import assert_array_almost_equal
+from scipy import linalg
 
 import mne
 from mne.datasets import sample
 from mne.beamformer import lcmv, lcmv_epochs, lcmv_raw
+from mne.beamformer._lcmv import _pinv_sym_blocks
 
 
 examples_folder = op.join(op.dirname(__file__), '..', '..', '..', 'examples')
@@ -69,6 +71,15 @@ def test_lcmv():
     assert_true(0.09 < tmax < 0.1)
     assert_true(2. < np.max(max_stc) < 3.)
 
+    # several evoked data sets with their own data covariances
+    data_cov_late = mne.compute_covariance(epochs, tmin=0.1, tmax=0.2)
+    stcs = lcmv([evoked, evoked], forward, noise_cov,
+                [data_cov, data_cov_late], reg=0.01)
+    assert_true(len(stcs) == 2)
+    assert_array_almost_equal(stcs[0].data, stc.data)
+    stc_late = lcmv(evoked, forward, noise_cov, data_cov_late, reg=0.01)
+    assert_array_almost_equal(stcs[1].data, stc_late.data)
+
     # Now test single trial using fixed orientation forward solution
     # so we can compare it to the evoked solution
     stcs = lcmv_epochs(epochs, forward_fixed, noise_cov, data_cov, reg=0.01)
@@ -87,6 +98,20 @@ def test_lcmv():
     assert_array_almost_equal(stc_avg, stc_fixed.data)
 
 
+def test_pinv_sym_blocks():
+    """Test pseudo-inverses of stacked symmetric matrices
+    """
+    rng = np.random.RandomState(0)
+    A = rng.randn(10, 3, 2)
+    C = np.array([np.dot(a, a.T) for a in A])  # rank deficient
+    C[0] = np.dot(A[0, :, :1], A[0, :, :1].T)
+    C_inv = _pinv_sym_blocks(C, 0.01)
+    for c, c_inv in zip(C, C_inv):
+        assert_array_almost_equal(c_inv, linalg.pinv(c, 0.01))
+    C_inv = _pinv_sym_blocks(C[:, :1, :1], 0.01)
+    assert_array_almost_equal(C_inv[:, 0, 0], 1. / C[:, 0, 0])
+
+
 def test_lcmv_raw():
     """Test LCMV with raw data
     """
@@ -20,6 +20,7 @@ from .fiff.pick import pick_types, channel_indices_by_type
 from .fiff.proj import setup_proj
 from .baseline import rescale
 from .utils import check_random_state
+from .fixes import bincount
 from .filter import resample
 from . import verbose
 
@@ -234,7 +235,7 @@ class Epochs(object):
         self.ch_names = self.info['ch_names']
 
         if self._projector is not None:
-            self._projector = self._projector[idx][:, idx]
+            self._projector = self._projector.pick(idx)
 
         if self.preload:
             self._data = self._data[:, idx, :]
@@ -292,7 +293,7 @@ class Epochs(object):
 
         if self.proj and self._projector is not None:
             logger.info("SSP projectors applied...")
-            epoch = np.dot(self._projector, epoch)
+            epoch = self._projector.apply(epoch)
 
         # Run baseline correction
         epoch = rescale(epoch, self.times, self.baseline, 'mean', copy=False)
@@ -692,7 +693,7 @@ class Epochs(object):
         return epochs_ts
 
 
-def equalize_epoch_counts(*args):
+def equalize_epoch_counts(*args, **kwargs):
     """Equalize the number of trials in multiple Epoch instances
 
     It tries to make the remaining epochs occuring as close as possible in
@@ -707,10 +708,10 @@ def equalize_epoch_counts(*args):
 
     Note that this operates on the Epochs instances in-place.
 
-    It chooses the epochs to eliminate by minimizing the differences in timing
-    between Epochs instances with more trials and the Epochs instance with the
-    fewest trials. This function will also call drop_bad_epochs() on any epochs
-    instance that hasn't yet had bad epochs dropped.
+    It chooses the epochs to eliminate by matching, in order, the event times
+    of each Epochs instance to the nearest event times of the Epochs instance
+    with the fewest trials. This function will also call drop_bad_epochs() on
+    any epochs instance that hasn't yet had bad epochs dropped.
 
     Example:
 
@@ -724,7 +725,15 @@ def equalize_epoch_counts(*args):
         If 'truncate', events will be truncated from the end of each event
         list. If 'mintime', timing differences between each event list will be
         minimized.
+
+    Returns
+    -------
+    drop_indices : list of array
+        The indices of the epochs dropped from each Epochs instance.
     """
+    method = kwargs.pop('method', 'mintime')
+    if len(kwargs) > 0:
+        raise TypeError('Unexpected keyword arguments: %s' % kwargs.keys())
     epochs_list = args
     if not all([isinstance(e, Epochs) for e in epochs_list]):
         raise ValueError('All inputs must be Epochs instances')
@@ -732,35 +741,66 @@ def equalize_epoch_counts(*args):
     # make sure bad epochs are dropped
     [e.drop_bad_epochs() if not e._bad_dropped else None for e in epochs_list]
 
-    small_idx = np.argmin([e.events.shape[0] for e in epochs_list])
-    small_e_times = epochs_list[small_idx].events[:, 0]
-    for e in epochs_list:
-        mask = _minimize_time_diff(small_e_times, e.events[:, 0])
-        indices = np.where(np.logical_not(mask))[0]
+    drop_indices = _get_drop_indices([e.events[:, 0] for e in epochs_list],
+                                     method)
+    for e, indices in zip(epochs_list, drop_indices):
         e.drop_epochs(indices)
+    return drop_indices
 
 
-def _minimize_time_diff(t_shorter, t_longer):
-    """Find a boolean mask to minimize timing differences"""
-    keep = np.ones((len(t_longer)), dtype=bool)
-    scores = np.ones((len(t_longer)))
-    for iter in range(len(t_longer) - len(t_shorter)):
-        scores.fill(np.inf)
-        # Check every possible removal to see if it minimizes
-        for idx in np.where(keep)[0]:
-            keep[idx] = False
-            scores[idx] = _area_between_times(t_shorter, t_longer[keep])
-            keep[idx] = True
-        keep[np.argmin(scores)] = False
-    return keep
+def _get_drop_indices(event_times, method='mintime'):
+    """Find the events to drop to equalize the event counts
+
+    Parameters
+    ----------
+    event_times : list of array
+        The event times (in samples) of each condition.
+    method : 'mintime' | 'truncate'
+        See equalize_epoch_counts.
 
+    Returns
+    -------
+    drop_indices : list of array
+        The indices of the events to drop in each condition.
+    """
+    if method not in ('mintime', 'truncate'):
+        raise ValueError('method must be "mintime" or "truncate", not %s'
+                         % method)
+    event_times = [np.asarray(t) for t in event_times]
+    small_idx = np.argmin([len(t) for t in event_times])
+    n_keep = len(event_times[small_idx])
+    t_small = np.sort(event_times[small_idx])
+
+    drop_indices = list()
+    for t in event_times:
+        if method == 'truncate':
+            keep = np.arange(n_keep)
+        else:
+            order = np.argsort(t, kind='mergesort')
+            keep = order[_match_times(t_small, t[order])]
+        mask = np.ones(len(t), dtype=np.bool)
+        mask[keep] = False
+        drop_indices.append(np.where(mask)[0])
+    return drop_indices
 
-def _area_between_times(t1, t2):
-    """Quantify the difference between two timing sets"""
-    x1 = range(len(t1))
-    x2 = range(len(t2))
-    xs = np.concatenate((x1, x2))
-    return np.sum(np.abs(np.interp(xs, x1, t1) - np.interp(xs, x2, t2)))
+
+def _match_times(t_ref, t):
+    """Match sorted times t_ref to as many sorted times t, keeping the order
+
+    Each time in t_ref is matched to the nearest time in t, then the matches
+    are made strictly increasing and within the range left for the other
+    matches, so that len(t_ref) distinct indices of t are returned.
+    """
+    n, n_extra = len(t_ref), len(t) - len(t_ref)
+    if n_extra == 0:
+        return np.arange(n)
+    # nearest neighbor, ties going to the earlier time
+    idx = np.clip(np.searchsorted(t, t_ref), 1, len(t) - 1)
+    idx -= (t_ref - t[idx - 1]) <= (t[idx] - t_ref)
+    # the i-th match can only be one of t[i:i + n_extra + 1]
+    offset = np.clip(idx - np.arange(n), 0, n_extra)
+    offset = np.maximum.accumulate(offset)
+    return offset + np.arange(n)
 
 
 @verbose
@@ -848,3 +888,128 @@ def bootstrap(epochs, random_state=None):
     idx = rng.randint(0, n_events, n_events)
     epochs_bootstrap = epochs_bootstrap[idx]
     return epochs_bootstrap
+
+
+def _resampling_weights(n_epochs, method, n_resamples, rng):
+    """Number of times each epoch is used by each resample"""
+    if method == 'bootstrap':
+        idx = rng.randint(0, n_epochs, (n_resamples, n_epochs))
+        idx += n_epochs * np.arange(n_resamples)[:, np.newaxis]
+        weights = bincount(idx.ravel(), minlength=n_resamples * n_epochs)
+        weights = weights.reshape(n_resamples, n_epochs)
+    elif method == 'jackknife':
+        weights = 1 - np.eye(n_epochs, dtype=np.int)
+    elif method == 'split-half':
+        # the two halves of each split are in consecutive rows
+        order = np.argsort(rng.rand(n_resamples, n_epochs), axis=1)
+        weights = np.zeros((n_resamples, 2, n_epochs), dtype=np.int)
+        rows = np.arange(n_resamples)[:, np.newaxis]
+        weights[rows, 0, order[:, :n_epochs // 2]] = 1
+        weights[rows, 1, order[:, n_epochs // 2:]] = 1
+        weights = weights.reshape(2 * n_resamples, n_epochs)
+    else:
+        raise ValueError('method must be "bootstrap", "jackknife" or '
+                         '"split-half", not %s' % method)
+    return weights
+
+
+def _iter_epochs_batches(epochs, batch_size=50):
+    """Iterate over the (good) epochs data by batches"""
+    n_epochs = len(epochs.events)
+    for start in range(0, n_epochs, batch_size):
+        stop = min(start + batch_size, n_epochs)
+        if epochs.preload:
+            yield start, epochs._data[start:stop]
+        else:
+            yield start, np.array([epochs._get_epoch_from_disk(idx)
+                                   for idx in range(start, stop)])
+
+
+@verbose
+def compute_resampling_stats(epochs, stat='average', method='bootstrap',
+                             n_resamples=100, random_state=None,
+                             verbose=None):
+    """Compute statistics of resampled epochs
+
+    The resamples are represented by the number of times they use each
+    epoch, and the statistics of all resamples are computed together from
+    weighted sums of the epochs, without copying the data of the resamples.
+    Epochs that are not preloaded are read once.
+
+    Parameters
+    ----------
+    epochs : Epochs instance
+        The epochs to resample.
+    stat : 'average' | 'standard_error' | 'covariance'
+        The statistic to compute for each resample. 'covariance' is the
+        sensor covariance (not centered) over all time points of the epochs.
+    method : 'bootstrap' | 'jackknife' | 'split-half'
+        'bootstrap' draws as many epochs as there are with replacement,
+        'jackknife' leaves out each epoch in turn and 'split-half' splits
+        the epochs in two random halves.
+    n_resamples : int
+        Number of resamples ('bootstrap') or splits ('split-half'). Not
+        used for 'jackknife', which has one resample per epoch.
+    random_state : None | int | np.random.RandomState
+        To specify the random generator state.
+    verbose : bool, str, int, or None
+        If not None, override default verbose level (see mne.verbose).
+
+    Returns
+    -------
+    stats : array
+        The statistic of each resample, of shape [n_resamples, n_channels,
+        n_times], or [n_resamples, n_channels, n_channels] for
+        'covariance'. For 'split-half', the second dimension has size 2 and
+        holds the statistic of each half.
+    """
+    if stat not in ('average', 'standard_error', 'covariance'):
+        raise ValueError('stat must be "average", "standard_error" or '
+                         '"covariance", not %s' % stat)
+    if not epochs._bad_dropped:
+        epochs.drop_bad_epochs()
+
+    rng = check_random_state(random_state)
+    n_epochs = len(epochs.events)
+    if n_epochs == 0:
+        raise ValueError('No epochs to resample')
+    if method == 'split-half' and n_epochs < 2:
+        raise ValueError('At least 2 epochs are needed for split-half '
+                         'resampling, got %d' % n_epochs)
+    weights = _resampling_weights(n_epochs, method, n_resamples, rng)
+    n_used = weights.sum(axis=1).astype(np.float)
+    logger.info('Computing %s of %d resamples of %d epochs'
+                % (stat, len(weights), n_epochs))
+
+    n_channels, n_times = len(epochs.ch_names), len(epochs.times)
+    shift = None
+    sums, sums_sq = 0., 0.
+    for start, data in _iter_epochs_batches(epochs):
+        w = weights[:, start:start + len(data)]
+        if stat == 'covariance':
+            data = np.einsum('eit,ejt->eij', data, data)
+            sums += np.dot(w, data.reshape(len(data), -1))
+            continue
+        # shifting by an epoch avoids cancellations in the variance
+        if shift is None:
+            shift = data[0].copy()
+        data = (data - shift).reshape(len(data), -1)
+        sums += np.dot(w, data)
+        if stat == 'standard_error':
+            sums_sq += np.dot(w, data ** 2)
+
+    if stat == 'covariance':
+        stats = sums / (n_used[:, np.newaxis] * n_times)
+        shape = (n_channels, n_channels)
+    else:
+        stats = sums / n_used[:, np.newaxis]
+        shape = (n_channels, n_times)
+        if stat == 'standard_error':
+            stats = sums_sq / n_used[:, np.newaxis] - stats ** 2
+            stats = np.sqrt(np.maximum(stats, 0.) / n_used[:, np.newaxis])
+        else:
+            stats += shift.ravel()
+
+    if method == 'split-half':
+        return stats.reshape((-1, 2) + shape)
+    return stats.reshape((-1,) + shape)
@@ -7,6 +7,7 @@
 # License: BSD (3-clause)
 
 import warnings
+from math import ceil
 import numpy as np
 from os.path import splitext
 
@@ -19,6 +20,7 @@ from .fiff.tag import read_tag
 from .fiff.open import fiff_open
 from .fiff.write import write_int, start_block, start_file, end_block, end_file
 from .fiff.pick import pick_channels
+from .fiff.raw import _iter_raw_blocks
 from . import verbose
 
 
@@ -177,8 +179,63 @@ def write_events(filename, event_list):
         f.close()
 
 
+def _iter_find_events(raw, pick, block_size, output='onset', combine=False,
+                      mask=None):
+    """Find the events of the stim channels block by block
+
+    Yields the events found in each block of block_size samples, and the
+    samples where the trigger changes (first sample of each new value). The
+    last sample of each block is kept to detect the events at the start of
+    the next one.
+    """
+    last = None
+    warned = False
+    # the trigger values are read as stored, unless they need calibration
+    calibrate = np.any(raw.cals.ravel()[pick] != 1.)
+    blocks = _iter_raw_blocks(raw, pick, block_size, calibrate=calibrate)
+    for start, data in blocks:
+        if np.any(data < 0):
+            if not warned:
+                logger.warn('Trigger channel contains negative values. '
+                            'Taking absolute value.')
+                warned = True
+            data = np.abs(data)  # make sure trig channel is positive
+        data = data.astype(np.int)
+        if mask is not None:
+            data &= mask
+        if combine:
+            # one bit per channel
+            bits = np.left_shift(1, np.arange(len(data)))
+            data = np.dot(bits, data != 0)[np.newaxis]
+        if last is not None:
+            data = np.c_[last, data]
+            start -= 1
+        last = data[:, -1:]
+
+        diff = np.diff(data, axis=1)
+        if output == 'onset':
+            idx = np.where(np.all(diff > 0, axis=0))[0] + 1
+            prev = np.zeros_like(idx)
+            events_id = data[0, idx]
+        elif output == 'offset':
+            # the last sample of each value
+            idx = np.where(np.all(diff < 0, axis=0))[0]
+            prev = np.zeros_like(idx)
+            events_id = data[0, idx]
+        else:
+            idx = np.where(np.any(diff != 0, axis=0))[0] + 1
+            prev = data[0, idx - 1]
+            events_id = data[0, idx]
+        changes = np.where(np.any(diff != 0, axis=0))[0] + 1
+        changes += raw.first_samp + start
+        idx += raw.first_samp + start
+        yield np.c_[idx, prev, events_id], changes
+
+
 @verbose
-def find_events(raw, stim_channel='STI 014', verbose=None):
+def find_events(raw, stim_channel='STI 014', block_size=60., output='onset',
+                combine=False, mask=None, return_durations=False,
+                verbose=None):
     """Find events from raw file
 
     Parameters
@@ -188,6 +245,23 @@ def find_events(raw, stim_channel='STI 014', verbose=None):
     stim_channel : string or list of string
         Name of the stim channel or all the stim channels
         affected by the trigger.
+    block_size : float
+        Duration in seconds of the blocks of data read at once.
+    output : 'onset' | 'offset' | 'step'
+        Events to find. 'onset' finds the samples where the trigger value
+        increases (on all the stim channels), 'offset' the last samples
+        before it decreases, and 'step' all the changes of the trigger
+        value. For 'step', the second column of the events contains the
+        previous trigger value.
+    combine : bool
+        If True, the stim channels are combined into a single trigger, in
+        which each channel sets one bit (the first channel is the least
+        significant bit) when it is non-zero.
+    mask : int | None
+        If not None, the values of the stim channels are combined with this
+        bit mask (bitwise and) before looking for events.
+    return_durations : bool
+        If True, the durations of the events are also returned.
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
 
@@ -195,7 +269,13 @@ def find_events(raw, stim_channel='STI 014', verbose=None):
     -------
     events : array
         The array of event onsets in time samples.
+    durations : array
+        Number of samples during which the trigger keeps the value of each
+        event (for 'offset', the number of samples of the value which ends).
+        Only returned if return_durations is True.
     """
+    if output not in ['onset', 'offset', 'step']:
+        raise ValueError('output must be "onset", "offset" or "step"')
     if not isinstance(stim_channel, list):
         stim_channel = [stim_channel]
 
@@ -203,19 +283,26 @@ def find_events(raw, stim_channel='STI 014', verbose=None):
                          exclude=[])
     if len(pick) == 0:
         raise ValueError('No stim channel found to extract event triggers.')
-    data, times = raw[pick, :]
-    if np.any(data < 0):
-        logger.warn('Trigger channel contains negative values. '
-                    'Taking absolute value.')
-        data = np.abs(data)  # make sure trig channel is positive
-    data = data.astype(np.int)
-    idx = np.where(np.all(np.diff(data, axis=1) > 0, axis=0))[0]
-    events_id = data[0, idx + 1].astype(np.int)
-    idx += raw.first_samp + 1
-    events = np.c_[idx, np.zeros_like(idx), events_id]
+    events = [np.zeros((0, 3), dtype=np.int)]
+    changes = [np.zeros(0, dtype=np.int)]
+    for this_events, this_changes in _iter_find_events(raw, pick,
+                            int(ceil(block_size * raw.info['sfreq'])),
+                            output, combine, mask):
+        events.append(this_events)
+        changes.append(this_changes)
+    events = np.concatenate(events)
     logger.info("%s events found" % len(events))
     logger.info("Events id: %s" % np.unique(events[:, 2]))
-    return events
+    if not return_durations:
+        return events
+
+    # the samples where the trigger values start and end
+    changes = np.concatenate(changes)
+    starts = np.r_[raw.first_samp, changes]
+    stops = np.r_[changes, raw.last_samp + 1]
+    pos = np.searchsorted(changes, events[:, 0], side='right')
+    durations = stops[pos] - starts[pos]
+    return events, durations
 
 
 def merge_events(events, ids, new_id):
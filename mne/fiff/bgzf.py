@@ -0,0 +1,270 @@
+"""Block compressed gzip files with random access
+
+The files are made of independently compressed gzip members of at most
+64 kB of uncompressed data, as in the BGZF format of SAMtools. Each member
+stores its compressed size in the 'BC' extra field of its header, which
+allows to index the blocks without decompressing them. The files remain
+valid gzip files that can be read with any gzip reader.
+"""
+
+# Authors: Alexandre Gramfort <gramfort@nmr.mgh.harvard.edu>
+#
+# License: BSD (3-clause)
+
+import struct
+import zlib
+import numpy as np
+
+# Uncompressed size of the blocks, chosen such that the compressed blocks
+# remain smaller than 64 kB even for incompressible data
+BLOCK_SIZE = 65280
+
+_HEADER = '\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00'
+_HEADER_SIZE = len(_HEADER) + 2
+_EOF_BLOCK = _HEADER + '\x1b\x00\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+
+
+def _make_block(data, compresslevel):
+    """Compress data into a gzip member with a 'BC' extra field"""
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+    cdata = compressor.compress(data) + compressor.flush()
+    # BSIZE is the total block size minus 1
+    bsize = _HEADER_SIZE + len(cdata) + 8 - 1
+    crc = zlib.crc32(data) & 0xffffffff
+    return ''.join([_HEADER, struct.pack('<H', bsize), cdata,
+                    struct.pack('<II', crc, len(data) & 0xffffffff)])
+
+
+def is_block_gzip(fname):
+    """Test if a file is a block compressed gzip file"""
+    fid = open(fname, 'rb')
+    header = fid.read(_HEADER_SIZE)
+    fid.close()
+    return _read_bsize(header) is not None
+
+
+def _read_bsize(header):
+    """Get the size of a block from its header, None if it is not BGZF"""
+    if len(header) < _HEADER_SIZE or header[:4] != '\x1f\x8b\x08\x04':
+        return None
+    xlen = struct.unpack('<H', header[10:12])[0]
+    if xlen != 6 or header[12:14] != 'BC':
+        return None
+    return struct.unpack('<H', header[16:18])[0] + 1
+
+
+class BlockGzipReader(object):
+    """Read-only file object for block compressed gzip files
+
+    Seeking only requires to decompress the block that contains the new
+    position. The decompressed blocks are kept in a LRU cache.
+
+    Parameters
+    ----------
+    fname : string
+        The name of the file.
+    cache_size : int
+        The number of decompressed blocks to keep in memory.
+    """
+    def __init__(self, fname, cache_size=32):
+        self.name = fname
+        self._fid = open(fname, 'rb')
+        self._cache_size = cache_size
+        self._cache = dict()
+        self._cache_keys = list()
+        self._pos = 0
+        # the block being read
+        self._block = ''
+        self._block_start = self._block_stop = 0
+        self._index_blocks()
+
+    def _index_blocks(self):
+        """Get the compressed and uncompressed offsets of the blocks"""
+        fid = self._fid
+        coffsets, usizes = list(), list()
+        coffset = 0
+        while True:
+            fid.seek(coffset, 0)
+            bsize = _read_bsize(fid.read(_HEADER_SIZE))
+            if bsize is None:
+                break
+            fid.seek(coffset + bsize - 4, 0)
+            usize = struct.unpack('<I', fid.read(4))[0]
+            if usize > 0:
+                coffsets.append(coffset)
+                usizes.append(usize)
+            coffset += bsize
+        if coffset == 0:
+            raise ValueError('%s is not a block compressed gzip file'
+                             % self.name)
+        self._coffsets = np.array(coffsets + [coffset], dtype=np.int64)
+        self._uoffsets = np.cumsum([0] + usizes).astype(np.int64)
+
+    def _get_block(self, idx):
+        """Get a decompressed block, using the cache if possible"""
+        if idx in self._cache:
+            self._cache_keys.remove(idx)
+            self._cache_keys.append(idx)
+            return self._cache[idx]
+        start, stop = self._coffsets[idx], self._coffsets[idx + 1]
+        self._fid.seek(start, 0)
+        cdata = self._fid.read(stop - start)
+        block = zlib.decompress(cdata[_HEADER_SIZE:-8], -15)
+        self._cache[idx] = block
+        self._cache_keys.append(idx)
+        if len(self._cache_keys) > self._cache_size:
+            del self._cache[self._cache_keys.pop(0)]
+        return block
+
+    def read(self, size=-1):
+        """Read at most size bytes, all remaining bytes if size < 0"""
+        size_total = int(self._uoffsets[-1])
+        if size is None or size < 0:
+            size = size_total - self._pos
+        stop = min(self._pos + size, size_total)
+        out = list()
+        while self._pos < stop:
+            if not self._block_start <= self._pos < self._block_stop:
+                idx = np.searchsorted(self._uoffsets, self._pos, 'right') - 1
+                self._block = self._get_block(idx)
+                self._block_start = int(self._uoffsets[idx])
+                self._block_stop = int(self._uoffsets[idx + 1])
+            offset = self._pos - self._block_start
+            chunk = self._block[offset:offset + stop - self._pos]
+            out.append(chunk)
+            self._pos += len(chunk)
+        return ''.join(out)
+
+    def seek(self, offset, whence=0):
+        """Move to a new position in the uncompressed data"""
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self._uoffsets[-1]
+        if offset < 0:
+            raise IOError('Negative seek in a block compressed gzip file')
+        self._pos = int(offset)
+
+    def tell(self):
+        """Get the current position in the uncompressed data"""
+        return self._pos
+
+    def close(self):
+        """Close the file"""
+        self._fid.close()
+        self._cache = dict()
+        self._cache_keys = list()
+        self._block = ''
+        self._block_start = self._block_stop = 0
+
+
+class BlockGzipWriter(object):
+    """Write-only file object for block compressed gzip files
+
+    The data are compressed in blocks of BLOCK_SIZE bytes. The first block
+    can be ended early with flush, it is then stored without compression
+    so that it can be updated in place until the file is closed.
+
+    Parameters
+    ----------
+    fname : string
+        The name of the file.
+    compresslevel : int
+        The zlib compression level.
+    """
+    def __init__(self, fname, compresslevel=2):
+        self.name = fname
+        self._fid = open(fname, 'wb')
+        self._compresslevel = compresslevel
+        self._buffer = list()
+        self._buffer_size = 0
+        self._pos = 0
+        self._first_block = None
+        self._patch_pos = None
+
+    def _write_block(self, data):
+        """Compress and write one block"""
+        if self._first_block is None:
+            self._first_block = ''
+        self._fid.write(_make_block(data, self._compresslevel))
+
+    def _write_blocks(self, flush=False):
+        """Write the full blocks in the buffer, all of it if flush is True"""
+        data = ''.join(self._buffer)
+        n_full = len(data) // BLOCK_SIZE
+        for k in range(n_full):
+            self._write_block(data[k * BLOCK_SIZE:(k + 1) * BLOCK_SIZE])
+        data = data[n_full * BLOCK_SIZE:]
+        if flush and len(data) > 0:
+            self._write_block(data)
+            data = ''
+        self._buffer = [data] if len(data) > 0 else list()
+        self._buffer_size = len(data)
+
+    def write(self, data):
+        """Write data at the current position"""
+        if self._patch_pos is not None:
+            self._patch(data)
+            return
+        self._buffer.append(data)
+        self._buffer_size += len(data)
+        self._pos += len(data)
+        if self._buffer_size >= BLOCK_SIZE:
+            self._write_blocks()
+
+    def _patch(self, data):
+        """Update the stored first block"""
+        block = self._first_block
+        start = self._patch_pos
+        if start + len(data) > len(block):
+            raise IOError('Can only update the first block of a block '
+                          'compressed gzip file')
+        self._first_block = block[:start] + data + block[start + len(data):]
+        end = self._fid.tell()
+        self._fid.seek(0, 0)
+        self._fid.write(_make_block(self._first_block, 0))
+        self._fid.seek(end, 0)
+        self._patch_pos += len(data)
+
+    def flush(self):
+        """End the current block"""
+        if self._first_block is None and self._buffer_size > 0:
+            self._first_block = ''.join(self._buffer)
+            self._fid.write(_make_block(self._first_block, 0))
+            self._buffer = list()
+            self._buffer_size = 0
+        else:
+            self._write_blocks(flush=True)
+        self._fid.flush()
+
+    def seek(self, offset, whence=0):
+        """Move to a new position
+
+        Only the end of the data and the positions in the first block, if
+        it was ended by flush, can be reached.
+        """
+        if whence == 1:
+            offset += self.tell()
+        elif whence == 2:
+            offset += self._pos
+        if offset == self._pos:
+            self._patch_pos = None
+        elif self._first_block and 0 <= offset < len(self._first_block):
+            self._patch_pos = offset
+        else:
+            raise IOError('Cannot seek to position %d in a block compressed '
+                          'gzip file being written' % offset)
+
+    def tell(self):
+        """Get the current position in the uncompressed data"""
+        if self._patch_pos is not None:
+            return self._patch_pos
+        return self._pos
+
+    def close(self):
+        """Write the remaining data and the end of file marker"""
+        if self._fid.closed:
+            return
+        self._write_blocks(flush=True)
+        self._fid.write(_EOF_BLOCK)
+        self._fid.close()
@@ -55,6 +55,7 @@ FIFF.FIFFB_SSS_BASES          = 505
 #
 FIFF.FIFF_FILE_ID         = 100
 FIFF.FIFF_DIR_POINTER     = 101
+FIFF.FIFF_DIR             = 102
 FIFF.FIFF_BLOCK_ID        = 103
 FIFF.FIFF_BLOCK_START     = 104
 FIFF.FIFF_BLOCK_END       = 105
@@ -14,7 +14,7 @@ logger = logging.getLogger('mne')
 from .open import fiff_open
 from .tree import dir_tree_find, copy_tree
 from .constants import FIFF
-from .tag import read_tag
+from .tag import read_tag, read_struct_tags
 from .proj import read_proj, write_proj
 from .ctf import read_ctf_comp, write_ctf_comp
 from .channels import read_bad_channels
@@ -80,8 +80,7 @@ def read_meas_info(fid, tree, verbose=None):
             tag = read_tag(fid, pos)
             sfreq = float(tag.data)
         elif kind == FIFF.FIFF_CH_INFO:
-            tag = read_tag(fid, pos)
-            chs.append(tag.data)
+            chs.append(meas_info['directory'][k])
             p += 1
         elif kind == FIFF.FIFF_LOWPASS:
             tag = read_tag(fid, pos)
@@ -102,6 +101,8 @@ def read_meas_info(fid, tree, verbose=None):
                                 cand['to'] == FIFF.FIFFV_COORD_HEAD:
                 ctf_head_t = cand
 
+    chs = read_struct_tags(fid, chs)
+
     # Check that we have everything we need
     if nchan is None:
         raise ValueError('Number of channels in not defined')
@@ -141,14 +142,10 @@ def read_meas_info(fid, tree, verbose=None):
         warn('Multiple Isotrak found')
     else:
         isotrak = isotrak[0]
-        dig = []
-        for k in range(isotrak['nent']):
-            kind = isotrak['directory'][k].kind
-            pos = isotrak['directory'][k].pos
-            if kind == FIFF.FIFF_DIG_POINT:
-                tag = read_tag(fid, pos)
-                dig.append(tag.data)
-                dig[-1]['coord_frame'] = FIFF.FIFFV_COORD_HEAD
+        dig = read_struct_tags(fid, [d for d in isotrak['directory'] or []
+                                     if d.kind == FIFF.FIFF_DIG_POINT])
+        for d in dig:
+            d['coord_frame'] = FIFF.FIFFV_COORD_HEAD
 
     #   Locate the acquisition information
     acqpars = dir_tree_find(meas_info, FIFF.FIFFB_DACQ_PARS)
@@ -3,20 +3,121 @@
 #
 # License: BSD (3-clause)
 
+import os
 import os.path as op
 import gzip
+import hashlib
 import logging
 import cStringIO
+import cPickle
 logger = logging.getLogger('mne')
 
 from .tag import read_tag_info, read_tag
 from .tree import make_dir_tree
+from .bgzf import BlockGzipReader, is_block_gzip
 from .constants import FIFF
 from .. import verbose
 
 
+def _open_fid(fname, preload=False):
+    """Open a FIF file for reading, see fiff_open"""
+    if op.splitext(fname)[1].lower() == '.gz':
+        if is_block_gzip(fname):
+            logger.debug('Using block gzip')
+            fid = BlockGzipReader(fname)
+        else:
+            logger.debug('Using gzip')
+            fid = gzip.open(fname, "rb")  # Open in binary mode
+    else:
+        logger.debug('Using normal I/O')
+        fid = open(fname, "rb")  # Open in binary mode
+
+    # do preloading of entire file
+    if preload:
+        # note that cStringIO objects instantiated this way are read-only,
+        # but that's okay here since we are using mode "rb" anyway
+        fid = cStringIO.StringIO(fid.read())
+    return fid
+
+
+def _get_index_fname(fname, index_dir, kind):
+    """Get the name of a sidecar index file of a FIF file"""
+    key = hashlib.md5(op.abspath(fname)).hexdigest()
+    return op.join(index_dir, '%s-%s-%s.idx' % (op.basename(fname), key, kind))
+
+
+def read_fiff_index(fname, index_dir, kind):
+    """Read a sidecar index of a FIF file
+
+    Parameters
+    ----------
+    fname : string
+        The name of the FIF file.
+    index_dir : string
+        The directory containing the index files.
+    kind : string
+        The kind of index, e.g. 'tree' or 'raw'.
+
+    Returns
+    -------
+    data : object | None
+        The content of the index. None if there is no index or if the file
+        was modified since the index was written.
+    """
+    index_fname = _get_index_fname(fname, index_dir, kind)
+    if not op.isfile(index_fname):
+        return None
+    try:
+        fid = open(index_fname, 'rb')
+        try:
+            index = cPickle.load(fid)
+        finally:
+            fid.close()
+    except Exception:
+        logger.debug('    Could not read the index %s' % index_fname)
+        return None
+    stat = os.stat(fname)
+    if index['size'] != stat.st_size or index['mtime'] != stat.st_mtime:
+        logger.debug('    Ignoring the outdated index %s' % index_fname)
+        return None
+    return index['data']
+
+
+def write_fiff_index(fname, index_dir, kind, data):
+    """Write a sidecar index of a FIF file
+
+    The index is keyed by the size and the modification time of the file,
+    it is ignored once the file is modified.
+
+    Parameters
+    ----------
+    fname : string
+        The name of the FIF file.
+    index_dir : string
+        The directory containing the index files. It is created if needed.
+    kind : string
+        The kind of index, e.g. 'tree' or 'raw'.
+    data : object
+        The content of the index. It must be picklable.
+    """
+    if not op.isdir(index_dir):
+        os.makedirs(index_dir)
+    stat = os.stat(fname)
+    index = dict(size=stat.st_size, mtime=stat.st_mtime, data=data)
+    # write to a temporary file first so that concurrent readers never see
+    # a partial index
+    index_fname = _get_index_fname(fname, index_dir, kind)
+    tmp_fname = '%s.%d.tmp' % (index_fname, os.getpid())
+    fid = open(tmp_fname, 'wb')
+    try:
+        cPickle.dump(index, fid, cPickle.HIGHEST_PROTOCOL)
+    finally:
+        fid.close()
+    os.rename(tmp_fname, index_fname)
+
+
 @verbose
-def fiff_open(fname, preload=False, verbose=None):
+def fiff_open(fname, preload=False, index_dir=None, verbose=None):
     """Open a FIF file.
 
     Parameters
@@ -27,6 +128,10 @@ def fiff_open(fname, preload=False, verbose=None):
         If True, all data from the file is read into a memory buffer. This
         requires more memory, but can be faster for I/O operations that require
         frequent seeks.
+    index_dir : None | string
+        Directory of the sidecar index files. If not None, the tree is read
+        from the index of the file if it is up to date, otherwise it is
+        created and stored in the index.
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
 
@@ -40,18 +145,14 @@ def fiff_open(fname, preload=False, verbose=None):
     directory: list
         list of nodes.
     """
-    if op.splitext(fname)[1].lower() == '.gz':
-        logger.debug('Using gzip')
-        fid = gzip.open(fname, "rb")  # Open in binary mode
-    else:
-        logger.debug('Using normal I/O')
-        fid = open(fname, "rb")  # Open in binary mode
+    fid = _open_fid(fname, preload)
 
-    # do preloading of entire file
-    if preload:
-        # note that cStringIO objects instantiated this way are read-only,
-        # but that's okay here since we are using mode "rb" anyway
-        fid = cStringIO.StringIO(fid.read())
+    if index_dir is not None:
+        index = read_fiff_index(fname, index_dir, 'tree')
+        if index is not None:
+            logger.debug('    Using the index of %s' % fname)
+            tree, directory = index
+            return fid, tree, directory
 
     tag = read_tag_info(fid)
 
@@ -74,13 +175,19 @@ def fiff_open(fname, preload=False, verbose=None):
     logger.debug('    Creating tag directory for %s...' % fname)
 
     dirpos = int(tag.data)
+    directory = None
     if dirpos > 0:
         tag = read_tag(fid, dirpos)
-        directory = tag.data
-    else:
+        if tag.kind == FIFF.FIFF_DIR:
+            directory = tag.data
+        else:
+            logger.debug('    Invalid directory pointer, scanning the tags')
+
+    if directory is None:
         fid.seek(0, 0)
         directory = list()
-        while tag.next >= 0:
+        tag = None
+        while tag is None or tag.next >= 0:
             pos = fid.tell()
             tag = read_tag_info(fid)
             tag.pos = pos
@@ -88,6 +195,9 @@ def fiff_open(fname, preload=False, verbose=None):
 
     tree, _ = make_dir_tree(fid, directory)
 
+    if index_dir is not None:
+        write_fiff_index(fname, index_dir, 'tree', (tree, directory))
+
     logger.debug('[done]')
 
     #   Back to the beginning
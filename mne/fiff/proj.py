@@ -200,49 +200,119 @@ def write_proj(fid, projs):
 ###############################################################################
 # Utils
 
-def make_projector(projs, ch_names, bads=[], include_active=True):
-    """Create an SSP operator from SSP projection vectors
+class Projector(object):
+    """SSP operator I - U U^T stored by the orthonormal basis U
+
+    Applying it costs O(n_channels x n_proj) per time sample instead of
+    O(n_channels ** 2) for the dense matrix. For backward compatibility it
+    behaves like the dense matrix when converted to an array (np.dot,
+    np.asarray) or indexed.
 
     Parameters
     ----------
-    projs : list
-        List of projection vectors
-    ch_names : list of strings
-        List of channels to include in the projection matrix
-    bads : list of strings
-        Some bad channels to exclude
-    include_active : bool
-        Also include projectors that are already active.
+    U : array of shape [n_channels, n_proj]
+        The orthonormal basis of the projection vectors.
+    """
+    def __init__(self, U):
+        self.U = np.asarray(U, dtype=np.float)
 
-    Returns
-    -------
-    proj : array of shape [n_channels, n_channels]
-        The projection operator to apply to the data.
-    nproj : int
-        How many items in the projector.
-    U : array
-        The orthogonal basis of the projection vectors (optional).
+    def __repr__(self):
+        return '<Projector | %d channels, %d projection vectors>' \
+               % self.U.shape
+
+    @property
+    def shape(self):
+        return (len(self.U), len(self.U))
+
+    @property
+    def T(self):
+        return self  # the projector is symmetric
+
+    def __array__(self, dtype=None):
+        proj = np.eye(len(self.U)) - np.dot(self.U, self.U.T)
+        if dtype is not None:
+            proj = proj.astype(dtype)
+        return proj
+
+    def __getitem__(self, item):
+        return np.asarray(self)[item]
+
+    def pick(self, idx):
+        """Projector restricted to a subset of channels
+
+        This is proj[idx][:, idx] for the dense matrix proj.
+
+        Parameters
+        ----------
+        idx : array of int
+            Indices of the channels to keep.
+
+        Returns
+        -------
+        proj : instance of Projector
+            The projector for the selected channels.
+        """
+        return Projector(self.U[idx])
+
+    def apply(self, data):
+        """Apply the projector to data
+
+        Parameters
+        ----------
+        data : array of shape [n_channels, ...]
+            The data to project.
+
+        Returns
+        -------
+        data : array of shape [n_channels, ...]
+            The projected data (a copy).
+        """
+        data = np.asarray(data)
+        if self.U.shape[1] == 0:
+            return data.copy()
+        coefs = np.tensordot(self.U.T, data, axes=1)
+        return data - np.tensordot(self.U, coefs, axes=1)
+
+    def dot_right(self, K):
+        """Compose an operator with the projector, i.e. np.dot(K, proj)
+
+        Parameters
+        ----------
+        K : array of shape [n, n_channels]
+            An operator applying to projected data, e.g. a whitener or an
+            inverse kernel.
+
+        Returns
+        -------
+        K : array of shape [n, n_channels]
+            The operator applying to the data before projection.
+        """
+        K = np.asarray(K)
+        return K - np.dot(np.dot(K, self.U), self.U.T)
+
+
+def _make_projector_basis(projs, ch_names, include_active=True):
+    """Get the orthonormal basis of the projection vectors
+
+    Returns U of shape [n_channels, nproj], see make_projector.
     """
     nchan = len(ch_names)
     if nchan == 0:
         raise ValueError('No channel names specified')
 
-    proj = np.eye(nchan, nchan)
-    nproj = 0
-    U = []
+    U = np.zeros((nchan, 0))
 
     #   Check trivial cases first
     if projs is None:
-        return proj, nproj, U
+        return U
 
     nvec = 0
     for p in projs:
         if not p['active'] or include_active:
-            nproj += 1
             nvec += p['data']['nrow']
 
-    if nproj == 0:
-        return proj, nproj, U
+    if nvec == 0:
+        return U
 
     #   Pick the appropriate entries
     vecs = np.zeros((nchan, nvec))
@@ -280,14 +350,44 @@ def make_projector(projs, ch_names, bads=[], include_active=True):
 
     #   Check whether all of the vectors are exactly zero
     if nonzero == 0:
-        return proj, 0, U
+        return U
 
     # Reorthogonalize the vectors
     U, S, V = linalg.svd(vecs[:, :nvec], full_matrices=False)
 
     # Throw away the linearly dependent guys
     nproj = np.sum((S / S[0]) > 1e-2)
-    U = U[:, :nproj]
+    return U[:, :nproj]
+
+
+def make_projector(projs, ch_names, bads=[], include_active=True):
+    """Create an SSP operator from SSP projection vectors
+
+    Parameters
+    ----------
+    projs : list
+        List of projection vectors
+    ch_names : list of strings
+        List of channels to include in the projection matrix
+    bads : list of strings
+        Some bad channels to exclude
+    include_active : bool
+        Also include projectors that are already active.
+
+    Returns
+    -------
+    proj : array of shape [n_channels, n_channels]
+        The projection operator to apply to the data.
+    nproj : int
+        How many items in the projector.
+    U : array
+        The orthogonal basis of the projection vectors (optional).
+    """
+    U = _make_projector_basis(projs, ch_names, include_active)
+    nproj = U.shape[1]
+    proj = np.eye(len(ch_names), len(ch_names))
+    if nproj == 0:
+        return proj, nproj, []
 
     # Here is the celebrated result
     proj -= np.dot(U, U.T)
@@ -295,6 +395,20 @@ def make_projector(projs, ch_names, bads=[], include_active=True):
     return proj, nproj, U
 
 
+def _make_projector_op(info, ch_names=None, include_active=True):
+    """Make the SSP operator of info as a Projector
+
+    Returns the Projector, or None if the projection vectors do not apply
+    to the channels, and the number of projection vectors.
+    """
+    if ch_names is None:
+        ch_names = info['ch_names']
+    U = _make_projector_basis(info['projs'], ch_names, include_active)
+    if U.shape[1] == 0:
+        return None, 0
+    return Projector(U), U.shape[1]
+
+
 def make_projector_info(info, include_active=True):
     """Make an SSP operator using the measurement info
 
@@ -452,7 +566,7 @@ def setup_proj(info, verbose=None):
 
     Returns
     -------
-    projector : array of shape [n_channels, n_channels]
+    projector : instance of Projector | None
         The projection operator to apply to the data.
     info : dict
         The modified measurement info (Warning: info is modified inplace).
@@ -465,7 +579,7 @@ def setup_proj(info, verbose=None):
         info['projs'].append(eeg_proj)
 
     #   Create the projector
-    projector, nproj = make_projector_info(info)
+    projector, nproj = _make_projector_op(info)
     if nproj == 0:
         if verbose:
             logger.info('The projection vectors do not apply to these '
@@ -9,6 +9,7 @@ from math import floor, ceil
 import copy
 import warnings
 import os
+import threading
 
 import numpy as np
 from scipy.signal import hilbert
@@ -18,10 +19,10 @@ import logging
 logger = logging.getLogger('mne')
 
 from .constants import FIFF
-from .open import fiff_open
+from .open import fiff_open, _open_fid, read_fiff_index, write_fiff_index
 from .meas_info import read_meas_info, write_meas_info
 from .tree import dir_tree_find
-from .tag import read_tag
+from .tag import read_tag, Tag
 from .pick import pick_types
 from .proj import setup_proj, activate_proj, deactivate_proj, proj_equal
 
@@ -58,6 +59,11 @@ class Raw(object):
         recommended to apply the projectors at this point as they are
         applied automatically later on (e.g. when computing inverse
         solutions).
+    index_dir : None | string
+        Directory of the sidecar index files. If not None, the measurement
+        info and the table of the data buffers are read from the index of
+        each raw file, or stored in it if the index is missing or outdated,
+        which makes opening the same files again much faster.
 
     Attributes
     ----------
@@ -72,12 +78,13 @@ class Raw(object):
     """
     @verbose
     def __init__(self, fnames, allow_maxshield=False, preload=False,
-                 verbose=None, proj_active=False):
+                 verbose=None, proj_active=False, index_dir=None):
 
         if not isinstance(fnames, list):
             fnames = [fnames]
 
-        raws = [self._read_raw_file(fname, allow_maxshield, preload)
+        raws = [self._read_raw_file(fname, allow_maxshield, preload,
+                                    index_dir)
                 for fname in fnames]
 
         _check_raw_compatibility(raws)
@@ -103,6 +110,7 @@ class Raw(object):
 
         # setup the SSP projector
         self._projector = None
+        self._clear_read_ops()
         if proj_active:
             self.apply_projector()
 
@@ -119,13 +127,32 @@ class Raw(object):
         self._preloaded = True
 
     @verbose
-    def _read_raw_file(self, fname, allow_maxshield, preload, verbose=None):
+    def _read_raw_file(self, fname, allow_maxshield, preload, index_dir=None,
+                       verbose=None):
         """Read in header information from a raw file"""
         logger.info('Opening raw data file %s...' % fname)
 
         #   Read in the whole file if preload is on and .fif.gz (saves time)
         ext = os.path.splitext(fname)[1].lower()
         whole_file = preload if '.gz' in ext else False
+
+        if index_dir is not None:
+            index = read_fiff_index(fname, index_dir, 'raw')
+            if index is not None and \
+                    index['allow_maxshield'] == allow_maxshield:
+                logger.info('    Using the index of the file')
+                raw = _RawShell()
+                raw.info = index['info']
+                raw.first_samp = index['first_samp']
+                raw.last_samp = index['last_samp']
+                raw.cals = index['cals']
+                raw.rawdir = _rawdir_from_array(index['rawdir'])
+                raw.comp = None
+                raw.fid = _open_fid(fname, preload=whole_file)
+                raw.verbose = verbose
+                logger.info('Ready.')
+                return raw
+
         fid, tree, _ = fiff_open(fname, preload=whole_file)
 
         #   Read the measurement info
@@ -241,8 +268,16 @@ class Raw(object):
                     float(raw.first_samp) / info['sfreq'],
                     float(raw.last_samp) / info['sfreq']))
 
-        raw.fid = fid
         raw.info = info
+
+        if index_dir is not None:
+            index = dict(info=info, first_samp=raw.first_samp,
+                         last_samp=raw.last_samp, cals=cals,
+                         rawdir=_rawdir_to_array(rawdir),
+                         allow_maxshield=allow_maxshield)
+            write_fiff_index(fname, index_dir, 'raw', index)
+
+        raw.fid = fid
         raw.verbose = verbose
 
         logger.info('Ready.')
@@ -514,9 +549,10 @@ class Raw(object):
         self._projector, self.info = setup_proj(self.info,
                                                 verbose=self.verbose)
         activate_proj(self.info['projs'], copy=False, verbose=self.verbose)
+        self._clear_read_ops()
 
-        if self._preloaded:
-            self._data = np.dot(self._projector, self._data)
+        if self._preloaded and self._projector is not None:
+            self._data = self._projector.apply(self._data)
 
     @deprecated('band_pass_filter is deprecated please use raw.filter instead')
     def band_pass_filter(self, picks, l_freq, h_freq, filter_length=None,
@@ -642,6 +678,7 @@ class Raw(object):
             self.info['projs'] = projs
         else:
             self.info['projs'].extend(projs)
+        self._clear_read_ops()
 
     def del_proj(self, idx):
         """Remove SSP projection vector
@@ -659,6 +696,12 @@ class Raw(object):
                              'been applied')
 
         self.info['projs'].pop(idx)
+        self._clear_read_ops()
+
+    def _clear_read_ops(self):
+        """Clear the cached reading operators, see _get_read_operator"""
+        self._read_ops = dict()
+        self._read_ops_keys = list()
 
     @verbose
     def save(self, fname, picks=None, tmin=0, tmax=None, buffer_size_sec=10,
@@ -725,18 +768,40 @@ class Raw(object):
         #   Read and write all the data
         #
         write_int(outfid, FIFF.FIFF_FIRST_SAMPLE, first_samp)
-        for first in range(start, stop, buffer_size):
-            last = first + buffer_size
-            if last >= stop:
-                last = stop + 1
-
-            if picks is None:
-                data, times = self[:, first:last]
-            else:
-                data, times = self[picks, first:last]
-
-            if proj is not None:
-                data = np.dot(proj, data)
+        sel = slice(None) if picks is None else picks
+
+        def _read_buffer(first, out):
+            try:
+                last = first + buffer_size
+                if last >= stop:
+                    last = stop + 1
+                data, times = self[sel, first:last]
+                if proj is not None:
+                    data = proj.apply(data)
+                out.extend([data, times])
+            except Exception as exp:
+                out.append(exp)
+
+        def _start_reading(first):
+            out = list()
+            thread = threading.Thread(target=_read_buffer, args=(first, out))
+            thread.start()
+            return thread, out
+
+        #   The next buffer is read in a background thread while the
+        #   current one is written, using the same calibration scratch array
+        scratch = np.empty(len(cals) * (buffer_size + 1), dtype='>f4')
+        firsts = range(start, stop, buffer_size)
+        reader = _start_reading(firsts[0]) if len(firsts) > 0 else None
+        for ii, first in enumerate(firsts):
+            thread, out = reader
+            thread.join()
+            if isinstance(out[0], Exception):
+                raise out[0]
+            data, times = out
+            reader = None
+            if ii + 1 < len(firsts):
+                reader = _start_reading(firsts[ii + 1])
 
             if (drop_small_buffer and (first > start)
                                             and (len(times) < buffer_size)):
@@ -744,9 +809,14 @@ class Raw(object):
                             '[done]')
                 break
             logger.info('Writing ...')
-            write_raw_buffer(outfid, data, cals)
+            if np.isrealobj(data) and data.size <= scratch.size:
+                write_raw_buffer(outfid, data, cals, scratch)
+            else:
+                write_raw_buffer(outfid, data, cals)
             logger.info('[done]')
 
+        if reader is not None:
+            reader[0].join()
         finish_writing_raw(outfid)
 
     @deprecated('time_to_index is deprecated please use time_as_index instead')
@@ -1003,6 +1073,35 @@ class Raw(object):
         return "Raw (%s)" % s
 
 
+def _rawdir_to_array(rawdir):
+    """Store the table of the data buffers in an array
+
+    The columns are the first and last samples, the number of samples and
+    the type, size and position of the buffer tag (-1 for skips).
+    """
+    out = np.empty((len(rawdir), 6), dtype=np.int64)
+    for k, this in enumerate(rawdir):
+        ent = this['ent']
+        out[k, :3] = this['first'], this['last'], this['nsamp']
+        if ent is None:
+            out[k, 3:] = -1
+        else:
+            out[k, 3:] = ent.type, ent.size, ent.pos
+    return out
+
+
+def _rawdir_from_array(rawdir):
+    """Get the table of the data buffers from an array"""
+    next = FIFF.FIFFV_NEXT_SEQ
+    return [dict(ent=Tag(FIFF.FIFF_DATA_BUFFER, type_, size, next, pos)
+                 if pos >= 0 else None, first=first, last=last, nsamp=nsamp)
+            for first, last, nsamp, type_, size, pos in rawdir.tolist()]
+
+
+# Number of reading operators cached by each Raw, see _get_read_operator
+_READ_OPS_CACHE_SIZE = 10
+
+
 class _RawShell():
     """Used for creating a temporary raw object"""
     def __init__(self):
@@ -1015,7 +1114,7 @@ class _RawShell():
 
 @verbose
 def read_raw_segment(raw, start=0, stop=None, sel=None, data_buffer=None,
-    verbose=None, proj=None):
+    verbose=None, proj=None, calibrate=True):
     """Read a chunck of raw data
 
     Parameters
@@ -1038,6 +1137,9 @@ def read_raw_segment(raw, start=0, stop=None, sel=None, data_buffer=None,
         If not None, override default verbose level (see mne.verbose).
     proj : array
         SSP operator to apply to the data.
+    calibrate : bool
+        If False, the values are returned as stored in the file, without
+        calibration, compensation or SSP (proj is ignored).
 
     Returns
     -------
@@ -1074,13 +1176,9 @@ def read_raw_segment(raw, start=0, stop=None, sel=None, data_buffer=None,
     else:
         data = None  # we will allocate it later, once we know the type
 
-    if proj is not None:
-        mult = list()
-        for ri in range(len(raw._raw_lengths)):
-            mult.append(np.diag(raw.cals.ravel()))
-            if raw.comp is not None:
-                mult[ri] = np.dot(raw.comp[idx, :], mult[ri])
-            mult[ri] = np.dot(proj, mult[ri])
+    if proj is not None and calibrate:
+        # the same operator applies to all files, as their cals must match
+        mult = _get_read_operator(raw, sel, proj)
     else:
         mult = None
 
@@ -1121,18 +1219,22 @@ def read_raw_segment(raw, start=0, stop=None, sel=None, data_buffer=None,
                     tag = read_tag(raw.fids[fi], this['ent'].pos)
 
                     # decide what datatype to use
-                    if np.isrealobj(tag.data):
+                    if not calibrate:
+                        dtype = tag.data.dtype
+                    elif np.isrealobj(tag.data):
                         dtype = np.float
                     else:
                         dtype = np.complex64
 
-                    one = tag.data.reshape(this['nsamp'],
-                                           nchan).astype(dtype).T
-                    if mult is not None:  # use proj + cal factors in mult
-                        one = np.dot(mult[fi], one)
-                        one = one[idx]
+                    one = tag.data.reshape(this['nsamp'], nchan)
+                    if not calibrate:  # the picked channels as stored
+                        one = one[:, idx].T
+                    elif mult is not None:  # use proj + cal factors in mult
+                        one = np.dot(mult, one.T).astype(dtype)
                     else:  # apply just the calibration factors
-                        one = raw.cals.ravel()[idx][:, np.newaxis] * one[idx]
+                        # to the picked channels only
+                        one = one[:, idx].T.astype(dtype)
+                        one *= raw.cals.ravel()[idx][:, np.newaxis]
 
                 #  The picking logic is a bit complicated
                 if stop_loc > this['last'] and start_loc < this['first']:
@@ -1188,6 +1290,37 @@ def read_raw_segment(raw, start=0, stop=None, sel=None, data_buffer=None,
     return data, times
 
 
+def _get_read_operator(raw, sel, proj):
+    """Get the operator applying calibration, compensation and SSP
+
+    The operator maps all the channels of a buffer to the selected channels.
+    The calibration is applied by scaling the columns, and the last
+    _READ_OPS_CACHE_SIZE operators of each raw are kept in memory (see
+    Raw._clear_read_ops).
+    """
+    cache = getattr(raw, '_read_ops', None)
+    key = (id(proj), None if sel is None else np.asarray(sel).tostring())
+    if cache is not None and key in cache and cache[key][0] is proj:
+        raw._read_ops_keys.remove(key)
+        raw._read_ops_keys.append(key)
+        return cache[key][1]
+
+    mult = np.asarray(proj)
+    if sel is not None:
+        mult = mult[sel]
+    if raw.comp is not None:
+        mult = np.dot(mult, raw.comp)
+    mult = mult * raw.cals.ravel()[np.newaxis, :]
+
+    if cache is not None:
+        # keep a reference to proj so that its id cannot be reused
+        cache[key] = (proj, mult)
+        raw._read_ops_keys.append(key)
+        if len(raw._read_ops_keys) > _READ_OPS_CACHE_SIZE:
+            del cache[raw._read_ops_keys.pop(0)]
+    return mult
+
+
 @verbose
 def read_raw_segment_times(raw, start, stop, sel=None, verbose=None):
     """Read a chunck of raw data
@@ -1221,6 +1354,52 @@ def read_raw_segment_times(raw, start, stop, sel=None, verbose=None):
     #   Read it
     return read_raw_segment(raw, start, stop, sel)
 
+
+def _iter_raw_blocks(raw, picks, block_size, margin=0, func=None,
+                     calibrate=True):
+    """Read the data of some channels block by block
+
+    Parameters
+    ----------
+    raw : Raw object
+        An instance of Raw.
+    picks : array of int
+        Indices of the channels to read.
+    block_size : int
+        Number of samples of the blocks.
+    margin : int
+        Number of samples read before and after each block (when present
+        in the file) and passed to func, e.g., to filter the blocks without
+        edge effects.
+    func : callable | None
+        Function applied to the data of each channel (with the margins)
+        before the margins are removed. It can return several signals of
+        the same length, e.g., the data filtered in different bands.
+    calibrate : bool
+        If False and raw is not preloaded, the values are read as stored in
+        the file, without calibration, compensation or SSP.
+
+    Returns
+    -------
+    blocks : generator
+        Yields the first sample of each block (relative to raw.first_samp)
+        and the data of the block (channels x [signals x] samples).
+    """
+    n_times = raw.last_samp - raw.first_samp + 1
+    for start in range(0, n_times, block_size):
+        stop = min(start + block_size, n_times)
+        data_start = max(start - margin, 0)
+        data_stop = min(stop + margin, n_times)
+        if calibrate or raw._preloaded:
+            data, _ = raw[picks, data_start:data_stop]
+        else:
+            data, _ = read_raw_segment(raw, data_start, data_stop, sel=picks,
+                                       calibrate=False)
+        if func is not None:
+            data = np.array([func(x) for x in data])
+        yield start, data[..., start - data_start:stop - data_start]
+
+
 ###############################################################################
 # Writing
 
@@ -1300,7 +1479,7 @@ def start_writing_raw(name, info, sel=None):
     return fid, cals
 
 
-def write_raw_buffer(fid, buf, cals):
+def write_raw_buffer(fid, buf, cals, scratch=None):
     """Write raw buffer
 
     Parameters
@@ -1313,12 +1492,25 @@ def write_raw_buffer(fid, buf, cals):
 
     cals : array
         Calibration factors.
+
+    scratch : array | None
+        Big-endian float32 array of at least buf.size elements used to
+        hold the calibrated data. If None, a new array is allocated.
     """
     if buf.shape[0] != len(cals):
         raise ValueError('buffer and calibration sizes do not match')
 
     if np.isrealobj(buf):
-        write_float(fid, FIFF.FIFF_DATA_BUFFER, buf / np.ravel(cals)[:, None])
+        #   Calibrate and convert in one pass, to the layout of the buffers
+        #   in the file (one sample of all the channels after the other)
+        if scratch is None:
+            data = np.empty(buf.shape[::-1], dtype='>f4')
+        else:
+            data = scratch[:buf.size].reshape(buf.shape[::-1])
+        np.divide(buf.T, np.ravel(cals), out=data)
+        _write_tag_header(fid, FIFF.FIFF_DATA_BUFFER, FIFF.FIFFT_FLOAT,
+                          4 * data.size)
+        _write_array(fid, data)
     else:
         write_complex64(fid, FIFF.FIFF_DATA_BUFFER,
                         buf / np.ravel(cals)[:, None])
@@ -5,10 +5,27 @@
 
 import struct
 import numpy as np
-from scipy import linalg
 
 from .constants import FIFF
 
+#   Layout of the structures stored in the tags
+_dig_point_dtype = np.dtype([('kind', '>i4'), ('ident', '>i4'),
+                             ('r', '>f4', 3)])
+_coord_trans_dtype = np.dtype([('from', '>i4'), ('to', '>i4'),
+                               ('rot', '>f4', (3, 3)), ('move', '>f4', 3),
+                               ('invrot', '>f4', (3, 3)),
+                               ('invmove', '>f4', 3)])
+_ch_info_dtype = np.dtype([('scanno', '>i4'), ('logno', '>i4'),
+                           ('kind', '>i4'), ('range', '>f4'), ('cal', '>f4'),
+                           ('coil_type', '>i4'), ('loc', '>f4', 12),
+                           ('unit', '>i4'), ('unit_mul', '>i4'),
+                           ('ch_name', 'S16')])
+_struct_dtypes = {FIFF.FIFFT_DIG_POINT_STRUCT: _dig_point_dtype,
+                  FIFF.FIFFT_COORD_TRANS_STRUCT: _coord_trans_dtype,
+                  FIFF.FIFFT_CH_INFO_STRUCT: _ch_info_dtype}
+_tag_header_dtype = [('kind', '>i4'), ('type', '>u4'), ('size', '>i4'),
+                     ('next', '>i4')]
+
 
 class Tag(object):
     """Tag in FIF tree structure
@@ -41,6 +58,11 @@ class Tag(object):
         self.pos = int(self.pos)
         self.data = None
 
+    def __reduce__(self):
+        # faster to pickle and unpickle than the instance dictionary
+        return (Tag, (self.kind, self.type, self.size, self.next, self.pos),
+                dict(data=self.data))
+
     def __repr__(self):
         out = "kind: %s - type: %s - size: %s - next: %s - pos: %s" % (
                 self.kind, self.type, self.size, self.next, self.pos)
@@ -237,84 +259,21 @@ def read_tag(fid, pos=None):
                 tag.data['secs'] = int(np.fromstring(fid.read(4), dtype=">i4"))
                 tag.data['usecs'] = int(np.fromstring(fid.read(4),
                                                       dtype=">i4"))
-            elif tag.type == FIFF.FIFFT_DIG_POINT_STRUCT:
-                tag.data = dict()
-                tag.data['kind'] = int(np.fromstring(fid.read(4), dtype=">i4"))
-                tag.data['ident'] = int(np.fromstring(fid.read(4),
-                                                      dtype=">i4"))
-                tag.data['r'] = np.fromstring(fid.read(12), dtype=">f4")
-                tag.data['coord_frame'] = 0
-            elif tag.type == FIFF.FIFFT_COORD_TRANS_STRUCT:
-                tag.data = dict()
-                tag.data['from'] = int(np.fromstring(fid.read(4), dtype=">i4"))
-                tag.data['to'] = int(np.fromstring(fid.read(4), dtype=">i4"))
-                rot = np.fromstring(fid.read(36), dtype=">f4").reshape(3, 3)
-                move = np.fromstring(fid.read(12), dtype=">f4")
-                tag.data['trans'] = np.r_[np.c_[rot, move],
-                                           np.array([[0], [0], [0], [1]]).T]
-                #
-                # Skip over the inverse transformation
-                # It is easier to just use inverse of trans in Matlab
-                #
-                fid.seek(12 * 4, 1)
-            elif tag.type == FIFF.FIFFT_CH_INFO_STRUCT:
-                d = dict()
-                d['scanno'] = int(np.fromstring(fid.read(4), dtype=">i4"))
-                d['logno'] = int(np.fromstring(fid.read(4), dtype=">i4"))
-                d['kind'] = int(np.fromstring(fid.read(4), dtype=">i4"))
-                d['range'] = float(np.fromstring(fid.read(4), dtype=">f4"))
-                d['cal'] = float(np.fromstring(fid.read(4), dtype=">f4"))
-                d['coil_type'] = int(np.fromstring(fid.read(4), dtype=">i4"))
-                #
-                #   Read the coil coordinate system definition
-                #
-                d['loc'] = np.fromstring(fid.read(48), dtype=">f4")
-                d['coil_trans'] = None
-                d['eeg_loc'] = None
-                d['coord_frame'] = FIFF.FIFFV_COORD_UNKNOWN
-                tag.data = d
-                #
-                #   Convert loc into a more useful format
-                #
-                loc = tag.data['loc']
-                kind = tag.data['kind']
-                if kind == FIFF.FIFFV_MEG_CH or kind == FIFF.FIFFV_REF_MEG_CH:
-                    tag.data['coil_trans'] = np.r_[np.c_[loc[3:6], loc[6:9],
-                                                        loc[9:12], loc[0:3]],
-                                        np.array([0, 0, 0, 1]).reshape(1, 4)]
-                    tag.data['coord_frame'] = FIFF.FIFFV_COORD_DEVICE
-                elif tag.data['kind'] == FIFF.FIFFV_EEG_CH:
-                    if linalg.norm(loc[3:6]) > 0.:
-                        tag.data['eeg_loc'] = np.c_[loc[0:3], loc[3:6]]
-                    else:
-                        tag.data['eeg_loc'] = loc[0:3]
-                    tag.data['coord_frame'] = FIFF.FIFFV_COORD_HEAD
-                #
-                #   Unit and exponent
-                #
-                tag.data['unit'] = int(np.fromstring(fid.read(4), dtype=">i4"))
-                tag.data['unit_mul'] = int(np.fromstring(fid.read(4),
-                                                         dtype=">i4"))
-                #
-                #   Handle the channel name
-                #
-                ch_name = np.fromstring(fid.read(16), dtype=">c")
-                #
-                # Omit nulls
-                #
-                tag.data['ch_name'] = ''.join(
-                                    ch_name[:np.where(ch_name == '')[0][0]])
-
+            elif tag.type in _struct_dtypes:
+                data = np.fromstring(fid.read(tag.size),
+                                     dtype=_struct_dtypes[tag.type])
+                tag.data = _structs_to_dicts(data, tag.type)[0]
             elif tag.type == FIFF.FIFFT_OLD_PACK:
                 offset = float(np.fromstring(fid.read(4), dtype=">f4"))
                 scale = float(np.fromstring(fid.read(4), dtype=">f4"))
                 tag.data = np.fromstring(fid.read(tag.size - 8), dtype=">h2")
                 tag.data = scale * tag.data + offset
             elif tag.type == FIFF.FIFFT_DIR_ENTRY_STRUCT:
-                tag.data = list()
-                for _ in range(tag.size / 16 - 1):
-                    s = fid.read(4 * 4)
-                    tag.data.append(Tag(*struct.unpack(">iIii", s)))
+                #   The last entry terminates the directory
+                entries = np.fromstring(fid.read(tag.size), dtype=">i4")
+                entries = entries.reshape(-1, 4)[:-1].tolist()
+                tag.data = [Tag(kind, type_ & 0xffffffff, size, pos)
+                            for kind, type_, size, pos in entries]
             else:
                 raise Exception('Unimplemented tag data type %s' % tag.type)
 
@@ -325,6 +284,101 @@ def read_tag(fid, pos=None):
     return tag
 
 
+def _structs_to_dicts(data, type_):
+    """Convert a structured array read from struct tags to dicts"""
+    n = len(data)
+    if type_ == FIFF.FIFFT_DIG_POINT_STRUCT:
+        r = np.array(data['r'])
+        return [dict(kind=kind, ident=ident, r=r[k], coord_frame=0)
+                for k, (kind, ident) in enumerate(zip(data['kind'].tolist(),
+                                                      data['ident'].tolist()))]
+    elif type_ == FIFF.FIFFT_COORD_TRANS_STRUCT:
+        trans = np.zeros((n, 4, 4))
+        trans[:, :3, :3] = data['rot']
+        trans[:, :3, 3] = data['move']
+        trans[:, 3, 3] = 1.
+        return [{'from': from_, 'to': to, 'trans': trans[k]}
+                for k, (from_, to) in enumerate(zip(data['from'].tolist(),
+                                                    data['to'].tolist()))]
+
+    #   Channel info
+    loc = np.array(data['loc'])
+    columns = [data[key].tolist() for key in ['scanno', 'logno', 'kind',
+                                              'range', 'cal', 'coil_type',
+                                              'unit', 'unit_mul', 'ch_name']]
+    #   Convert loc into a more useful format
+    coil_trans = np.zeros((n, 4, 4))
+    coil_trans[:, :3, 0] = loc[:, 3:6]
+    coil_trans[:, :3, 1] = loc[:, 6:9]
+    coil_trans[:, :3, 2] = loc[:, 9:12]
+    coil_trans[:, :3, 3] = loc[:, 0:3]
+    coil_trans[:, 3, 3] = 1.
+    chs = list()
+    for k, (scanno, logno, kind, range_, cal, coil_type, unit, unit_mul,
+            ch_name) in enumerate(zip(*columns)):
+        d = dict(scanno=scanno, logno=logno, kind=kind, range=range_, cal=cal,
+                 coil_type=coil_type, loc=loc[k], coil_trans=None,
+                 eeg_loc=None, coord_frame=FIFF.FIFFV_COORD_UNKNOWN,
+                 unit=unit, unit_mul=unit_mul,
+                 ch_name=ch_name.split('\0')[0])
+        if kind == FIFF.FIFFV_MEG_CH or kind == FIFF.FIFFV_REF_MEG_CH:
+            d['coil_trans'] = coil_trans[k]
+            d['coord_frame'] = FIFF.FIFFV_COORD_DEVICE
+        elif kind == FIFF.FIFFV_EEG_CH:
+            if np.any(loc[k, 3:6] != 0.):
+                d['eeg_loc'] = np.c_[loc[k, 0:3], loc[k, 3:6]]
+            else:
+                d['eeg_loc'] = loc[k, 0:3]
+            d['coord_frame'] = FIFF.FIFFV_COORD_HEAD
+        chs.append(d)
+    return chs
+
+
+def read_struct_tags(fid, tags):
+    """Read the data of struct tags
+
+    Runs of consecutive tags are read at once and decoded together.
+
+    Parameters
+    ----------
+    fid : file
+        The open FIF file descriptor.
+    tags : list of Tag
+        Directory entries of tags containing channel info, digitization
+        point or coordinate transformation structures.
+
+    Returns
+    -------
+    data : list
+        The data of each tag.
+    """
+    out = list()
+    k = 0
+    while k < len(tags):
+        type_ = tags[k].type
+        size = _struct_dtypes[type_].itemsize
+        stride = 16 + size
+        #   Find the tags of the same type following each other in the file
+        n = 1
+        while k + n < len(tags) and tags[k + n].type == type_ and \
+                tags[k + n].size == size and \
+                tags[k + n].pos == tags[k].pos + n * stride:
+            n += 1
+        if tags[k].size != size:
+            out.append(read_tag(fid, tags[k].pos).data)
+            k += 1
+            continue
+        fid.seek(tags[k].pos, 0)
+        dtype = np.dtype(_tag_header_dtype + [('data', _struct_dtypes[type_])])
+        data = np.fromstring(fid.read(n * stride), dtype=dtype)
+        if np.any(data['next'] != FIFF.FIFFV_NEXT_SEQ):
+            out.extend([read_tag(fid, t.pos).data for t in tags[k:k + n]])
+        else:
+            out.extend(_structs_to_dicts(data['data'], type_))
+        k += n
+    return out
+
+
 def find_tag(fid, node, findkind):
     """Find Tag in an open FIF file descriptor
     """
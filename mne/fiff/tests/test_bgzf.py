@@ -0,0 +1,79 @@
+import os.path as op
+import gzip
+from tempfile import mkdtemp
+
+import numpy as np
+from nose.tools import assert_true, assert_equal, assert_raises
+
+from mne.fiff.bgzf import BlockGzipReader, BlockGzipWriter, is_block_gzip, \
+                          BLOCK_SIZE
+from mne.fiff.open import fiff_open
+from mne.fiff.write import start_file, end_file, write_int, write_string
+from mne.fiff.tag import read_tag
+from mne.fiff.constants import FIFF
+
+base_dir = op.join(op.dirname(__file__), 'data')
+fname_gz = op.join(base_dir, 'test-cov.fif.gz')
+tempdir = mkdtemp()
+
+
+def test_bgzf_io():
+    """Test reading and writing block compressed gzip files
+    """
+    rng = np.random.RandomState(0)
+    data = rng.randint(0, 10, 3 * BLOCK_SIZE + 1000).astype(np.uint8)
+    data = data.tostring()
+    test_fname = op.join(tempdir, 'test.gz')
+    fid = BlockGzipWriter(test_fname)
+    fid.write(data[:100])
+    fid.flush()
+    for k in range(100, len(data), 10000):
+        fid.write(data[k:k + 10000])
+    assert_equal(fid.tell(), len(data))
+
+    # only the first block can be updated
+    fid.seek(10)
+    fid.write('abcd')
+    assert_raises(IOError, fid.seek, 200)
+    fid.seek(0, 2)
+    fid.close()
+    data = data[:10] + 'abcd' + data[14:]
+
+    assert_true(is_block_gzip(test_fname))
+    assert_true(not is_block_gzip(fname_gz))
+    assert_equal(gzip.open(test_fname, 'rb').read(), data)
+
+    fid = BlockGzipReader(test_fname, cache_size=2)
+    assert_equal(fid.read(), data)
+    for _ in range(50):
+        start = rng.randint(len(data))
+        size = rng.randint(2 * BLOCK_SIZE)
+        fid.seek(start)
+        assert_equal(fid.read(size), data[start:start + size])
+        assert_equal(fid.tell(), min(start + size, len(data)))
+    fid.close()
+
+
+def test_bgzf_fiff():
+    """Test writing compressed FIF files with a tag directory
+    """
+    test_fname = op.join(tempdir, 'test.fif.gz')
+    fid = start_file(test_fname)
+    for k in range(3000):
+        write_string(fid, FIFF.FIFF_COMMENT, 'tag %d' % k)
+    write_int(fid, FIFF.FIFF_NCHAN, 42)
+    end_file(fid)
+
+    fid, tree, directory = fiff_open(test_fname)
+    assert_true(isinstance(fid, BlockGzipReader))
+    tag = read_tag(fid, directory[1].pos)
+    assert_equal(tag.kind, FIFF.FIFF_DIR_POINTER)
+    assert_true(tag.data > 0)
+    assert_equal(read_tag(fid, directory[-3].pos).data, 42)
+    assert_equal(read_tag(fid, directory[1000].pos).data, 'tag 997')
+    fid.close()
+
+    # files compressed with gzip can still be read
+    fid, tree, directory = fiff_open(fname_gz)
+    assert_true(not isinstance(fid, BlockGzipReader))
+    fid.close()
@@ -3,7 +3,9 @@
 #
 # License: BSD (3-clause)
 
+import os
 import os.path as op
+import shutil
 from copy import deepcopy
 import warnings
 
@@ -12,6 +14,9 @@ from numpy.testing import assert_array_almost_equal, assert_array_equal
 from nose.tools import assert_true, assert_raises, assert_equal
 
 from mne.fiff import Raw, pick_types, pick_channels, concatenate_raws
+from mne.fiff.constants import FIFF
+from mne.fiff.open import fiff_open
+from mne.fiff.tag import read_tag, read_tag_info
 from mne import concatenate_events, find_events
 
 try:
@@ -235,6 +240,56 @@ def test_io_raw():
                                       raw2.info['dig'][0]['r'])
 
 
+def test_io_raw_dir():
+    """Test that saved raw files contain a tag directory
+    """
+    raw = Raw(fif_fname)
+    raw.save('raw.fif', tmin=0, tmax=5)
+    fid, tree, directory = fiff_open('raw.fif')
+    tag = read_tag(fid, directory[1].pos)
+    assert_equal(tag.kind, FIFF.FIFF_DIR_POINTER)
+    assert_true(tag.data > 0)
+
+    # compare with the directory obtained by scanning the tags
+    fid.seek(0, 0)
+    tags = list()
+    tag = read_tag_info(fid)
+    tags.append((tag.kind, tag.type, tag.size, 0))
+    while tag.next >= 0:
+        pos = fid.tell()
+        tag = read_tag_info(fid)
+        tags.append((tag.kind, tag.type, tag.size, pos))
+    fid.close()
+    assert_equal(tags, [(t.kind, t.type, t.size, t.pos) for t in directory])
+
+    raw2 = Raw('raw.fif')
+    assert_array_almost_equal(raw2[:, :][0], raw[:, :len(raw2)][0])
+
+
+def test_io_raw_index():
+    """Test reading raw files using a sidecar index
+    """
+    index_dir = 'raw_index'
+    raw_orig = Raw(fif_fname)
+    raw_orig.save('raw.fif', tmin=0, tmax=5)
+    raw = Raw('raw.fif')
+    for _ in range(2):  # write then read the index
+        raw2 = Raw('raw.fif', index_dir=index_dir)
+        assert_equal(len(os.listdir(index_dir)), 1)
+        assert_equal(raw2.info['ch_names'], raw.info['ch_names'])
+        assert_equal(raw2.first_samp, raw.first_samp)
+        assert_equal(raw2.last_samp, raw.last_samp)
+        assert_array_equal(raw2[:, :][0], raw[:, :][0])
+
+    # the index is not used once the file changed
+    raw_orig.save('raw.fif', tmin=0, tmax=3)
+    raw = Raw('raw.fif')
+    raw2 = Raw('raw.fif', index_dir=index_dir)
+    assert_equal(raw2.last_samp, raw.last_samp)
+    assert_array_equal(raw2[:, :][0], raw[:, :][0])
+    shutil.rmtree(index_dir)
+
+
 def test_io_complex():
     """Test IO with complex data types
     """
@@ -347,6 +402,16 @@ def test_proj():
         assert_array_almost_equal(data_proj_2,
                                   np.dot(raw._projector, data_proj_2))
 
+    # reading a selection of channels uses the cached operators
+    raw = Raw(fif_fname, preload=True, proj_active=True)
+    raw2 = Raw(fif_fname, preload=False, proj_active=True)
+    picks = pick_types(raw.info, meg=True, eeg=True)[::3]
+    for _ in range(2):
+        assert_array_almost_equal(raw[picks, 0:20][0], raw2[picks, 0:20][0])
+    assert_true(len(raw2._read_ops) == 1)
+    raw2.add_proj([])
+    assert_true(len(raw2._read_ops) == 0)
+
 
 def test_preload_modify():
     """ Test preloading and modifying data
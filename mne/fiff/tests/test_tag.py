@@ -0,0 +1,48 @@
+import os.path as op
+
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import assert_true, assert_equal
+
+from mne.fiff.open import fiff_open
+from mne.fiff.tree import dir_tree_find
+from mne.fiff.tag import read_tag, read_struct_tags
+from mne.fiff.constants import FIFF
+
+base_dir = op.join(op.dirname(__file__), 'data')
+fname = op.join(base_dir, 'test-ave.fif.gz')
+
+
+def test_read_struct_tags():
+    """Test reading channel info and digitization point tags at once
+    """
+    fid, tree, _ = fiff_open(fname)
+    meas_info = dir_tree_find(tree, FIFF.FIFFB_MEAS_INFO)[0]
+    isotrak = dir_tree_find(tree, FIFF.FIFFB_ISOTRAK)[0]
+    for node, kind in [(meas_info, FIFF.FIFF_CH_INFO),
+                       (isotrak, FIFF.FIFF_DIG_POINT)]:
+        tags = [d for d in node['directory'] if d.kind == kind]
+        # skip some tags so that the runs of tags are interrupted
+        tags = tags[:5] + tags[7:]
+        data = read_struct_tags(fid, tags)
+        assert_equal(len(data), len(tags))
+        for d, tag in zip(data, tags):
+            d2 = read_tag(fid, tag.pos).data
+            assert_equal(sorted(d.keys()), sorted(d2.keys()))
+            for key in d:
+                if isinstance(d[key], np.ndarray):
+                    assert_array_equal(d[key], d2[key])
+                else:
+                    assert_equal(d[key], d2[key])
+
+    chs = read_struct_tags(fid, [d for d in meas_info['directory']
+                                 if d.kind == FIFF.FIFF_CH_INFO])
+    fid.close()
+    ch = chs[0]
+    assert_equal(ch['ch_name'], 'MEG 0113')
+    assert_equal(ch['coord_frame'], FIFF.FIFFV_COORD_DEVICE)
+    assert_array_equal(ch['coil_trans'][:3, 3], ch['loc'][:3])
+    assert_array_equal(ch['coil_trans'][3], [0, 0, 0, 1])
+    eeg = [c for c in chs if c['kind'] == FIFF.FIFFV_EEG_CH]
+    assert_true(len(eeg) > 0)
+    assert_true(all(c['coord_frame'] == FIFF.FIFFV_COORD_HEAD for c in eeg))
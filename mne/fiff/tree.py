@@ -33,6 +33,32 @@ def dir_tree_find(tree, kind):
     return nodes
 
 
+class _DirNode(dict):
+    """Node of a directory tree
+
+    The block id and parent block id of the node are only read from the file
+    when they are accessed for the first time.
+    """
+    def __init__(self, fid):
+        dict.__init__(self)
+        self._fid = fid
+        self._id_pos = dict()
+
+    def __missing__(self, key):
+        if key not in self._id_pos:
+            raise KeyError(key)
+        pos = self._fid.tell()
+        self[key] = read_tag(self._fid, self._id_pos.pop(key)).data
+        self._fid.seek(pos, 0)
+        return self[key]
+
+    def __getstate__(self):
+        # the ids cannot be read anymore once the node is copied or pickled
+        for key in self._id_pos.keys():
+            self[key]
+        return dict(_fid=None, _id_pos=dict())
+
+
 @verbose
 def make_dir_tree(fid, directory, start=0, indent=0, verbose=None):
     """Create the directory tree structure
@@ -53,10 +79,8 @@ def make_dir_tree(fid, directory, start=0, indent=0, verbose=None):
 
     this = start
 
-    tree = dict()
+    tree = _DirNode(fid)
     tree['block'] = block
-    tree['id'] = None
-    tree['parent_id'] = None
     tree['nent'] = 0
     tree['nchild'] = 0
     tree['directory'] = directory[this]
@@ -69,8 +93,8 @@ def make_dir_tree(fid, directory, start=0, indent=0, verbose=None):
                 tree['nchild'] += 1
                 tree['children'].append(child)
         elif directory[this].kind == FIFF_BLOCK_END:
-            tag = read_tag(fid, directory[start].pos)
-            if tag.data == block:
+            #   The file level has no block end
+            if directory[start].kind == FIFF_BLOCK_START:
                 break
         else:
             tree['nent'] += 1
@@ -81,18 +105,19 @@ def make_dir_tree(fid, directory, start=0, indent=0, verbose=None):
             #  Add the id information if available
             if block == 0:
                 if directory[this].kind == FIFF_FILE_ID:
-                    tag = read_tag(fid, directory[this].pos)
-                    tree['id'] = tag.data
+                    tree._id_pos['id'] = directory[this].pos
             else:
                 if directory[this].kind == FIFF_BLOCK_ID:
-                    tag = read_tag(fid, directory[this].pos)
-                    tree['id'] = tag.data
+                    tree._id_pos['id'] = directory[this].pos
                 elif directory[this].kind == FIFF_PARENT_BLOCK_ID:
-                    tag = read_tag(fid, directory[this].pos)
-                    tree['parent_id'] = tag.data
+                    tree._id_pos['parent_id'] = directory[this].pos
 
         this += 1
 
+    for key in ['id', 'parent_id']:
+        if key not in tree._id_pos:
+            tree[key] = None
+
     # Eliminate the empty directory
     if tree['nent'] == 0:
         tree['directory'] = None
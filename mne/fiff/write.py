@@ -4,14 +4,43 @@
 # License: BSD (3-clause)
 
 import time
+import struct
 import numpy as np
 from scipy import linalg
 import os.path as op
-import gzip
+import weakref
 import logging
 logger = logging.getLogger('mne')
 
 from .constants import FIFF
+from .bgzf import BlockGzipWriter
+from .tag import _ch_info_dtype, _dig_point_dtype
+
+# Size of the write buffer of the files opened with start_file
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Tag directories of the files opened with start_file. They are written
+# to the file by end_file so that fiff_open does not have to scan the tags.
+_tag_dirs = weakref.WeakKeyDictionary()
+
+
+def _write_tag_header(fid, kind, FIFFT_TYPE, data_size,
+                      next=FIFF.FIFFV_NEXT_SEQ):
+    """Writes a tag header and adds the tag to the directory of the file"""
+    tag_dir = _tag_dirs.get(fid)
+    if tag_dir is not None:
+        tag_dir['entries'].append((kind, FIFFT_TYPE, data_size,
+                                   tag_dir['pos']))
+        tag_dir['pos'] += 16 + data_size
+    fid.write(struct.pack('>iIii', kind, FIFFT_TYPE, data_size, next))
+
+
+def _write_array(fid, data):
+    """Writes the content of an array in C order without copying it"""
+    if isinstance(fid, file):
+        data.tofile(fid)
+    else:
+        fid.write(data.tostring())
 
 
 def _write(fid, data, kind, data_size, FIFFT_TYPE, dtype):
@@ -19,11 +48,8 @@ def _write(fid, data, kind, data_size, FIFFT_TYPE, dtype):
         data_size *= data.size
     if isinstance(data, str):
         data_size *= len(data)
-    fid.write(np.array(kind, dtype='>i4').tostring())
-    fid.write(np.array(FIFFT_TYPE, dtype='>i4').tostring())
-    fid.write(np.array(data_size, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFV_NEXT_SEQ, dtype='>i4').tostring())
-    fid.write(np.array(data, dtype=dtype).tostring())
+    _write_tag_header(fid, kind, FIFFT_TYPE, data_size)
+    _write_array(fid, np.asarray(data, dtype=dtype))
 
 
 def write_int(fid, kind, data):
@@ -77,10 +103,7 @@ def write_float_matrix(fid, kind, mat):
 
     data_size = 4 * mat.size + 4 * 3
 
-    fid.write(np.array(kind, dtype='>i4').tostring())
-    fid.write(np.array(FIFFT_MATRIX_FLOAT, dtype='>i4').tostring())
-    fid.write(np.array(data_size, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFV_NEXT_SEQ, dtype='>i4').tostring())
+    _write_tag_header(fid, kind, FIFFT_MATRIX_FLOAT, data_size)
     fid.write(np.array(mat, dtype='>f4').tostring())
 
     dims = np.empty(3, dtype=np.int32)
@@ -97,10 +120,7 @@ def write_int_matrix(fid, kind, mat):
 
     data_size = 4 * mat.size + 4 * 3
 
-    fid.write(np.array(kind, dtype='>i4').tostring())
-    fid.write(np.array(FIFFT_MATRIX_INT, dtype='>i4').tostring())
-    fid.write(np.array(data_size, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFV_NEXT_SEQ, dtype='>i4').tostring())
+    _write_tag_header(fid, kind, FIFFT_MATRIX_INT, data_size)
     fid.write(np.array(mat, dtype='>i4').tostring())
 
     dims = np.empty(3, dtype=np.int32)
@@ -121,13 +141,9 @@ def write_id(fid, kind, id_=None):
         id_['usecs'] = 0            # Do not know how we could get this XXX
 
     FIFFT_ID_STRUCT = 31
-    FIFFV_NEXT_SEQ = 0
 
     data_size = 5 * 4                       # The id comprises five integers
-    fid.write(np.array(kind, dtype='>i4').tostring())
-    fid.write(np.array(FIFFT_ID_STRUCT, dtype='>i4').tostring())
-    fid.write(np.array(data_size, dtype='>i4').tostring())
-    fid.write(np.array(FIFFV_NEXT_SEQ, dtype='>i4').tostring())
+    _write_tag_header(fid, kind, FIFFT_ID_STRUCT, data_size)
 
     # Collect the bits together for one write
     data = np.empty(5, dtype=np.int32)
@@ -159,27 +175,60 @@ def start_file(fname):
         that the name ends with .fif or .fif.gz
     """
     if op.splitext(fname)[1].lower() == '.gz':
-        logger.debug('Writing using gzip')
+        logger.debug('Writing using block gzip')
         # defaults to compression level 9, which is barely smaller but much
         # slower. 2 offers a good compromise.
-        fid = gzip.open(fname, "wb", compresslevel=2)
+        fid = BlockGzipWriter(fname, compresslevel=2)
     else:
         logger.debug('Writing using normal I/O')
-        fid = open(fname, "wb")
+        fid = open(fname, "wb", _WRITE_BUFFER_SIZE)
+    # the directory pointer is updated by end_file
+    _tag_dirs[fid] = dict(entries=list(), pos=0)
     #   Write the compulsory items
     write_id(fid, FIFF.FIFF_FILE_ID)
     write_int(fid, FIFF.FIFF_DIR_POINTER, -1)
     write_int(fid, FIFF.FIFF_FREE_LIST, -1)
+    if isinstance(fid, BlockGzipWriter):
+        # keep the directory pointer in a block that can be updated
+        fid.flush()
     return fid
 
 
+def _write_dir(fid, tag_dir):
+    """Writes the tag directory and points the FIFF_DIR_POINTER tag to it
+
+    The directory lists all the tags of the file, including the directory
+    itself and the closing FIFF_NOP tag written by end_file, and is
+    terminated by an entry filled with -1.
+    """
+    entries = tag_dir['entries']
+    dir_pos = tag_dir['pos']
+    data_size = 16 * (len(entries) + 3)
+    entries.append((FIFF.FIFF_DIR, FIFF.FIFFT_DIR_ENTRY_STRUCT, data_size,
+                    dir_pos))
+    entries.append((FIFF.FIFF_NOP, FIFF.FIFFT_VOID, 0,
+                    dir_pos + 16 + data_size))
+    entries.append((-1, -1, -1, -1))
+    dir_data = np.array(entries, dtype='>i4')
+    _write_tag_header(fid, FIFF.FIFF_DIR, FIFF.FIFFT_DIR_ENTRY_STRUCT,
+                      data_size)
+    fid.write(dir_data.tostring())
+
+    #   The FIFF_DIR_POINTER tag is the second tag of the file
+    end = fid.tell()
+    fid.seek(entries[1][3] + 16, 0)
+    fid.write(np.array(dir_pos, dtype='>i4').tostring())
+    fid.seek(end, 0)
+
+
 def end_file(fid):
     """Writes the closing tags to a fif file and closes the file"""
+    tag_dir = _tag_dirs.pop(fid, None)
+    if tag_dir is not None:
+        _write_dir(fid, tag_dir)
     data_size = 0
-    fid.write(np.array(FIFF.FIFF_NOP, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFT_VOID, dtype='>i4').tostring())
-    fid.write(np.array(data_size, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFV_NEXT_NONE, dtype='>i4').tostring())
+    _write_tag_header(fid, FIFF.FIFF_NOP, FIFF.FIFFT_VOID, data_size,
+                      FIFF.FIFFV_NEXT_NONE)
     fid.close()
 
 
@@ -196,10 +245,8 @@ def write_coord_trans(fid, trans):
     #} *fiffCoordTrans, fiffCoordTransRec; /*!< Coordinate transformation descriptor */
 
     data_size = 4 * 2 * 12 + 4 * 2
-    fid.write(np.array(FIFF.FIFF_COORD_TRANS, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFT_COORD_TRANS_STRUCT, dtype='>i4').tostring())
-    fid.write(np.array(data_size, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFV_NEXT_SEQ, dtype='>i4').tostring())
+    _write_tag_header(fid, FIFF.FIFF_COORD_TRANS, FIFF.FIFFT_COORD_TRANS_STRUCT,
+                      data_size)
     fid.write(np.array(trans['from'], dtype='>i4').tostring())
     fid.write(np.array(trans['to'], dtype='>i4').tostring())
 
@@ -242,33 +289,18 @@ def write_ch_info(fid, ch):
 
     data_size = 4 * 13 + 4 * 7 + 16
 
-    fid.write(np.array(FIFF.FIFF_CH_INFO, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFT_CH_INFO_STRUCT, dtype='>i4').tostring())
-    fid.write(np.array(data_size, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFV_NEXT_SEQ, dtype='>i4').tostring())
+    _write_tag_header(fid, FIFF.FIFF_CH_INFO, FIFF.FIFFT_CH_INFO_STRUCT,
+                      data_size)
 
     #   Start writing fiffChInfoRec
-    fid.write(np.array(ch['scanno'], dtype='>i4').tostring())
-    fid.write(np.array(ch['logno'], dtype='>i4').tostring())
-    fid.write(np.array(ch['kind'], dtype='>i4').tostring())
-    fid.write(np.array(ch['range'], dtype='>f4').tostring())
-    fid.write(np.array(ch['cal'], dtype='>f4').tostring())
-    fid.write(np.array(ch['coil_type'], dtype='>i4').tostring())
-    fid.write(np.array(ch['loc'], dtype='>f4').tostring())  # writing 12 values
-
-    #   unit and unit multiplier
-    fid.write(np.array(ch['unit'], dtype='>i4').tostring())
-    fid.write(np.array(ch['unit_mul'], dtype='>i4').tostring())
-
-    #   Finally channel name
-    if len(ch['ch_name']):
-        ch_name = ch['ch_name'][:15]
-    else:
-        ch_name = ch['ch_name']
+    rec = np.zeros(1, dtype=_ch_info_dtype)
+    for key in ['scanno', 'logno', 'kind', 'range', 'cal', 'coil_type',
+                'loc', 'unit', 'unit_mul']:
+        rec[key] = ch[key]
 
-    fid.write(np.array(ch_name, dtype='>c').tostring())
-    if len(ch_name) < 16:
-        fid.write('\0' * (16 - len(ch_name)))
+    #   Finally channel name, padded with nulls
+    rec['ch_name'] = ch['ch_name'][:15]
+    _write_array(fid, rec)
 
 
 def write_dig_point(fid, dig):
@@ -283,15 +315,15 @@ def write_dig_point(fid, dig):
 
     data_size = 5 * 4
 
-    fid.write(np.array(FIFF.FIFF_DIG_POINT, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFT_DIG_POINT_STRUCT, dtype='>i4').tostring())
-    fid.write(np.array(data_size, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFV_NEXT_SEQ, dtype='>i4').tostring())
+    _write_tag_header(fid, FIFF.FIFF_DIG_POINT, FIFF.FIFFT_DIG_POINT_STRUCT,
+                      data_size)
 
     #   Start writing fiffDigPointRec
-    fid.write(np.array(dig['kind'], dtype='>i4').tostring())
-    fid.write(np.array(dig['ident'], dtype='>i4').tostring())
-    fid.write(np.array(dig['r'][:3], dtype='>f4').tostring())
+    rec = np.zeros(1, dtype=_dig_point_dtype)
+    rec['kind'] = dig['kind']
+    rec['ident'] = dig['ident']
+    rec['r'] = dig['r'][:3]
+    _write_array(fid, rec)
 
 
 def write_float_sparse_rcs(fid, kind, mat):
@@ -303,10 +335,7 @@ def write_float_sparse_rcs(fid, kind, mat):
     nrow = mat.shape[0]
     data_size = 4 * nnzm + 4 * nnzm + 4 * (nrow + 1) + 4 * 4
 
-    fid.write(np.array(kind, dtype='>i4').tostring())
-    fid.write(np.array(FIFFT_MATRIX_FLOAT_RCS, dtype='>i4').tostring())
-    fid.write(np.array(data_size, dtype='>i4').tostring())
-    fid.write(np.array(FIFF.FIFFV_NEXT_SEQ, dtype='>i4').tostring())
+    _write_tag_header(fid, kind, FIFFT_MATRIX_FLOAT_RCS, data_size)
 
     fid.write(np.array(mat.data, dtype='>f4').tostring())
     fid.write(np.array(mat.indices, dtype='>i4').tostring())
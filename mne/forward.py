@@ -18,7 +18,7 @@ from .fiff.constants import FIFF
 from .fiff.open import fiff_open
 from .fiff.tree import dir_tree_find
 from .fiff.channels import read_bad_channels
-from .fiff.tag import find_tag, read_tag
+from .fiff.tag import find_tag, read_tag, read_struct_tags
 from .fiff.matrix import _read_named_matrix, _transpose_named_matrix
 from .fiff.pick import pick_channels_forward, pick_info, pick_channels
 from .fiff.write import write_int, start_block, end_block, \
@@ -191,13 +191,8 @@ def read_forward_meas_info(tree, fid):
 
     # Add channel information
     info = dict()
-    chs = list()
-    for k in range(parent_meg['nent']):
-        kind = parent_meg['directory'][k].kind
-        pos = parent_meg['directory'][k].pos
-        if kind == FIFF.FIFF_CH_INFO:
-            tag = read_tag(fid, pos)
-            chs.append(tag.data)
+    chs = read_struct_tags(fid, [d for d in parent_meg['directory'] or []
+                                 if d.kind == FIFF.FIFF_CH_INFO])
     info['chs'] = chs
 
     info['ch_names'] = [c['ch_name'] for c in chs]
@@ -12,9 +12,11 @@ import warnings
 import logging
 logger = logging.getLogger('mne')
 
-from .source_estimate import read_stc, mesh_edges, mesh_dist, morph_data, \
-                             SourceEstimate
-from .surface import read_surface
+from .source_estimate import mesh_edges, mesh_dist, morph_data, \
+                             SourceEstimate, _read_stc_subset
+from .surface import _read_surface_cached
+from .parallel import parallel_func
+from .fixes import in1d
 from . import verbose
 
 
@@ -394,17 +396,14 @@ def label_time_courses(labelfile, stcfile):
     vertices : array
         The indices of the vertices corresponding to the time points
     """
-    stc = read_stc(stcfile)
     lab = read_label(labelfile)
-
-    vertices = np.intersect1d(stc['vertices'], lab.vertices)
-    idx = [k for k in range(len(stc['vertices']))
-                   if stc['vertices'][k] in vertices]
+    stc = _read_stc_subset(stcfile, np.unique(lab.vertices))
+    vertices = stc['vertices']
 
     if len(vertices) == 0:
         raise ValueError('No vertices match the label in the stc file')
 
-    values = stc['data'][idx]
+    values = stc['data']
     times = stc['tmin'] + stc['tstep'] * np.arange(stc['data'].shape[1])
 
     return values, times, vertices
@@ -450,6 +449,140 @@ def label_sign_flip(label, src):
     return flip
 
 
+def label_extraction_operator(labels, src, mode='mean'):
+    """Compute a sparse operator extracting time courses of labels
+
+    The operator is computed once for a set of labels and a source space,
+    and applied to the data of source estimates with a single sparse
+    matrix product, see extract_label_time_course.
+
+    Parameters
+    ----------
+    labels : Label | BiHemiLabel | list of Label or BiHemiLabel
+        The labels.
+    src : list of dict
+        The source space of the source estimates.
+    mode : 'mean' | 'mean_flip' | 'pca_flip'
+        Extraction method. 'mean' averages the sources of the label,
+        'mean_flip' averages them after flipping their signs according to
+        label_sign_flip. For 'pca_flip', the operator contains the sign
+        flips and extract_label_time_course takes the first principal
+        component of the time courses, with its sign matching the flips.
+
+    Returns
+    -------
+    operator : scipy.sparse.csr_matrix, shape (n_labels, n_sources)
+        The extraction operator.
+    """
+    from scipy import sparse
+
+    if mode not in ['mean', 'mean_flip', 'pca_flip']:
+        raise ValueError('mode must be "mean", "mean_flip" or "pca_flip"')
+    if len(src) != 2:
+        raise ValueError('Only source spaces with 2 hemisphers are accepted')
+    if not isinstance(labels, list):
+        labels = [labels]
+
+    offsets = dict(lh=0, rh=len(src[0]['vertno']))
+    hemi_src = dict(lh=src[0], rh=src[1])
+    rows, cols, weights = list(), list(), list()
+    for k, label in enumerate(labels):
+        if label.hemi == 'both':
+            hemi_labels = [label.lh, label.rh]
+        else:
+            hemi_labels = [_aslabel(label)]
+
+        idx, ori = list(), list()
+        for hemi_label in hemi_labels:
+            if hemi_label.hemi not in hemi_src:
+                raise Exception("Unknown hemisphere type")
+            this_src = hemi_src[hemi_label.hemi]
+            vertno = this_src['vertno']
+            this_idx = np.where(in1d(vertno, hemi_label.vertices))[0]
+            idx.append(offsets[hemi_label.hemi] + this_idx)
+            ori.append(this_src['nn'][vertno[this_idx]])
+        idx = np.concatenate(idx)
+        if len(idx) == 0:
+            raise ValueError('No vertices match the label %d in the source '
+                             'space' % k)
+
+        if mode == 'mean':
+            w = np.ones(len(idx))
+        else:
+            ori = np.concatenate(ori)
+            _, _, Vh = linalg.svd(ori, full_matrices=False)
+            w = np.sign(np.dot(ori, Vh[:, 0]))
+        if mode != 'pca_flip':
+            w /= len(idx)
+
+        rows.append(np.tile(k, len(idx)))
+        cols.append(idx)
+        weights.append(w)
+
+    n_sources = len(src[0]['vertno']) + len(src[1]['vertno'])
+    operator = sparse.csr_matrix((np.concatenate(weights),
+                                  (np.concatenate(rows),
+                                   np.concatenate(cols))),
+                                 shape=(len(labels), n_sources))
+    return operator
+
+
+def extract_label_time_course(stcs, labels, src, mode='mean',
+                              operator=None):
+    """Extract the time courses of labels from source estimates
+
+    Parameters
+    ----------
+    stcs : SourceEstimate | list (or generator) of SourceEstimate
+        The source estimates, e.g., as returned by apply_inverse_epochs.
+    labels : Label | BiHemiLabel | list of Label or BiHemiLabel
+        The labels.
+    src : list of dict
+        The source space of the source estimates.
+    mode : 'mean' | 'mean_flip' | 'pca_flip'
+        Extraction method, see label_extraction_operator.
+    operator : scipy.sparse.csr_matrix | None
+        An operator computed by label_extraction_operator for these labels,
+        source space and mode, e.g., to reuse it across calls. If None, it
+        is computed.
+
+    Returns
+    -------
+    label_tc : array | list of array, shape (n_labels, n_times)
+        The time courses of the labels, for each source estimate. A single
+        array is returned if stcs is a SourceEstimate.
+    """
+    if operator is None:
+        operator = label_extraction_operator(labels, src, mode=mode)
+    vertno = [s['vertno'] for s in src]
+
+    single = isinstance(stcs, SourceEstimate)
+    if single:
+        stcs = [stcs]
+
+    label_tcs = list()
+    for stc in stcs:
+        if (len(stc.vertno) != 2 or
+                not all([np.array_equal(v1, v2)
+                         for v1, v2 in zip(stc.vertno, vertno)])):
+            raise ValueError('The source estimates and the source space '
+                             'must have the same vertices')
+        if mode == 'pca_flip':
+            label_tc = np.empty((operator.shape[0], stc.data.shape[1]))
+            for k in range(operator.shape[0]):
+                sl = slice(operator.indptr[k], operator.indptr[k + 1])
+                idx, flip = operator.indices[sl], operator.data[sl]
+                U, s, V = linalg.svd(stc.data[idx], full_matrices=False)
+                sign = np.sign(np.dot(U[:, 0], flip))
+                scale = linalg.norm(s) / np.sqrt(len(idx))
+                label_tc[k] = sign * scale * V[0]
+        else:
+            label_tc = operator * stc.data
+        label_tcs.append(label_tc)
+
+    return label_tcs[0] if single else label_tcs
+
+
 def stc_to_label(stc, src, smooth=5):
     """Compute a label from the non-zero sources in an stc object.
 
@@ -477,10 +610,10 @@ def stc_to_label(stc, src, smooth=5):
         else:
             raise ValueError('SUBJECTS_DIR environment variable not set')
         surf_path_from = os.path.join(subjects_dir, src, 'surf')
-        rr_lh, tris_lh = read_surface(os.path.join(surf_path_from,
-                                      'lh.white'))
-        rr_rh, tris_rh = read_surface(os.path.join(surf_path_from,
-                                      'rh.white'))
+        rr_lh, tris_lh = _read_surface_cached(os.path.join(surf_path_from,
+                                                           'lh.white'))
+        rr_rh, tris_rh = _read_surface_cached(os.path.join(surf_path_from,
+                                                           'rh.white'))
         rr = [rr_lh, rr_rh]
         tris = [tris_lh, tris_rh]
     else:
@@ -539,6 +672,49 @@ def _verts_within_dist(graph, source, max_dist):
     dist : array
         Distances from source vertex
     """
+    return _verts_within_dists(graph, [source], [max_dist])[0]
+
+
+def _verts_within_dists(graph, sources, max_dists):
+    """Find the vertices within a maximum geodesic distance of many sources
+
+    The distances from all the sources are computed by a single Dijkstra
+    call limited to the largest distance, when scipy.sparse.csgraph is
+    available.
+
+    Parameters
+    ----------
+    graph : scipy.sparse.csr_matrix
+        Sparse matrix with distances between adjacent vertices
+    sources : array of int
+        Source vertices
+    max_dists : array of float
+        Maximum geodesic distance for each source
+
+    Returns
+    -------
+    verts_dists : list of tuple
+        The vertices within max_dist (array) and their distances from the
+        source vertex (array), for each source
+    """
+    try:
+        from scipy.sparse.csgraph import dijkstra
+        dists = dijkstra(graph, indices=sources, limit=np.max(max_dists))
+    except (ImportError, TypeError):
+        # csgraph is not available or does not support distance limits
+        return [_verts_within_dist_py(graph, source, max_dist)
+                for source, max_dist in zip(sources, max_dists)]
+
+    verts_dists = list()
+    for dist, max_dist in zip(np.atleast_2d(dists), max_dists):
+        verts = np.where(dist <= max_dist)[0]
+        verts_dists.append((verts, dist[verts]))
+
+    return verts_dists
+
+
+def _verts_within_dist_py(graph, source, max_dist):
+    """Pure Python version of _verts_within_dist"""
     dist_map = {}
     dist_map[source] = 0
     verts_added_last = [source]
@@ -568,7 +744,40 @@ def _verts_within_dist(graph, source, max_dist):
     return verts, dist
 
 
-def grow_labels(subject, seeds, extents, hemis, subjects_dir=None):
+# In-memory cache of white surfaces and their distance graphs, see
+# _get_surface_dist
+_SURF_DIST_CACHE_SIZE = 4
+_surf_dist_cache = dict()
+_surf_dist_cache_keys = list()
+
+
+def _get_surface_dist(surf_fname):
+    """Read a surface and compute its distance graph, using a cache"""
+    key = (os.path.abspath(surf_fname), os.path.getmtime(surf_fname))
+    if key in _surf_dist_cache:
+        logger.info('    Using cached distance graph of %s' % surf_fname)
+        _surf_dist_cache_keys.remove(key)
+        _surf_dist_cache_keys.append(key)
+        return _surf_dist_cache[key]
+
+    vert, tris = _read_surface_cached(surf_fname)
+    dist = mesh_dist(tris, vert)
+
+    _surf_dist_cache[key] = (vert, dist)
+    _surf_dist_cache_keys.append(key)
+    if len(_surf_dist_cache_keys) > _SURF_DIST_CACHE_SIZE:
+        del _surf_dist_cache[_surf_dist_cache_keys.pop(0)]
+
+    return vert, dist
+
+
+# Number of seeds grown by one Dijkstra call in grow_labels
+_GROW_CHUNK_SIZE = 50
+
+
+@verbose
+def grow_labels(subject, seeds, extents, hemis, subjects_dir=None, n_jobs=1,
+                verbose=None):
     """Generate circular labels in source space with region growing
 
     This function generates a number of labels in source space by growing
@@ -593,6 +802,10 @@ def grow_labels(subject, seeds, extents, hemis, subjects_dir=None):
         Hemispheres to use for the labels (0: left, 1: right)
     subjects_dir : string
         Path to SUBJECTS_DIR if not set in the environment
+    n_jobs : int
+        Number of jobs to run in parallel
+    verbose : bool, str, int, or None
+        If not None, override default verbose level (see mne.verbose).
 
     Returns
     -------
@@ -632,18 +845,32 @@ def grow_labels(subject, seeds, extents, hemis, subjects_dir=None):
     hemis = ['lh' if h == 0 else 'rh' for h in hemis]
 
     # load the surfaces and create the distance graphs
-    tris, vert, dist = {}, {}, {}
+    vert, dist = {}, {}
     for hemi in set(hemis):
         surf_fname = os.path.join(subjects_dir, subject, 'surf',
                                   hemi + '.white')
-        vert[hemi], tris[hemi] = read_surface(surf_fname)
-        dist[hemi] = mesh_dist(tris[hemi], vert[hemi])
+        vert[hemi], dist[hemi] = _get_surface_dist(surf_fname)
+
+    # grow the seeds of each hemisphere together, in chunks of seeds to
+    # limit the size of the distance matrices
+    hemis = np.array(hemis)
+    parallel, my_verts_within_dists, _ = \
+                        parallel_func(_verts_within_dists, n_jobs)
+    verts_dists = [None] * n_seeds
+    for hemi in set(hemis):
+        idx = np.where(hemis == hemi)[0]
+        chunks = [idx[k:k + _GROW_CHUNK_SIZE]
+                  for k in range(0, len(idx), _GROW_CHUNK_SIZE)]
+        out = parallel(my_verts_within_dists(dist[hemi], seeds[c], extents[c])
+                       for c in chunks)
+        for c, this_verts_dists in zip(chunks, out):
+            for k, verts_dist in zip(c, this_verts_dists):
+                verts_dists[k] = verts_dist
 
     # create the patches
     labels = []
-    for seed, extent, hemi in zip(seeds, extents, hemis):
-        label_verts, label_dist = _verts_within_dist(dist[hemi], seed, extent)
-
+    for seed, extent, hemi, (label_verts, label_dist) in \
+                                    zip(seeds, extents, hemis, verts_dists):
         # create a label
         comment = 'Circular label: seed=%d, extent=%0.1fmm' % (seed, extent)
         label = Label(vertices=label_verts,
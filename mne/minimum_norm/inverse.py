@@ -17,7 +17,8 @@ from ..fiff.open import fiff_open
 from ..fiff.tag import find_tag
 from ..fiff.matrix import _read_named_matrix, _transpose_named_matrix, \
                           write_named_matrix
-from ..fiff.proj import read_proj, make_projector, write_proj
+from ..fiff.proj import read_proj, write_proj, Projector, \
+                        _make_projector_basis
 from ..fiff.tree import dir_tree_find
 from ..fiff.write import write_int, write_float_matrix, start_file, \
                          start_block, end_block, end_file, write_float, \
@@ -475,8 +476,9 @@ def prepare_inverse_operator(orig, nave, lambda2, method, verbose=None):
     #
     #   Create the projection operator
     #
-    inv['proj'], ncomp, _ = make_projector(inv['projs'],
-                                           inv['noise_cov']['names'])
+    inv['proj'] = Projector(_make_projector_basis(inv['projs'],
+                                                  inv['noise_cov']['names']))
+    ncomp = inv['proj'].U.shape[1]
     if ncomp > 0:
         logger.info('    Created an SSP operator (subspace dimension = %d)'
                     % ncomp)
@@ -605,10 +607,8 @@ def _assemble_kernel(inv, label, method, pick_normal, verbose=None):
         eigen_leads = eigen_leads[2::3]
         source_cov = source_cov[2::3]
 
-    trans = inv['reginv'][:, None] * reduce(np.dot,
-                                            [inv['eigen_fields']['data'],
-                                            inv['whitener'],
-                                            inv['proj']])
+    trans = inv['reginv'][:, None] * inv['proj'].dot_right(
+                        np.dot(inv['eigen_fields']['data'], inv['whitener']))
     #
     #   Transformation into current distributions by weighting the eigenleads
     #   with the weights computed above
@@ -10,12 +10,92 @@ import copy as cp
 import logging
 logger = logging.getLogger('mne')
 
-from .. import Epochs, compute_proj_evoked, compute_proj_epochs, verbose
+from .. import verbose
 from ..fiff import pick_types, make_eeg_average_ref_proj
+from ..fiff.pick import channel_indices_by_type
+from ..fiff.proj import setup_proj
+from ..epochs import _is_good
+from ..filter import band_pass_filter, low_pass_filter, high_pass_filter
+from ..parallel import parallel_func
+from ..proj import _compute_proj, _stacked_cov
 from ..artifacts import find_ecg_events, find_eog_events
 from warnings import warn
 
 
+# Maximum duration in seconds of the data read at once around the events
+_EXG_BLOCK_SIZE = 60.
+
+
+def _iter_exg_epochs(raw, events, picks, info, projector, tmin, n_times,
+                     l_freq, h_freq, filter_length, reject, flat, n_jobs):
+    """Read, filter and select the epochs around the events
+
+    The events close to each other are grouped, and the data of each group
+    (plus filter_length samples on each side) are read and filtered at once.
+    If filter_length is None, all the data are read and filtered at once.
+    Yields the good epochs of each group, with the SSP operator applied.
+    """
+    sfreq = float(raw.info['sfreq'])
+    n_total = raw.last_samp - raw.first_samp + 1
+    if l_freq == 0:
+        l_freq = None
+    if h_freq is not None and h_freq > (sfreq / 2.):
+        h_freq = None
+    if l_freq is None and h_freq is not None:
+        filt, args = low_pass_filter, (sfreq, h_freq)
+    elif l_freq is not None and h_freq is None:
+        filt, args = high_pass_filter, (sfreq, l_freq)
+    elif l_freq is not None and h_freq is not None:
+        filt, args = band_pass_filter, (sfreq, l_freq, h_freq)
+    else:
+        filt = None
+    if filt is not None:
+        parallel, p_filt, _ = parallel_func(filt, n_jobs)
+
+    if reject is not None or flat is not None:
+        channel_type_idx = channel_indices_by_type(info)
+
+    # epochs entirely within the data, as done by Epochs
+    starts = np.sort([int(round(event_samp + tmin * sfreq))
+                      for event_samp in events[:, 0]]) - raw.first_samp
+    starts = starts[(starts >= 0) & (starts + n_times <= n_total)]
+
+    if filter_length is None:
+        # the filters span the whole data, which are hence read only once
+        margin = block_size = n_total
+    else:
+        margin = filter_length
+        block_size = max(int(_EXG_BLOCK_SIZE * sfreq), n_times)
+    k = 0
+    while k < len(starts):
+        group = starts[k:np.searchsorted(starts, starts[k] + block_size
+                                         - n_times, side='right')]
+        k += len(group)
+
+        first = max(group[0] - margin, 0)
+        last = min(group[-1] + n_times + margin, n_total)
+        data, _ = raw[picks, first:last]
+        if filt is not None:
+            data = np.array(parallel(p_filt(x, *args,
+                                            filter_length=filter_length)
+                                     for x in data))
+
+        epochs_data = list()
+        for start in group:
+            epoch = data[:, start - first:start - first + n_times]
+            if projector is not None:
+                epoch = projector.apply(epoch)
+            if reject is None and flat is None:
+                is_good = True
+            else:
+                is_good = _is_good(epoch, info['ch_names'], channel_type_idx,
+                                   reject, flat)
+            if is_good:
+                epochs_data.append(epoch)
+        if len(epochs_data) > 0:
+            yield epochs_data
+
+
 @verbose
 def _compute_exg_proj(mode, raw, raw_event, tmin, tmax,
                       n_grad, n_mag, n_eeg, l_freq, h_freq,
@@ -25,8 +105,8 @@ def _compute_exg_proj(mode, raw, raw_event, tmin, tmax,
                       verbose=None):
     """Compute SSP/PCA projections for ECG or EOG artifacts
 
-    Note: raw has to be constructed with preload=True (or string)
-    Warning: raw will be modified by this function
+    Only the data around the events are read and filtered. raw does not
+    need to be preloaded and is not modified.
 
     Parameters
     ----------
@@ -52,8 +132,9 @@ def _compute_exg_proj(mode, raw, raw_event, tmin, tmax,
         Filter high cut-off frequency in Hz.
     average : bool
         Compute SSP after averaging.
-    filter_length : int
-        Number of taps to use for filtering.
+    filter_length : int | None
+        Number of taps to use for filtering. If None, the whole data are
+        read and filtered at once.
     n_jobs : int
         Number of jobs to run in parallel.
     ch_name : string (or None)
@@ -88,10 +169,6 @@ def _compute_exg_proj(mode, raw, raw_event, tmin, tmax,
     events : ndarray
         Detected events.
     """
-    if not raw._preloaded:
-        raise ValueError('raw needs to be preloaded, '
-                         'use preload=True in constructor')
-
     if no_proj:
         projs = []
     else:
@@ -148,24 +225,42 @@ def _compute_exg_proj(mode, raw, raw_event, tmin, tmax,
 
     picks = pick_types(raw.info, meg=True, eeg=True, eog=True,
                        exclude=raw.info['bads'] + bads)
-    raw.filter(l_freq, h_freq, picks=picks, filter_length=filter_length,
-               n_jobs=n_jobs)
-
-    epochs = Epochs(raw, events, None, tmin, tmax, baseline=None, preload=True,
-                    picks=picks, reject=reject, flat=flat, proj=True)
 
-    epochs.drop_bad_epochs()
-    if epochs.events.shape[0] < 1:
+    # measurement info and SSP operator of the picked channels
+    info = cp.deepcopy(raw.info)
+    info['chs'] = [info['chs'][k] for k in picks]
+    info['ch_names'] = [info['ch_names'][k] for k in picks]
+    info['nchan'] = len(picks)
+    projector, info = setup_proj(info)
+
+    sfreq = raw.info['sfreq']
+    n_times_min = int(round(tmin * float(sfreq)))
+    n_times_max = int(round(tmax * float(sfreq)))
+    times = np.arange(n_times_min, n_times_max + 1, dtype=np.float) / sfreq
+
+    # accumulate the covariance (or the sum) of the good epochs, reading
+    # and filtering only the data around the events
+    data, n_good = 0., 0
+    for epochs_data in _iter_exg_epochs(raw, events, picks, info, projector,
+                                        tmin, len(times), l_freq, h_freq,
+                                        filter_length, reject, flat, n_jobs):
+        n_good += len(epochs_data)
+        if average:
+            data = data + np.sum(epochs_data, axis=0)
+        else:
+            data = data + _stacked_cov(epochs_data)
+
+    if n_good < 1:
         warn('No good epochs found, returning None for projs')
         return None, events
 
     if average:
-        evoked = epochs.average()
-        ev_projs = compute_proj_evoked(evoked, n_grad=n_grad, n_mag=n_mag,
-                                        n_eeg=n_eeg)
+        evoked_data = data / n_good
+        data = np.dot(evoked_data, evoked_data.T)
+        desc_prefix = "%-.3f-%-.3f" % (times[0], times[-1])
     else:
-        ev_projs = compute_proj_epochs(epochs, n_grad=n_grad, n_mag=n_mag,
-                                        n_eeg=n_eeg, n_jobs=n_jobs)
+        desc_prefix = "%-d-%-.3f-%-.3f" % (0, tmin, tmax)
+    ev_projs = _compute_proj(data, info, n_grad, n_mag, n_eeg, desc_prefix)
 
     for p in ev_projs:
         p['desc'] = mode + "-" + p['desc']
@@ -187,8 +282,8 @@ def compute_proj_ecg(raw, raw_event=None, tmin=-0.2, tmax=0.4,
                      tstart=0., qrs_threshold=0.6, verbose=None):
     """Compute SSP/PCA projections for ECG artifacts
 
-    Note: raw has to be constructed with preload=True (or string)
-    Warning: raw will be modified by this function
+    Only the data around the events are read and filtered. raw does not
+    need to be preloaded and is not modified.
 
     Parameters
     ----------
@@ -212,8 +307,9 @@ def compute_proj_ecg(raw, raw_event=None, tmin=-0.2, tmax=0.4,
         Filter high cut-off frequency in Hz.
     average : bool
         Compute SSP after averaging.
-    filter_length : int
-        Number of taps to use for filtering.
+    filter_length : int | None
+        Number of taps to use for filtering. If None, the whole data are
+        read and filtered at once.
     n_jobs : int
         Number of jobs to run in parallel.
     ch_name : string (or None)
@@ -268,8 +364,8 @@ def compute_proj_eog(raw, raw_event=None, tmin=-0.2, tmax=0.2,
                      verbose=None):
     """Compute SSP/PCA projections for EOG artifacts
 
-    Note: raw has to be constructed with preload=True (or string)
-    Warning: raw will be modified by this function
+    Only the data around the events are read and filtered. raw does not
+    need to be preloaded and is not modified.
 
     Parameters
     ----------
@@ -295,8 +391,9 @@ def compute_proj_eog(raw, raw_event=None, tmin=-0.2, tmax=0.2,
         Compute SSP after averaging.
     preload : string (or True)
         Temporary file used during computaion.
-    filter_length : int
-        Number of taps to use for filtering.
+    filter_length : int | None
+        Number of taps to use for filtering. If None, the whole data are
+        read and filtered at once.
     n_jobs : int
         Number of jobs to run in parallel.
     reject : dict
@@ -2,10 +2,11 @@ import os.path as op
 import warnings
 
 from nose.tools import assert_true, assert_equal
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_array_almost_equal
 
-from ...fiff import Raw
+from ...fiff import Raw, pick_types
 from ...fiff.proj import make_projector, activate_proj
+from ... import Epochs, compute_proj_epochs
 from ..ssp import compute_proj_ecg, compute_proj_eog
 
 data_path = op.join(op.dirname(__file__), '..', '..', 'fiff', 'tests', 'data')
@@ -60,6 +61,57 @@ def test_compute_proj_eog():
         assert_equal(projs, None)
 
 
+def test_compute_proj_no_preload():
+    """Test computation of ExG projectors without preloading raw"""
+    raw = Raw(raw_fname, preload=True)
+    data, _ = raw[:, :]
+    projs, _ = compute_proj_eog(raw, n_mag=2, n_grad=2, n_eeg=2,
+                                bads=['MEG 2443'], average=False,
+                                avg_ref=True, no_proj=False)
+    # raw is not modified
+    assert_array_equal(raw[:, :][0], data)
+    raw.close()
+
+    raw = Raw(raw_fname, preload=False)
+    projs_2, _ = compute_proj_eog(raw, n_mag=2, n_grad=2, n_eeg=2,
+                                  bads=['MEG 2443'], average=False,
+                                  avg_ref=True, no_proj=False)
+    projs = activate_proj(projs)
+    projs_2 = activate_proj(projs_2)
+    projs, _, _ = make_projector(projs, raw.info['ch_names'],
+                                 bads=['MEG 2443'])
+    projs_2, _, _ = make_projector(projs_2, raw.info['ch_names'],
+                                   bads=['MEG 2443'])
+    raw.close()
+    assert_array_equal(projs, projs_2)
+
+
+def test_compute_proj_epochs_path():
+    """Test ExG projectors against filtering raw and using Epochs"""
+    raw = Raw(raw_fname, preload=True)
+    reject = dict(grad=2000e-13, mag=3000e-15, eeg=500e-6)
+    projs, events = compute_proj_eog(raw, n_mag=2, n_grad=2, n_eeg=2,
+                                     bads=['MEG 2443'], average=False,
+                                     no_proj=True, filter_length=None,
+                                     reject=reject)
+
+    picks = pick_types(raw.info, meg=True, eeg=True, eog=True,
+                       exclude=raw.info['bads'] + ['MEG 2443'])
+    raw.filter(1.0, 35.0, picks=picks, filter_length=None)
+    epochs = Epochs(raw, events, None, -0.2, 0.2, baseline=None,
+                    preload=True, picks=picks, reject=reject, proj=True)
+    projs_2 = compute_proj_epochs(epochs, n_grad=2, n_mag=2, n_eeg=2)
+
+    projs = activate_proj(projs)
+    projs_2 = activate_proj(projs_2)
+    projs, _, _ = make_projector(projs, raw.info['ch_names'],
+                                 bads=['MEG 2443'])
+    projs_2, _, _ = make_projector(projs_2, raw.info['ch_names'],
+                                   bads=['MEG 2443'])
+    raw.close()
+    assert_array_almost_equal(projs, projs_2)
+
+
 def test_compute_proj_parallel():
     """Test computation of ExG projectors using parallelization"""
     raw = Raw(raw_fname, preload=True)
@@ -90,6 +90,28 @@ def _compute_proj(data, info, n_grad, n_mag, n_eeg, desc_prefix, verbose=None):
     return projs
 
 
+# Number of epochs stacked in one matrix product by compute_proj_epochs
+_EPOCH_BATCH_SIZE = 50
+
+
+def _stacked_cov(epochs_data):
+    """Sum of the covariances of a list of epochs, as one matrix product"""
+    data = np.concatenate(epochs_data, axis=1)
+    return np.dot(data, data.T)
+
+
+def _iter_epoch_batches(epochs):
+    """Iterate over batches of _EPOCH_BATCH_SIZE epochs"""
+    batch = list()
+    for e in epochs:
+        batch.append(e)
+        if len(batch) == _EPOCH_BATCH_SIZE:
+            yield batch
+            batch = list()
+    if len(batch) > 0:
+        yield batch
+
+
 @verbose
 def compute_proj_epochs(epochs, n_grad=2, n_mag=2, n_eeg=2, n_jobs=1,
                         verbose=None):
@@ -115,11 +137,10 @@ def compute_proj_epochs(epochs, n_grad=2, n_mag=2, n_eeg=2, n_jobs=1,
     projs: list
         List of projection vectors
     """
-    if n_jobs > 1:
-        parallel, p_fun, _ = parallel_func(np.dot, n_jobs)
-        data = sum(parallel(p_fun(e, e.T) for e in epochs))
-    else:
-        data = sum(np.dot(e, e.T) for e in epochs)  # compute data covariance
+    # compute data covariance, one product per batch of epochs
+    parallel, p_fun, _ = parallel_func(_stacked_cov, n_jobs)
+    data = sum(parallel(p_fun(batch)
+                        for batch in _iter_epoch_batches(epochs)))
     event_id = epochs.event_id
     if event_id is None:
         event_id = 0
@@ -6,10 +6,12 @@
 
 import os
 import copy
+import hashlib
 from math import ceil
 import numpy as np
 from scipy import sparse
 from scipy.sparse import csr_matrix, coo_matrix
+from scipy.spatial import cKDTree
 import warnings
 
 import logging
@@ -17,12 +19,12 @@ logger = logging.getLogger('mne')
 
 from .filter import resample
 from .parallel import parallel_func
-from .surface import read_surface
+from .surface import _read_surface_cached
 from .utils import get_subjects_dir
 from . import verbose
 from . fixes import in1d
 
-def read_stc(filename):
+def read_stc(filename, mmap=False):
     """Read an STC file and return as dict
 
     STC files contain activations or source reconstructions
@@ -31,6 +33,10 @@ def read_stc(filename):
     ----------
     filename: string
         The name of the STC file
+    mmap: bool
+        If True, the data matrix is a read-only view of the file mapped in
+        memory, so that subsets of vertices and time points can be read
+        without loading the whole file.
 
     Returns
     -------
@@ -75,14 +81,61 @@ def read_stc(filename):
         raise ValueError('incorrect stc file size')
 
     # read the data matrix
-    stc['data'] = np.fromfile(fid, dtype=">f4", count=vertices_n * data_n)
-    stc['data'] = stc['data'].reshape([data_n, vertices_n]).T
+    if mmap:
+        stc['data'] = np.memmap(fid, dtype=">f4", mode='r',
+                                offset=fid.tell(),
+                                shape=(data_n, vertices_n)).T
+    else:
+        stc['data'] = np.fromfile(fid, dtype=">f4",
+                                  count=vertices_n * data_n)
+        stc['data'] = stc['data'].reshape([data_n, vertices_n]).T
 
     # close the file
     fid.close()
     return stc
 
 
+def _stc_vertex_idx(stc_vertices, vertices):
+    """Find the positions of vertices in the vertices of an stc
+
+    Returns the positions of the vertices present in the stc, and these
+    vertices.
+    """
+    vertices = np.asarray(vertices)
+    order = np.argsort(stc_vertices)
+    if len(order) == 0:
+        return order, vertices[:0]
+    pos = np.searchsorted(stc_vertices, vertices, sorter=order)
+    idx = order[np.minimum(pos, len(order) - 1)]
+    present = stc_vertices[idx] == vertices
+    return idx[present], vertices[present]
+
+
+def _read_stc_subset(filename, vertices=None, tmin=None, tmax=None):
+    """Read a subset of the vertices and time points of an STC file
+
+    Only the requested part of the data matrix is read from the file.
+    """
+    stc = read_stc(filename, mmap=True)
+    data = stc['data'].T  # the memory-mapped (ntime * nvert) matrix
+    times = stc['tmin'] + stc['tstep'] * np.arange(data.shape[0])
+    mask = np.ones(len(times), dtype=np.bool)
+    if tmin is not None:
+        mask &= times >= tmin
+    if tmax is not None:
+        mask &= times <= tmax
+    tidx = np.where(mask)[0]
+    if len(tidx) == 0:
+        raise ValueError('No time points between tmin and tmax')
+    data = data[tidx[0]:tidx[-1] + 1]
+    stc['tmin'] = times[tidx[0]]
+    if vertices is not None:
+        idx, stc['vertices'] = _stc_vertex_idx(stc['vertices'], vertices)
+        data = data[:, idx]
+    stc['data'] = np.array(data.T, dtype=np.float32)
+    return stc
+
+
 def write_stc(filename, tmin, tstep, vertices, data):
     """Write an STC file
 
@@ -158,13 +211,12 @@ def read_w(filename):
     # read number of vertices/sources (3 byte integer)
     vertices_n = int(_read_3(fid))
 
-    vertices = np.zeros((vertices_n), dtype=np.int32)
-    data = np.zeros((vertices_n), dtype=np.float32)
-
-    # read the vertices and data
-    for i in range(vertices_n):
-        vertices[i] = _read_3(fid)
-        data[i] = np.fromfile(fid, dtype='>f4', count=1)
+    # read the vertices (3 byte integers) and data
+    rec = np.fromfile(fid, dtype=[('vertex', '>u1', 3), ('data', '>f4')],
+                      count=vertices_n)
+    b = rec['vertex'].astype(np.int32)
+    vertices = (b[:, 0] << 16) + (b[:, 1] << 8) + b[:, 2]
+    data = rec['data'].astype(np.float32)
 
     w = dict()
     w['vertices'] = vertices
@@ -231,7 +283,7 @@ def write_w(filename, vertices, data):
     fid.close()
 
 
-def read_source_estimate(fname):
+def read_source_estimate(fname, vertices=None, tmin=None, tmax=None):
     """Returns a SourceEstimate object.
 
     Parameters
@@ -250,6 +302,12 @@ def read_source_estimate(fname):
        pattern as for surface estimates, except that files are named
        '*-lh.w' and '*-rh.w'.
 
+    For .stc files, a subset of the vertices and time points can be read
+    with the ``vertices`` (array, or list of two arrays for surface source
+    estimates), ``tmin`` and ``tmax`` (in seconds) arguments. The files are
+    then mapped in memory and only the selected data are read, e.g., to
+    extract a few labels from large source estimates.
+
     See Also
     --------
     read_stc, read_w
@@ -294,12 +352,29 @@ def read_source_estimate(fname):
             raise IOError("SourceEstimate File(s) not found for: %r"
                           % fname_arg)
 
+    subset = vertices is not None or tmin is not None or tmax is not None
+    if ftype == 'w' and subset:
+        raise ValueError('vertices, tmin and tmax can only be used with '
+                         '.stc files')
+
     # read the files
-    if ftype == 'volume':  # volume source space
+    if ftype == 'surface' and vertices is None:
+        vertices = [None, None]
+    elif ftype == 'surface' and len(vertices) != 2:
+        raise ValueError('vertices must be a list of two arrays for surface '
+                         'source estimates')
+
+    if ftype == 'volume' and subset:
+        kwargs = _read_stc_subset(fname, vertices, tmin, tmax)
+    elif ftype == 'volume':  # volume source space
         kwargs = read_stc(fname)
+    elif ftype == 'surface' and subset:
+        lh = _read_stc_subset(fname + '-lh.stc', vertices[0], tmin, tmax)
+        rh = _read_stc_subset(fname + '-rh.stc', vertices[1], tmin, tmax)
     elif ftype == 'surface':  # stc file with surface source spaces
         lh = read_stc(fname + '-lh.stc')
         rh = read_stc(fname + '-rh.stc')
+    if ftype == 'surface':
         assert lh['tmin'] == rh['tmin']
         assert lh['tstep'] == rh['tstep']
         kwargs = lh.copy()
@@ -318,6 +393,149 @@ def read_source_estimate(fname):
     return SourceEstimate(**kwargs)
 
 
+def write_source_estimates(fname, stcs, compress=False, chunks=(None, None)):
+    """Write a list of source estimates to a single file
+
+    The source estimates (e.g., trials, conditions or subjects) must have
+    the same vertices and number of time points. The data are stored in
+    chunks along vertices and time in a .npz file, so that any source
+    estimate and any range of vertices can be read back without loading
+    the whole file.
+
+    Parameters
+    ----------
+    fname : string
+        The name of the file. It should end with '.npz'.
+    stcs : list of SourceEstimate
+        The source estimates.
+    compress : bool
+        If True, the chunks are compressed.
+    chunks : tuple of int | None
+        Number of vertices and number of time points of the chunks. None
+        means that the chunks span all the vertices or time points.
+
+    See Also
+    --------
+    read_source_estimates
+    """
+    if len(stcs) == 0:
+        raise ValueError('At least one source estimate is needed')
+
+    vertno = stcs[0].vertno
+    if not isinstance(vertno, list):
+        vertno = [vertno]
+    n_vertices, n_times = stcs[0].data.shape
+    for stc in stcs[1:]:
+        this_vertno = stc.vertno if isinstance(stc.vertno, list) \
+                                 else [stc.vertno]
+        if (len(this_vertno) != len(vertno) or
+                not all([np.array_equal(v1, v2)
+                         for v1, v2 in zip(this_vertno, vertno)])):
+            raise ValueError('All source estimates must have the same '
+                             'vertices')
+        if stc.data.shape[1] != n_times:
+            raise ValueError('All source estimates must have the same '
+                             'number of time points')
+
+    chunks = [n if c is None else int(c)
+              for c, n in zip(chunks, [n_vertices, n_times])]
+
+    arrays = dict(shape=np.array([len(stcs), n_vertices, n_times]),
+                  chunks=np.array(chunks),
+                  dtype=np.array(stcs[0].data.dtype.str),
+                  is_list=np.array(isinstance(stcs[0].vertno, list)),
+                  tmin=np.array([stc.tmin for stc in stcs]),
+                  tstep=np.array([stc.tstep for stc in stcs]))
+    for k, v in enumerate(vertno):
+        arrays['vertno_%d' % k] = v
+    for k, stc in enumerate(stcs):
+        for vi in range(0, n_vertices, chunks[0]):
+            for ti in range(0, n_times, chunks[1]):
+                arrays['data_%d_%d_%d' % (k, vi, ti)] = \
+                            stc.data[vi:vi + chunks[0], ti:ti + chunks[1]]
+
+    with open(fname, 'wb') as fid:
+        if compress:
+            np.savez_compressed(fid, **arrays)
+        else:
+            np.savez(fid, **arrays)
+
+
+def read_source_estimates(fname, idx=None, vertices=None):
+    """Read source estimates written by write_source_estimates
+
+    Only the chunks holding the requested data are read from the file.
+
+    Parameters
+    ----------
+    fname : string
+        The name of the file.
+    idx : int | array of int | None
+        Indices of the source estimates to read. If None, all the source
+        estimates are read.
+    vertices : array | list of two arrays | None
+        Vertices to read (list of arrays for surface source estimates). If
+        None, all the vertices are read.
+
+    Returns
+    -------
+    stcs : SourceEstimate | list of SourceEstimate
+        The source estimates. A single source estimate is returned if idx
+        is an int.
+
+    See Also
+    --------
+    write_source_estimates
+    """
+    npz = np.load(fname)
+    n_stcs, n_vertices, n_times = npz['shape']
+    chunks = npz['chunks']
+    is_list = bool(npz['is_list'])
+    vertno = [npz['vertno_%d' % k] for k in range(2)
+              if 'vertno_%d' % k in npz.files]
+
+    if vertices is None:
+        sel = np.arange(n_vertices)
+    else:
+        if not is_list:
+            vertices = [vertices]
+        if len(vertices) != len(vertno):
+            raise ValueError('vertices must match the source spaces of the '
+                             'source estimates')
+        sel, offset = list(), 0
+        for k, (v, this_vertno) in enumerate(zip(vertices, vertno)):
+            this_sel, vertno[k] = _stc_vertex_idx(this_vertno, v)
+            sel.append(offset + this_sel)
+            offset += len(this_vertno)
+        sel = np.concatenate(sel)
+    if not is_list:
+        vertno = vertno[0]
+
+    # the chunks holding the selected vertices
+    sel_chunks = sel // chunks[0]
+
+    single = np.isscalar(idx)
+    if idx is None:
+        idx = np.arange(n_stcs)
+    idx = np.atleast_1d(idx)
+
+    stcs = list()
+    for k in idx:
+        data = np.empty((len(sel), n_times), dtype=str(npz['dtype']))
+        for ci in np.unique(sel_chunks):
+            mask = sel_chunks == ci
+            vi = ci * chunks[0]
+            for ti in range(0, n_times, chunks[1]):
+                chunk = npz['data_%d_%d_%d' % (k, vi, ti)]
+                data[mask, ti:ti + chunks[1]] = chunk[sel[mask] - vi]
+        stcs.append(SourceEstimate(data, vertices=vertno,
+                                   tmin=npz['tmin'][k],
+                                   tstep=npz['tstep'][k]))
+    npz.close()
+
+    return stcs[0] if single else stcs
+
+
 class SourceEstimate(object):
     """SourceEstimate container
 
@@ -658,7 +876,7 @@ class SourceEstimate(object):
             stc_vertices = self.vertno[0]
 
         # find index of the Label's vertices
-        idx = np.nonzero(map(label.vertices.__contains__, stc_vertices))[0]
+        idx = np.nonzero(in1d(stc_vertices, label.vertices))[0]
 
         # find output vertices
         vertices = stc_vertices[idx]
@@ -784,7 +1002,7 @@ class SourceEstimate(object):
                             hemis[hemi] + '.sphere')
 
         if isinstance(surf, str):  # read in surface
-            surf = read_surface(surf)
+            surf = _read_surface_cached(surf)
 
         if restrict_vertices is False:
             restrict_vertices = np.arange(surf[0].shape[0])
@@ -1010,26 +1228,36 @@ def _morph_buffer(data, idx_use, e, smooth, n_vertices, nearest, maps,
     return data_morphed
 
 
-def _compute_nearest(xhs, rr):
-    nearest = np.zeros(len(rr), dtype=np.int)
-    dr = 32
-    for k in range(0, len(rr), dr):
-        dots = np.dot(rr[k:k + dr], xhs.T)
-        nearest[k:k + dr] = np.argmax(dots, axis=1)
+def _compute_nearest(xhs, rr, use_kdtree=True):
+    """Find the nearest vertex in xhs for each point in rr
+
+    The vertices in xhs have to lie on the unit sphere, the nearest
+    vertex is hence the one with the largest dot product. If use_kdtree is
+    True, a KD-tree of xhs is used, else all dot products are computed.
+    """
+    if use_kdtree:
+        rr = rr / np.sqrt(np.sum(rr ** 2, axis=1))[:, None]
+        nearest = cKDTree(xhs).query(rr)[1]
+    else:
+        nearest = np.zeros(len(rr), dtype=np.int)
+        dr = 32
+        for k in range(0, len(rr), dr):
+            dots = np.dot(rr[k:k + dr], xhs.T)
+            nearest[k:k + dr] = np.argmax(dots, axis=1)
     return nearest
 
 
 def _get_subject_sphere_tris(subject, subjects_dir):
     spheres = [os.path.join(subjects_dir, subject, 'surf',
                             xh + '.sphere.reg') for xh in ['lh', 'rh']]
-    tris = [read_surface(s)[1] for s in spheres]
+    tris = [_read_surface_cached(s)[1] for s in spheres]
     return tris
 
 
 @verbose
 def morph_data(subject_from, subject_to, stc_from, grade=5, smooth=None,
                subjects_dir=None, buffer_size=64, n_jobs=1, verbose=None,
-               mne_root=None):
+               mne_root=None, cache_dir=None):
     """Morph a source estimate from one subject to another
 
     Parameters
@@ -1065,6 +1293,12 @@ def morph_data(subject_from, subject_to, stc_from, grade=5, smooth=None,
         Root directory for MNE. If None, the environment variable MNE_ROOT
         is used. mne_root is only used for computation of vertices to use
         (i.e., when "grade" is an integer).
+    cache_dir : str, or None
+        Directory where the morph matrices are saved to and read from.
+        Morph matrices are always cached in memory for the last morphs
+        computed, such that morphing many source estimates with the same
+        vertices is fast. Using a cache_dir allows to reuse them across
+        sessions.
 
     Returns
     -------
@@ -1078,52 +1312,96 @@ def morph_data(subject_from, subject_to, stc_from, grade=5, smooth=None,
 
     logger.info('Morphing data...')
     subjects_dir = get_subjects_dir(subjects_dir)
-    nearest = grade_to_vertices(subject_to, grade, subjects_dir, mne_root,
-                                n_jobs)
-    tris = _get_subject_sphere_tris(subject_from, subjects_dir)
-    maps = read_morph_map(subject_from, subject_to, subjects_dir)
+    morph_mat, nearest = _get_morph_matrix(subject_from, subject_to,
+                                           stc_from.vertno, grade, smooth,
+                                           subjects_dir, mne_root, n_jobs,
+                                           cache_dir)
 
     # morph the data
-    lh_data = stc_from.data[:len(stc_from.lh_vertno)]
-    rh_data = stc_from.data[-len(stc_from.rh_vertno):]
-    data = [lh_data, rh_data]
-    data_morphed = [None, None]
-
     n_chunks = ceil(stc_from.data.shape[1] / float(buffer_size))
-
-    parallel, my_morph_buffer, _ = parallel_func(_morph_buffer, n_jobs)
-
-    for hemi in [0, 1]:
-        e = mesh_edges(tris[hemi])
-        e.data[e.data == 2] = 1
-        n_vertices = e.shape[0]
-        e = e + sparse.eye(n_vertices, n_vertices)
-        idx_use = stc_from.vertno[hemi]
-        if len(idx_use) == 0:
-            continue
-        data_morphed[hemi] = np.concatenate(
-            parallel(my_morph_buffer(data_buffer, idx_use, e, smooth,
-                                     n_vertices, nearest[hemi], maps[hemi])
-                     for data_buffer
-                     in np.array_split(data[hemi], n_chunks, axis=1)), axis=1)
-
     stc_to = copy.deepcopy(stc_from)
     stc_to.vertno = [nearest[0], nearest[1]]
-    if data_morphed[0] is None:
-        if data_morphed[1] is None:
-            stc_to.data = np.r_[[], []]
-        else:
-            stc_to.data = data_morphed[1]
-    elif data_morphed[1] is None:
-        stc_to.data = data_morphed[0]
-    else:
-        stc_to.data = np.r_[data_morphed[0], data_morphed[1]]
+    stc_to.data = np.concatenate([morph_mat * data_buffer for data_buffer
+                                  in np.array_split(stc_from.data, n_chunks,
+                                                    axis=1)], axis=1)
 
     logger.info('[done]')
 
     return stc_to
 
 
+# In-memory cache of morph matrices, see _get_morph_matrix
+_MORPH_CACHE_SIZE = 20
+_morph_cache = dict()
+_morph_cache_keys = list()
+
+
+def _hash_vertices(vertices):
+    """Helper to summarize a list of vertex arrays by a hash"""
+    h = hashlib.md5()
+    for v in vertices:
+        h.update(np.asarray(v, dtype=np.int64).tostring())
+        h.update('|')
+    return h.hexdigest()
+
+
+@verbose
+def _get_morph_matrix(subject_from, subject_to, vertices_from, grade, smooth,
+                      subjects_dir, mne_root=None, n_jobs=1, cache_dir=None,
+                      verbose=None):
+    """Get a morph matrix and destination vertices, using the caches
+
+    The last _MORPH_CACHE_SIZE morph matrices used are kept in memory. If
+    cache_dir is not None, the matrices are also stored there and read back
+    if the same morph is requested again, e.g., in another session.
+    """
+    if grade is None:
+        grade_key = None
+    elif isinstance(grade, list):
+        grade_key = _hash_vertices(grade)
+    else:
+        grade_key = int(grade)
+    key = (subject_from, subject_to, os.path.abspath(subjects_dir),
+           _hash_vertices(vertices_from), grade_key, smooth)
+
+    if key in _morph_cache:
+        logger.info('    Using cached morph matrix')
+        _morph_cache_keys.remove(key)
+        _morph_cache_keys.append(key)
+        return _morph_cache[key]
+
+    fname = None
+    if cache_dir is not None:
+        fname = os.path.join(cache_dir, '%s-%s-%s-morph.npz'
+                             % (subject_from, subject_to,
+                                hashlib.md5(str(key)).hexdigest()))
+
+    if fname is not None and os.path.isfile(fname):
+        logger.info('    Reading morph matrix from %s' % fname)
+        npz = np.load(fname)
+        morph_mat = csr_matrix((npz['data'], npz['indices'], npz['indptr']),
+                               shape=tuple(npz['shape']))
+        vertices_to = [npz['lh_vertno'], npz['rh_vertno']]
+    else:
+        vertices_to = grade_to_vertices(subject_to, grade, subjects_dir,
+                                        mne_root, n_jobs)
+        morph_mat = compute_morph_matrix(subject_from, subject_to,
+                                         vertices_from, vertices_to, smooth,
+                                         subjects_dir).tocsr()
+        if fname is not None:
+            logger.info('    Writing morph matrix to %s' % fname)
+            np.savez(fname, data=morph_mat.data, indices=morph_mat.indices,
+                     indptr=morph_mat.indptr, shape=morph_mat.shape,
+                     lh_vertno=vertices_to[0], rh_vertno=vertices_to[1])
+
+    _morph_cache[key] = (morph_mat, vertices_to)
+    _morph_cache_keys.append(key)
+    if len(_morph_cache_keys) > _MORPH_CACHE_SIZE:
+        del _morph_cache[_morph_cache_keys.pop(0)]
+
+    return morph_mat, vertices_to
+
+
 @verbose
 def compute_morph_matrix(subject_from, subject_to, vertices_from, vertices_to,
                          smooth=None, subjects_dir=None, verbose=None):
@@ -1219,7 +1497,7 @@ def grade_to_vertices(subject, grade, subjects_dir=None, mne_root=None,
 
     spheres_to = [os.path.join(subjects_dir, subject, 'surf',
                                xh + '.sphere.reg') for xh in ['lh', 'rh']]
-    lhs, rhs = [read_surface(s)[0] for s in spheres_to]
+    lhs, rhs = [_read_surface_cached(s)[0] for s in spheres_to]
 
     if grade is not None:  # fill a subset of vertices
         if isinstance(grade, list):
@@ -1230,8 +1508,8 @@ def grade_to_vertices(subject, grade, subjects_dir=None, mne_root=None,
         else:
             # find which vertices to use in "to mesh"
             ico = _get_ico_tris(grade, return_surf=True, mne_root=mne_root)
-            lhs /= np.sqrt(np.sum(lhs ** 2, axis=1))[:, None]
-            rhs /= np.sqrt(np.sum(rhs ** 2, axis=1))[:, None]
+            lhs = lhs / np.sqrt(np.sum(lhs ** 2, axis=1))[:, None]
+            rhs = rhs / np.sqrt(np.sum(rhs ** 2, axis=1))[:, None]
 
             # Compute nearest vertices in high dim mesh
             parallel, my_compute_nearest, _ = \
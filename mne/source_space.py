@@ -18,7 +18,7 @@ from .fiff.write import start_block, end_block, write_int, \
                         write_float_sparse_rcs, write_string, \
                         write_float_matrix, write_int_matrix, \
                         write_coord_trans
-from .surface import read_surface
+from .surface import _read_surface_cached
 from .utils import get_subjects_dir
 from . import verbose
 
@@ -558,7 +558,7 @@ def vertex_to_mni(vertices, hemis, subject, subjects_dir=None, verbose=None):
 
     surfs = [op.join(subjects_dir, subject, 'surf', '%s.white' % h)
              for h in ['lh', 'rh']]
-    rr = [read_surface(s)[0] for s in surfs]
+    rr = [_read_surface_cached(s)[0] for s in surfs]
 
     # take point locations in RAS space and convert to MNI coordinates
     xfm = _freesurfer_read_talxfm(op.join(subjects_dir, subject, 'mri',
@@ -3,6 +3,7 @@
 #
 # License: BSD (3-clause)
 
+import os.path as op
 import numpy as np
 
 import logging
@@ -263,18 +264,11 @@ def read_surface(filepath):
             #   Face splitting follows
             #
             faces = np.zeros((2 * nquad, 3), dtype=np.int)
-            nface = 0
-            for quad in quads:
-                if (quad[0] % 2) == 0:
-                    faces[nface] = quad[0], quad[1], quad[3]
-                    nface += 1
-                    faces[nface] = quad[2], quad[3], quad[1]
-                    nface += 1
-                else:
-                    faces[nface] = quad[0], quad[1], quad[2]
-                    nface += 1
-                    faces[nface] = quad[0], quad[2], quad[3]
-                    nface += 1
+            even = (quads[:, 0] % 2) == 0
+            faces[0::2] = np.where(even[:, None], quads[:, [0, 1, 3]],
+                                   quads[:, [0, 1, 2]])
+            faces[1::2] = np.where(even[:, None], quads[:, [2, 3, 1]],
+                                   quads[:, [0, 2, 3]])
 
         elif magic == 16777214:  # Triangle file
             create_stamp = fobj.readline()
@@ -291,6 +285,37 @@ def read_surface(filepath):
     return coords, faces
 
 
+# In-memory cache of Freesurfer surfaces, see _read_surface_cached
+_SURFACE_CACHE_SIZE = 20
+_surface_cache = dict()
+_surface_cache_keys = list()
+
+
+def _read_surface_cached(filepath):
+    """Load in a Freesurfer surface mesh, using an in-memory cache
+
+    The last _SURFACE_CACHE_SIZE surfaces read are kept in memory, the cache
+    being invalidated when the file is modified. The arrays returned are
+    read-only.
+    """
+    key = (op.abspath(filepath), op.getmtime(filepath))
+    if key in _surface_cache:
+        _surface_cache_keys.remove(key)
+        _surface_cache_keys.append(key)
+        return _surface_cache[key]
+
+    coords, faces = read_surface(filepath)
+    coords.flags.writeable = False
+    faces.flags.writeable = False
+
+    _surface_cache[key] = (coords, faces)
+    _surface_cache_keys.append(key)
+    if len(_surface_cache_keys) > _SURFACE_CACHE_SIZE:
+        del _surface_cache[_surface_cache_keys.pop(0)]
+
+    return coords, faces
+
+
 ###############################################################################
 # Write
 
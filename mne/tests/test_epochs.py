@@ -4,14 +4,14 @@
 # License: BSD (3-clause)
 
 import os.path as op
-from nose.tools import assert_true, assert_equal
+from nose.tools import assert_true, assert_equal, assert_raises
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 import numpy as np
 import copy as cp
 
 from mne import fiff, Epochs, read_events, pick_events, \
-                equalize_epoch_counts, find_events
-from mne.epochs import bootstrap
+                equalize_epoch_counts, find_events, compute_resampling_stats
+from mne.epochs import bootstrap, _get_drop_indices
 
 try:
     import nitime
@@ -291,6 +291,52 @@ def test_bootstrap():
     assert_true(epochs._data.shape == epochs2._data.shape)
 
 
+def test_resampling_stats():
+    """Test statistics of resampled epochs"""
+    epochs = Epochs(raw, events, event_id, tmin, tmax, picks=picks,
+                    baseline=(None, 0), preload=True)
+    data = epochs.get_data()
+    n_epochs, n_channels, n_times = data.shape
+
+    # jackknife resamples leave out each epoch in turn
+    stats = compute_resampling_stats(epochs, 'average', 'jackknife')
+    assert_true(stats.shape == (n_epochs, n_channels, n_times))
+    for k in range(n_epochs):
+        keep = np.arange(n_epochs) != k
+        assert_array_almost_equal(stats[k], np.mean(data[keep], axis=0))
+    stats = compute_resampling_stats(epochs, 'standard_error', 'jackknife')
+    assert_array_almost_equal(stats[0], np.std(data[1:], axis=0)
+                              / np.sqrt(n_epochs - 1))
+    stats = compute_resampling_stats(epochs, 'covariance', 'jackknife')
+    assert_true(stats.shape == (n_epochs, n_channels, n_channels))
+    cov = sum(np.dot(e, e.T) for e in data[1:]) / ((n_epochs - 1) * n_times)
+    assert_array_almost_equal(stats[0], cov)
+
+    # the two halves of a split average to the mean
+    stats = compute_resampling_stats(epochs, 'average', 'split-half',
+                                     n_resamples=3, random_state=0)
+    assert_true(stats.shape == (3, 2, n_channels, n_times))
+    n_half = n_epochs // 2
+    assert_array_almost_equal((n_half * stats[0, 0]
+                               + (n_epochs - n_half) * stats[0, 1])
+                              / float(n_epochs), np.mean(data, axis=0))
+    epochs_1 = Epochs(raw, events[events[:, 2] == event_id][:1], event_id,
+                      tmin, tmax, picks=picks, baseline=(None, 0),
+                      preload=True)
+    assert_raises(ValueError, compute_resampling_stats, epochs_1, 'average',
+                  'split-half')
+
+    # not preloaded epochs give the same bootstrap statistics
+    stats = compute_resampling_stats(epochs, 'average', n_resamples=4,
+                                     random_state=0)
+    epochs_2 = Epochs(raw, events, event_id, tmin, tmax, picks=picks,
+                      baseline=(None, 0), preload=False)
+    stats_2 = compute_resampling_stats(epochs_2, 'average', n_resamples=4,
+                                       random_state=0)
+    assert_true(stats.shape == (4, n_channels, n_times))
+    assert_array_almost_equal(stats, stats_2)
+
+
 def test_epochs_copy():
     """Test copy epochs
     """
@@ -343,3 +389,19 @@ def test_epoch_eq():
     assert_true(epochs_1.events.shape[0] != epochs_2.events.shape[0])
     equalize_epoch_counts(epochs_1, epochs_2)
     assert_true(epochs_1.events.shape[0] == epochs_2.events.shape[0])
+
+
+def test_epoch_eq_drop_indices():
+    """Test the selection of epochs dropped to equalize counts"""
+    t1 = np.array([1, 2, 3, 4, 120, 121])
+    t2 = np.array([3.5, 4.5, 120.5, 121.5])
+    drop = _get_drop_indices([t1, t2])
+    assert_array_equal(drop[0], [0, 1])
+    assert_array_equal(drop[1], [])
+    drop = _get_drop_indices([t1, t2], method='truncate')
+    assert_array_equal(drop[0], [4, 5])
+    # unsorted times and more conditions
+    drop = _get_drop_indices([t1[::-1], t2, t2[:2] + 116])
+    assert_array_equal(drop[0], [2, 3, 4, 5])
+    assert_array_equal(drop[1], [0, 1])
+    assert_array_equal(drop[2], [])
@@ -1,4 +1,5 @@
 import os.path as op
+import numpy as np
 
 from nose.tools import assert_true
 from numpy.testing import assert_array_almost_equal, assert_array_equal
@@ -78,6 +79,41 @@ def test_find_events():
     raw = fiff.Raw(raw_fname)
     events2 = find_events(raw)
     assert_array_almost_equal(events, events2)
+    # events found across the edges of the blocks read
+    for block_size in [0.1, 0.37, 1.]:
+        events2 = find_events(raw, block_size=block_size)
+        assert_array_almost_equal(events, events2)
+    # the stim channels are read as stored unless raw is preloaded
+    assert_array_equal(find_events(fiff.Raw(raw_fname, preload=True)),
+                       events2)
+
+    # steps contain the onsets and offsets, with matching durations
+    onsets, onset_durations = find_events(raw, return_durations=True)
+    offsets, offset_durations = find_events(raw, output='offset',
+                                            return_durations=True)
+    steps = find_events(raw, output='step', block_size=0.37)
+    assert_array_equal(onsets, events2)
+    assert_true(len(steps) >= len(onsets))
+    assert_true(np.all(onset_durations > 0))
+    for onset, duration in zip(onsets, onset_durations):
+        assert_true(onset[0] in steps[:, 0])
+        if onset[0] + duration - 1 in offsets[:, 0]:
+            k = np.where(offsets[:, 0] == onset[0] + duration - 1)[0][0]
+            assert_true(offset_durations[k] == duration)
+            assert_true(offsets[k, 2] == onset[2])
+
+    # a single combined channel sets only the first bit
+    events2 = find_events(raw, combine=True, mask=2 ** 16 - 1)
+    assert_true(np.all(events2[:, 2] == 1))
+    assert_true(np.all([e in steps[:, 0] for e in events2[:, 0]]))
+
+    # with several stim channels, a value lasts until any channel changes
+    stim_channels = [raw.ch_names[k] for k in
+                     fiff.pick_types(raw.info, meg=False, stim=True)]
+    steps, durations = find_events(raw, stim_channel=stim_channels,
+                                   output='step', block_size=0.37,
+                                   return_durations=True)
+    assert_array_equal(durations[:-1], np.diff(steps[:, 0]))
 
 
 def test_make_fixed_length_events():
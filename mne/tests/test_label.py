@@ -6,8 +6,11 @@ from nose.tools import assert_true
 
 from mne.datasets import sample
 from mne import label_time_courses, read_label, write_label, stc_to_label, \
-               read_source_estimate, read_source_spaces, grow_labels
-from mne.label import Label
+               read_source_estimate, read_source_spaces, grow_labels, \
+               SourceEstimate, label_sign_flip, label_extraction_operator, \
+               extract_label_time_course
+from mne.label import Label, _verts_within_dists, _verts_within_dist_py
+from mne.source_estimate import mesh_dist
 
 
 examples_folder = op.join(op.dirname(__file__), '..', '..', 'examples')
@@ -114,6 +117,70 @@ def test_grow_labels():
             assert(label.hemi == 'rh')
 
 
+def test_verts_within_dists():
+    """Test batched search of the vertices within geodesic distances"""
+    # a regular grid of 10 x 10 vertices
+    x, y = np.meshgrid(np.arange(10.), np.arange(10.))
+    vert = np.c_[x.ravel(), y.ravel(), np.zeros(100)]
+    tris = list()
+    for i in range(9):
+        for j in range(9):
+            k = 10 * i + j
+            tris.extend([[k, k + 1, k + 10], [k + 1, k + 11, k + 10]])
+    graph = mesh_dist(np.array(tris), vert)
+    sources = np.array([0, 55, 99])
+    max_dists = np.array([1.5, 2., 3.5])
+    verts_dists = _verts_within_dists(graph, sources, max_dists)
+    for source, max_dist, (verts, dist) in zip(sources, max_dists,
+                                               verts_dists):
+        verts_py, dist_py = _verts_within_dist_py(graph, source, max_dist)
+        assert_array_equal(verts, verts_py)
+        assert_array_almost_equal(dist, dist_py)
+
+
+def test_extract_label_time_course():
+    """Test extraction of label time courses with a sparse operator"""
+    src = read_source_spaces(src_fname)
+    vertno = [s['vertno'] for s in src]
+    n_sources = sum(len(v) for v in vertno)
+    rng = np.random.RandomState(0)
+    stcs = [SourceEstimate(rng.randn(n_sources, 10), vertices=vertno,
+                           tmin=0., tstep=1e-3) for k in range(3)]
+    label_lh = read_label(label_fname)
+    label_rh = read_label(label_rh_fname)
+    labels = [label_lh, label_rh, label_lh + label_rh]
+
+    tcs = extract_label_time_course(stcs, labels, src, mode='mean')
+    for stc, tc in zip(stcs, tcs):
+        assert_true(tc.shape == (3, 10))
+        for label, this_tc in zip(labels, tc):
+            assert_array_almost_equal(this_tc,
+                                      stc.label_stc(label).data.mean(axis=0))
+
+    operator = label_extraction_operator(label_lh, src, mode='mean_flip')
+    tc = extract_label_time_course(stcs[0], label_lh, src, mode='mean_flip',
+                                   operator=operator)
+    flip = label_sign_flip(label_lh, src)
+    data = stcs[0].label_stc(label_lh).data
+    assert_array_almost_equal(tc[0], np.mean(flip[:, None] * data, axis=0))
+
+    tc = extract_label_time_course(stcs[0], labels, src, mode='pca_flip')
+    assert_true(tc.shape == (3, 10))
+
+    # the sign of pca_flip matches mean_flip, whatever the signs of the flips
+    idx = np.searchsorted(vertno[0], np.intersect1d(label_lh.vertices,
+                                                    vertno[0]))
+    signal = np.sin(np.linspace(0, 2 * np.pi, 10))
+    for sign in [1, -1]:
+        data = stcs[0].data.copy()
+        data[idx] = sign * flip[:, None] * signal
+        data[idx] += 0.01 * rng.randn(len(idx), 10)
+        stc = SourceEstimate(data, vertices=vertno, tmin=0., tstep=1e-3)
+        tc_mean = extract_label_time_course(stc, label_lh, src, 'mean_flip')
+        tc_pca = extract_label_time_course(stc, label_lh, src, 'pca_flip')
+        assert_true(np.corrcoef(tc_mean[0], tc_pca[0])[0, 1] > 0.99)
+
+
 def test_label_time_course():
     """Test extracting label data from SourceEstimate"""
     values, times, vertices = label_time_courses(label_fname, stc_fname)
@@ -6,7 +6,7 @@ from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 from mne.fiff import Raw, pick_types
 from mne import compute_proj_epochs, compute_proj_evoked, compute_proj_raw
-from mne.fiff.proj import make_projector, activate_proj
+from mne.fiff.proj import make_projector, activate_proj, Projector
 from mne.proj import read_proj, write_proj
 from mne import read_events, Epochs
 
@@ -107,3 +107,26 @@ def test_compute_proj():
     # test that you can save them
     raw.info['projs'] += projs
     raw.save('foo_rawproj_continuous_raw.fif')
+
+
+def test_projector():
+    """Test applying SSP operators through their basis"""
+    projs = read_proj(proj_fname)
+    raw = Raw(raw_fname)
+    proj, nproj, U = make_projector(projs, raw.info['ch_names'])
+    assert_true(nproj > 0)
+    projector = Projector(U)
+    assert_array_almost_equal(np.asarray(projector), proj)
+
+    rng = np.random.RandomState(0)
+    data = rng.randn(len(proj), 20)
+    assert_array_almost_equal(projector.apply(data), np.dot(proj, data))
+    data_3d = rng.randn(len(proj), 4, 5)
+    assert_array_almost_equal(projector.apply(data_3d),
+                              np.tensordot(proj, data_3d, axes=1))
+    K = rng.randn(3, len(proj))
+    assert_array_almost_equal(projector.dot_right(K), np.dot(K, proj))
+
+    picks = pick_types(raw.info, meg='grad')[::2]
+    assert_array_almost_equal(projector.pick(picks).apply(data[picks]),
+                              np.dot(proj[picks][:, picks], data[picks]))
@@ -1,4 +1,6 @@
+import os
 import os.path as op
+import shutil
 from nose.tools import assert_true, assert_raises
 import warnings
 
@@ -6,12 +8,13 @@ import numpy as np
 from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 from mne.datasets import sample
-from mne import stats
-from mne import read_stc, write_stc, read_source_estimate, morph_data
+from mne import stats, source_estimate
+from mne import read_stc, write_stc, read_source_estimate, morph_data, \
+                read_source_estimates, write_source_estimates
 from mne.source_estimate import spatio_temporal_tris_connectivity, \
                                 spatio_temporal_src_connectivity, \
                                 compute_morph_matrix, grade_to_vertices, \
-                                morph_data_precomputed
+                                morph_data_precomputed, _compute_nearest
 from mne.minimum_norm import read_inverse_operator
 
 
@@ -37,6 +40,51 @@ def test_io_stc():
     assert_array_almost_equal(stc['tstep'], stc2['tstep'])
 
 
+def test_io_stc_subset():
+    """Test reading subsets of STC files
+    """
+    stc = read_stc(fname)
+    stc_mmap = read_stc(fname, mmap=True)
+    assert_array_equal(stc['data'], stc_mmap['data'])
+
+    stc_full = read_source_estimate(fname)
+    lh_vertno = stc_full.lh_vertno[::3]
+    rh_vertno = stc_full.rh_vertno[5:10]
+    tmin, tmax = stc_full.times[10], stc_full.times[20]
+    stc_sub = read_source_estimate(fname, vertices=[lh_vertno, rh_vertno],
+                                   tmin=tmin, tmax=tmax)
+    assert_array_equal(stc_sub.lh_vertno, lh_vertno)
+    assert_array_equal(stc_sub.rh_vertno, rh_vertno)
+    assert_array_almost_equal(stc_sub.times, stc_full.times[10:21])
+    n_lh = len(stc_full.lh_vertno)
+    idx = np.r_[np.arange(n_lh)[::3], n_lh + np.arange(5, 10)]
+    assert_array_equal(stc_sub.data, stc_full.data[idx, 10:21])
+
+
+def test_io_stcs():
+    """Test IO for collections of source estimates
+    """
+    stc = read_source_estimate(fname)
+    stcs = [stc, 2 * stc, -stc]
+    for compress in [False, True]:
+        write_source_estimates('tmp-stcs.npz', stcs, compress=compress,
+                               chunks=(1000, 7))
+        stcs2 = read_source_estimates('tmp-stcs.npz')
+        assert_true(len(stcs2) == len(stcs))
+        for stc1, stc2 in zip(stcs, stcs2):
+            assert_array_equal(stc1.data, stc2.data)
+            assert_array_equal(stc1.times, stc2.times)
+            assert_array_equal(stc1.lh_vertno, stc2.lh_vertno)
+            assert_array_equal(stc1.rh_vertno, stc2.rh_vertno)
+
+    vertices = [stc.lh_vertno[::50], stc.rh_vertno[100:2000]]
+    stc2 = read_source_estimates('tmp-stcs.npz', idx=1, vertices=vertices)
+    stc3 = read_source_estimate(fname, vertices=vertices)
+    assert_array_equal(stc2.data, 2 * stc3.data)
+    assert_array_equal(stc2.lh_vertno, stc3.lh_vertno)
+    assert_array_equal(stc2.rh_vertno, stc3.rh_vertno)
+
+
 def test_io_w():
     """Test IO for w files
     """
@@ -160,6 +208,36 @@ def test_morph_data():
                             grade=5, smooth=12, buffer_size=3)
     assert_array_almost_equal(stc_to3.data, stc_to4.data)
 
+    # make sure morph matrices cached on disk are used
+    cache_dir = op.join(op.abspath(op.curdir), 'morph_cache')
+    if not op.isdir(cache_dir):
+        os.mkdir(cache_dir)
+    stc_to6 = morph_data(subject_from, subject_to, stc_from, grade=3,
+                         smooth=12, cache_dir=cache_dir)
+    assert_true(len(os.listdir(cache_dir)) == 1)
+    source_estimate._morph_cache.clear()
+    del source_estimate._morph_cache_keys[:]
+    stc_to7 = morph_data(subject_from, subject_to, stc_from, grade=3,
+                         smooth=12, cache_dir=cache_dir)
+    assert_array_almost_equal(stc_to1.data, stc_to6.data)
+    assert_array_almost_equal(stc_to6.data, stc_to7.data)
+    assert_array_equal(stc_to6.vertno[0], stc_to7.vertno[0])
+    shutil.rmtree(cache_dir)
+
+
+def test_compute_nearest():
+    """Test nearest neighbor searches on the sphere
+    """
+    rng = np.random.RandomState(0)
+    x = rng.randn(2000, 3)
+    x /= np.sqrt(np.sum(x ** 2, axis=1))[:, None]
+    rr = 10 * rng.randn(300, 3)
+    nn_true = _compute_nearest(x, rr, use_kdtree=False)
+    nn_kdtree = _compute_nearest(x, rr)
+    assert_array_equal(nn_true, nn_kdtree)
+    # points on the sphere are their own nearest neighbor
+    assert_array_equal(_compute_nearest(x, x[::10]), np.arange(0, 2000, 10))
+
 
 def test_spatio_temporal_tris_connectivity():
     """Test spatio-temporal connectivity from triangles"""
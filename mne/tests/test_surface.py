@@ -1,9 +1,13 @@
 import os.path as op
+from tempfile import mkdtemp
+import numpy as np
 
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+from nose.tools import assert_true
 
 from mne.datasets import sample
-from mne import read_bem_surfaces, write_bem_surface
+from mne import read_bem_surfaces, write_bem_surface, read_surface
+from mne.surface import _read_surface_cached
 
 examples_folder = op.join(op.dirname(__file__), '..', '..', 'examples')
 data_path = sample.data_path(examples_folder)
@@ -23,3 +27,37 @@ def test_io_bem_surfaces():
 
     for key in surf[0].keys():
         assert_array_almost_equal(surf[0][key], surf_read[0][key])
+
+
+def _write_quad_surface(fname, coords, quads):
+    """Write a Freesurfer quad surface"""
+    def _fwrite3(fid, vals):
+        vals = np.atleast_1d(vals)
+        b = np.c_[vals >> 16, (vals >> 8) & 255, vals & 255]
+        fid.write(b.astype('>u1').tostring())
+
+    with open(fname, 'wb') as fid:
+        _fwrite3(fid, 16777215)
+        _fwrite3(fid, len(coords))
+        _fwrite3(fid, len(quads))
+        fid.write(np.round(100 * coords).astype('>i2').tostring())
+        _fwrite3(fid, quads.ravel())
+
+
+def test_read_quad_surface():
+    """Test reading of Freesurfer quad surfaces
+    """
+    coords = np.random.RandomState(0).randint(-100, 100, (6, 3)) / 10.
+    quads = np.array([[0, 1, 2, 3], [1, 4, 5, 2], [2, 5, 4, 3]])
+    fname = op.join(mkdtemp(), 'quad_surf')
+    _write_quad_surface(fname, coords, quads)
+    rr, tris = read_surface(fname)
+    assert_array_almost_equal(rr, coords)
+    assert_array_equal(tris, [[0, 1, 3], [2, 3, 1], [1, 4, 5], [1, 5, 2],
+                              [2, 5, 3], [4, 3, 5]])
+
+    rr_cached, tris_cached = _read_surface_cached(fname)
+    assert_array_equal(rr_cached, rr)
+    assert_array_equal(tris_cached, tris)
+    assert_true(_read_surface_cached(fname)[0] is rr_cached)
+    assert_true(not rr_cached.flags.writeable)
@@ -9,7 +9,7 @@ logger = logging.getLogger('mne')
 # XXX : don't import pylab here or you will break the doc
 
 from ..parallel import parallel_func
-from ..fiff.proj import make_projector_info
+from ..fiff.proj import _make_projector_op
 from .. import verbose
 
 
@@ -71,11 +71,11 @@ def compute_raw_psd(raw, tmin=0, tmax=np.inf, picks=None,
         data, times = raw[:, start:(stop + 1)]
 
     if proj:
-        proj, _ = make_projector_info(raw.info)
-        if picks is not None:
-            data = np.dot(proj[picks][:, picks], data)
-        else:
-            data = np.dot(proj, data)
+        proj, _ = _make_projector_op(raw.info)
+        if proj is not None:
+            if picks is not None:
+                proj = proj.pick(picks)
+            data = proj.apply(data)
 
     NFFT = int(NFFT)
     Fs = raw.info['sfreq']